@@ -0,0 +1,9 @@
+from pyalura.search_index import SearchIndex
+
+index = SearchIndex("Descargas/busqueda.sqlite3", base_folder="Descargas")
+# Indexa solo los archivos nuevos o modificados desde la ultima vez.
+index.update_folder()
+
+for hit in index.search("stream lambda"):
+    print(f"{hit['course']} / {hit['section']} / {hit['title']}")
+    print(f"    {hit['snippet']}")
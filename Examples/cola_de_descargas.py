@@ -0,0 +1,29 @@
+"""
+Reparte la descarga de una lista de cursos entre varios procesos.
+
+Cada proceso (o maquina que vea el mismo archivo de la cola) reclama cursos con
+un lease, asi que ningun curso se descarga dos veces.
+"""
+
+from multiprocessing import Process
+
+from pyalura.work_queue import WorkQueue, run_worker
+
+URLTEXT = """
+https://app.aluracursos.com/course/comandos-dml-manipulacion-datos-mysql
+https://app.aluracursos.com/course/low-code-ia-oracle-apex
+"""
+
+if __name__ == "__main__":
+    queue = WorkQueue("cola.sqlite3")
+    queue.enqueue_courses(URLTEXT.split("\n"))
+
+    workers = [
+        Process(target=run_worker, args=("cola.sqlite3", "Descargas")) for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    print(queue.stats())
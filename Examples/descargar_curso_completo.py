@@ -1,7 +1,7 @@
-from pyalura import Course
+from pyalura.cookie_manager import CookieManager
 from pyalura.downloader import Downloader
 
 url = "https://app.aluracursos.com/course/spring-boot-3-aplique-practicas-proteja-api-rest"
-course = Course(url, cookies_path="app.aluracursos.com_cookies.txt")
-downloader = Downloader(base_folder="Descargas")
+cookie_manager = CookieManager(cookies_path="app.aluracursos.com_cookies.txt")
+downloader = Downloader(base_folder="Descargas", cookie_manager=cookie_manager)
 downloader.download_course(url)
@@ -0,0 +1,10 @@
+from pyalura.catalog import CatalogCrawler
+from pyalura.downloader import Downloader
+from pyalura.rate_limit import RateLimiter
+
+rate_limiter = RateLimiter(requests_per_second=2)
+crawler = CatalogCrawler(rate_limiter=rate_limiter, max_workers=4)
+courses = crawler.crawl("https://www.aluracursos.com/cursos-online-programacion")
+
+downloader = Downloader(base_folder="Descargas", rate_limiter=rate_limiter)
+downloader.download_list(courses)
@@ -0,0 +1,82 @@
+"""
+Descarga 100 cursos simulados y muestra la memoria cada 10 cursos, con y sin
+`bounded_memory`. Cada modo corre en su propio proceso para que la memoria
+maxima (RSS) de uno no afecte al otro.
+
+Los `Course` de cada descarga se conservan, como los conserva quien recorre
+una lista larga y guarda los cursos (p. ej. para informar al final): sin
+`bounded_memory` cada curso sigue reteniendo su pagina, secciones e items y la
+memoria crece; con `bounded_memory`, `Course.release` los suelta al terminar.
+
+Uso:
+    python benchmarks/bench_bounded_memory.py [cursos]
+"""
+
+import gc
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_alura import FakeAlura  # noqa: E402
+
+from pyalura import downloader as downloader_module  # noqa: E402
+from pyalura.course import Course  # noqa: E402
+from pyalura.downloader import Downloader  # noqa: E402
+
+MiB = 1024 * 1024
+
+
+class RetainedCourse(Course):
+    """`Course` que queda guardado en `retained` al crearse."""
+
+    retained: list[Course] = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retained.append(self)
+
+
+def run(courses: int, bounded: bool):
+    print(f"bounded_memory={bounded}")
+    print(
+        f"{'cursos':>7} {'actual MiB':>11} {'pico curso MiB':>15} {'RSS max MiB':>12}"
+    )
+    with tempfile.TemporaryDirectory() as folder, FakeAlura(), mock.patch.object(
+        downloader_module, "Course", RetainedCourse
+    ):
+        downloader = Downloader(folder, bounded_memory=bounded)
+        tracemalloc.start()
+        for i in range(1, courses + 1):
+            tracemalloc.reset_peak()
+            downloader.download_course(f"https://app.aluracursos.com/course/curso-{i}")
+            if i % 10 == 0:
+                gc.collect()
+                current, peak = tracemalloc.get_traced_memory()
+                rss = downloader.metrics.snapshot()["peak_rss_bytes"] or 0
+                print(
+                    f"{i:>7} {current / MiB:>11.2f} {peak / MiB:>15.2f} {rss / MiB:>12.1f}"
+                )
+        tracemalloc.stop()
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        run(int(sys.argv[3]), sys.argv[2] == "bounded")
+        return
+
+    courses = sys.argv[1] if len(sys.argv) > 1 else "100"
+    for mode in ("unbounded", "bounded"):
+        subprocess.run(
+            [sys.executable, __file__, "--mode", mode, courses],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Mide el costo del logging: descarga cursos simulados con distintas
+configuraciones y compara llamadas a `logger.debug` desactivadas con f-strings
+(formateo inmediato) y con argumentos (formateo diferido).
+
+Uso:
+    python benchmarks/bench_logging.py [cursos]
+"""
+
+import logging
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_alura import FakeAlura  # noqa: E402
+
+from pyalura.downloader import Downloader  # noqa: E402
+from pyalura.log import FORMAT, setup_logging, stop_logging  # noqa: E402
+
+
+def configure(mode: str, log_file: Path):
+    stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    if mode == "off":
+        root.setLevel(logging.CRITICAL)
+    elif mode == "sync":
+        # Como estaba antes: FileHandler sincrono en el hilo que registra.
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+        handler.setFormatter(logging.Formatter(FORMAT.replace("%(context)s", "")))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    elif mode == "queue":
+        setup_logging(logging.INFO, log_file=log_file, console=False)
+    elif mode == "queue-debug":
+        setup_logging(logging.DEBUG, log_file=log_file, console=False)
+    elif mode == "queue-json":
+        setup_logging(logging.INFO, log_file=log_file, console=False, structured=True)
+
+
+def run_downloads(courses: int):
+    print(f"{'modo':>12} {'segundos':>9} {'ms/curso':>9} {'lineas':>8}")
+    for mode in ("off", "sync", "queue", "queue-debug", "queue-json"):
+        with tempfile.TemporaryDirectory() as folder, FakeAlura():
+            log_file = Path(folder) / "bench.log"
+            configure(mode, log_file)
+            downloader = Downloader(Path(folder) / "out")
+            # Calentamiento: imports perezosos y caches fuera de la medicion.
+            downloader.download_course("https://app.aluracursos.com/course/warmup")
+            log_file.write_text("", encoding="utf-8")
+            start = time.perf_counter()
+            for i in range(courses):
+                downloader.download_course(
+                    f"https://app.aluracursos.com/course/curso-{i}"
+                )
+            elapsed = time.perf_counter() - start
+            stop_logging()
+            lines = (
+                len(log_file.read_text(encoding="utf-8").splitlines())
+                if log_file.exists()
+                else 0
+            )
+        print(f"{mode:>12} {elapsed:>9.3f} {elapsed / courses * 1000:>9.2f} {lines:>8}")
+
+
+def run_disabled_calls(calls: int = 200_000):
+    logger = logging.getLogger("bench.disabled")
+    logger.setLevel(logging.INFO)
+    data = {"id": 123, "text": "alternativa", "nested": list(range(20))}
+
+    eager = timeit.timeit(lambda: logger.debug(f"Item: {data}"), number=calls)
+    lazy = timeit.timeit(lambda: logger.debug("Item: %s", data), number=calls)
+    print(f"\n{calls} llamadas a logger.debug desactivado:")
+    print(f"  f-string : {eager * 1e9 / calls:8.1f} ns/llamada")
+    print(f"  diferido : {lazy * 1e9 / calls:8.1f} ns/llamada")
+
+
+if __name__ == "__main__":
+    courses = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    run_downloads(courses)
+    run_disabled_calls()
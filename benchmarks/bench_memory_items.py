@@ -0,0 +1,95 @@
+"""
+Compara la memoria por item (medida con tracemalloc) entre los objetos `Item`
+y el almacen columnar `CatalogStore`.
+
+Uso:
+    python benchmarks/bench_memory_items.py [cursos] [secciones] [items_por_seccion]
+"""
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_pages import section_page  # noqa: E402
+
+from pyalura import parsing  # noqa: E402
+from pyalura.course import Course  # noqa: E402
+from pyalura.item import Item  # noqa: E402
+from pyalura.records import CatalogStore  # noqa: E402
+from pyalura.section import Section  # noqa: E402
+
+
+def fake_course_data(courses: int, sections: int, items: int) -> list[dict]:
+    data = []
+    for c in range(courses):
+        url = f"https://app.aluracursos.com/course/curso-{c}"
+        course_sections = []
+        for s in range(1, sections + 1):
+            page = section_page(section=s, items=items).replace(
+                "curso-de-prueba", f"curso-{c}"
+            )
+            course_sections.append(
+                {
+                    "name": f"{s:02d}. Seccion {s}",
+                    "url": f"{url}/section/{s}/tasks",
+                    "items": parsing.parse_section_page(page.encode("utf-8")),
+                }
+            )
+        data.append({"url": url, "sections": course_sections})
+    return data
+
+
+def build_objects(data: list[dict]) -> list:
+    courses = []
+    for course_data in data:
+        course = Course(course_data["url"], cookies_path="cookies.txt")
+        sections = []
+        for section_data in course_data["sections"]:
+            section = Section(section_data["name"], section_data["url"], course)
+            section._items = [Item.create(i, section) for i in section_data["items"]]
+            sections.append(section)
+        course._course_sections = sections
+        courses.append(course)
+    return courses
+
+
+def build_store(data: list[dict]) -> CatalogStore:
+    store = CatalogStore()
+    for course_data in data:
+        store.add_course_data(
+            course_data["url"],
+            course_data["url"].rsplit("/", 1)[-1],
+            "programacion",
+            course_data["sections"],
+        )
+    return store
+
+
+def measure(builder, data) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = builder(data)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:4]]
+    courses, sections, items = args + [100, 8, 12][len(args) :]
+    data = fake_course_data(courses, sections, items)
+    total = courses * sections * items
+
+    print(f"{total} items ({courses} cursos x {sections} secciones x {items} items)")
+    for name, builder in [("Item", build_objects), ("CatalogStore", build_store)]:
+        used = measure(builder, data)
+        print(f"{name:>13}: {used / 1024 / 1024:8.2f} MiB  {used / total:8.1f} B/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Mide cuantas paginas de items por segundo se parsean y convierten a Markdown
+segun el tamaño del `ParserPool`.
+
+Uso:
+    python benchmarks/bench_parser_pool.py [paginas]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_pages import task_page  # noqa: E402
+
+from pyalura import parsing  # noqa: E402
+from pyalura.parsing import ParserPool  # noqa: E402
+
+
+def run(pool: ParserPool, pages: list[bytes]) -> float:
+    # Los hilos simulan a los hilos de red que entregan las respuestas al pool.
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, pool.max_workers) * 2) as threads:
+        list(
+            threads.map(lambda raw: pool.run(parsing.parse_task_page, raw, True), pages)
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    raw = task_page(paragraphs=200, alternatives=4).encode("utf-8")
+    pages = [raw] * total
+
+    cpus = os.cpu_count() or 1
+    sizes = sorted(s for s in {0, 1, 2, 4, cpus} if s <= cpus)
+    baseline = None
+    print(f"{total} paginas de {len(raw) // 1024} KiB, {cpus} nucleos")
+    print(f"{'procesos':>9} {'segundos':>9} {'pag/s':>8} {'aceleracion':>12}")
+    for size in sizes:
+        with ParserPool(max_workers=size) as pool:
+            if size:
+                pool.run(parsing.parse_task_page, raw)  # arranque del pool
+            elapsed = run(pool, pages)
+        baseline = baseline or elapsed
+        label = "hilo" if size == 0 else str(size)
+        print(
+            f"{label:>9} {elapsed:>9.2f} {total / elapsed:>8.1f} {baseline / elapsed:>11.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Graba una ejecucion (descarga o `complete_all_activities`) y la reproduce sin
+red ni cuenta, para medir regresiones de rendimiento de forma repetible.
+
+Uso:
+    # Grabar contra la plataforma real (necesita cookies) o contra FakeAlura.
+    python benchmarks/bench_replay.py record run.jsonl.gz URL [URL ...] [--fake]
+        [--action download|complete] [--max-media-bytes N]
+
+    # Reproducir con la latencia grabada (1.0) o sin latencia (0).
+    python benchmarks/bench_replay.py replay run.jsonl.gz URL [URL ...]
+        [--action download|complete] [--latency 0]
+
+    # Sin argumentos: graba 5 cursos de FakeAlura y los reproduce.
+    python benchmarks/bench_replay.py
+"""
+
+import argparse
+import contextlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_alura import FakeAlura, no_sleep  # noqa: E402
+
+from pyalura.course import Course  # noqa: E402
+from pyalura.downloader import Downloader  # noqa: E402
+from pyalura.pacing import PacingPolicy  # noqa: E402
+from pyalura.transport import RecordingTransport, ReplayTransport  # noqa: E402
+
+# complete_all_activities sin esperas entre actividades.
+NO_PACING = PacingPolicy(0, 0, 0, 0, 0, 0)
+
+
+@contextlib.contextmanager
+def no_waits():
+    """Anula las esperas del cliente: no forman parte de lo que se mide."""
+    with mock.patch("pyalura.utils.sleep_progress", no_sleep), mock.patch(
+        "pyalura.downloader.sleep_progress", no_sleep
+    ):
+        yield
+
+
+def run(transport, urls: list[str], action: str) -> float:
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as folder:
+        if action == "download":
+            downloader = Downloader(folder, transport=transport)
+            for url in urls:
+                downloader.download_course(url)
+        else:
+            for url in urls:
+                Course(url, transport=transport).complete_all_activities(NO_PACING)
+    return time.perf_counter() - start
+
+
+def record(archive, urls, action, fake=False, max_media_bytes=None) -> float:
+    fake_context = FakeAlura() if fake else contextlib.nullcontext()
+    with fake_context, no_waits(), RecordingTransport(
+        archive, max_media_bytes=max_media_bytes
+    ) as transport:
+        elapsed = run(transport, urls, action)
+    print(f"grabado: {transport.recorded} peticiones en {elapsed:.3f}s -> {archive}")
+    return elapsed
+
+
+def replay(archive, urls, action, latency=0.0) -> float:
+    transport = ReplayTransport(archive, latency=latency)
+    with no_waits():
+        elapsed = run(transport, urls, action)
+    print(
+        f"reproducido (latencia x{latency}): {transport.replayed} peticiones, "
+        f"{transport.misses} sin grabar, {elapsed:.3f}s"
+    )
+    return elapsed
+
+
+def demo(courses: int = 5):
+    urls = [f"https://app.aluracursos.com/course/curso-{i}" for i in range(courses)]
+    with tempfile.TemporaryDirectory() as folder:
+        archive = Path(folder) / "run.jsonl.gz"
+        record(archive, urls, "download", fake=True, max_media_bytes=4096)
+        print(f"tamaño de la grabacion: {archive.stat().st_size / 1024:.1f} KiB")
+        replay(archive, urls, "download", latency=0)
+        replay(archive, urls, "download", latency=1.0)
+
+
+def main():
+    if len(sys.argv) == 1:
+        demo()
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("archive")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument(
+        "--action", choices=["download", "complete"], default="download"
+    )
+    parser.add_argument("--fake", action="store_true")
+    parser.add_argument("--max-media-bytes", type=int)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        record(args.archive, args.urls, args.action, args.fake, args.max_media_bytes)
+    else:
+        replay(args.archive, args.urls, args.action, args.latency)
+
+
+if __name__ == "__main__":
+    main()
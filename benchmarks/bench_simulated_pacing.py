@@ -0,0 +1,88 @@
+"""
+Compara politicas de espera en tiempo simulado.
+
+Recorre varios cursos de `FakeAlura` con un `SimulatedClock`: las esperas
+(`PacingScheduler`, `sleep_progress`, las pausas entre items, el limitador) no
+duermen, solo adelantan el reloj. Cada ejecucion tarda segundos y se informa
+cuanto habria durado de verdad.
+
+Uso:
+    python benchmarks/bench_simulated_pacing.py [--courses 5] [--action complete]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_alura import FakeAlura  # noqa: E402
+
+from pyalura.clock import SimulatedClock  # noqa: E402
+from pyalura.course import Course  # noqa: E402
+from pyalura.downloader import Downloader  # noqa: E402
+from pyalura.pacing import PacingPolicy  # noqa: E402
+from pyalura.rate_limit import RateLimiter  # noqa: E402
+
+POLICIES = {
+    "por defecto": PacingPolicy(),
+    # Los videos de FakeAlura no informan su duracion.
+    "videos 120s": PacingPolicy(default_video_seconds=120),
+    "documentos 20s": PacingPolicy(question_seconds=20, document_seconds=20),
+}
+
+
+def simulate(urls: list[str], action: str, pacing=None, rate=None) -> dict:
+    clock = SimulatedClock(seed=0)
+    rate_limiter = RateLimiter(rate, clock=clock) if rate else None
+    start = time.perf_counter()
+    with FakeAlura(patch_sleeps=False) as fake:
+        if action == "download":
+            with tempfile.TemporaryDirectory() as folder:
+                downloader = Downloader(folder, rate_limiter=rate_limiter, clock=clock)
+                for url in urls:
+                    downloader.download_course(url)
+        else:
+            for url in urls:
+                course = Course(url, rate_limiter=rate_limiter, clock=clock)
+                course.complete_all_activities(pacing)
+    return {
+        "simulated": clock.elapsed,
+        "sleeps": clock.sleeps,
+        "requests": fake.requests,
+        "real": time.perf_counter() - start,
+    }
+
+
+def report(name: str, result: dict):
+    hours = result["simulated"] / 3600
+    print(
+        f"{name:<20} {hours:8.2f} h simuladas  {result['sleeps']:5d} esperas  "
+        f"{result['requests']:5d} peticiones  {result['real']:.2f}s reales"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument(
+        "--action", choices=["download", "complete"], default="complete"
+    )
+    parser.add_argument("--rate", type=float, help="Peticiones por segundo")
+    args = parser.parse_args()
+
+    urls = [
+        f"https://app.aluracursos.com/course/curso-{i}" for i in range(args.courses)
+    ]
+    if args.action == "download":
+        report("descarga", simulate(urls, "download", rate=args.rate))
+        return
+    for name, pacing in POLICIES.items():
+        report(name, simulate(urls, "complete", pacing, args.rate))
+
+
+if __name__ == "__main__":
+    main()
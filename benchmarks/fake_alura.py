@@ -0,0 +1,133 @@
+"""
+Sustituto local de la plataforma para los benchmarks.
+
+`FakeAlura` reemplaza `requests.get/head/post` por funciones que responden con
+las paginas de `fake_pages`, y anula las esperas de `sleep_progress`, de modo
+que `Course` y `Downloader` funcionan completos sin red ni cuenta. Con
+`patch_sleeps=False` las esperas se mantienen, para medirlas con un
+`SimulatedClock` (ver `bench_simulated_pacing.py`).
+"""
+
+import json
+import re
+from unittest import mock
+
+import requests
+
+import fake_pages
+
+HOST = "https://app.aluracursos.com"
+
+
+def make_response(url, body=b"", status=200, headers=None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.encoding = "utf-8"
+    response.headers.update(headers or {})
+    response._content = body.encode("utf-8") if isinstance(body, str) else body
+    # Permite usar iter_content sobre el cuerpo ya cargado (peticiones stream).
+    response._content_consumed = True
+    return response
+
+
+def no_sleep(seconds, clock=None):
+    pass
+
+
+class FakeAlura:
+    """
+    Atributos:
+        sections (int): Secciones por curso.
+        items (int): Items por seccion.
+        paragraphs (int): Parrafos de cada pagina de item.
+        video_bytes (int): Tamaño de cada video.
+        patch_sleeps (bool): Si es True, `sleep_progress` no espera.
+        requests (int): Peticiones atendidas.
+    """
+
+    def __init__(
+        self,
+        sections=3,
+        items=6,
+        paragraphs=40,
+        video_bytes=64 * 1024,
+        patch_sleeps=True,
+    ):
+        self.sections = sections
+        self.items = items
+        self.paragraphs = paragraphs
+        self.video_bytes = video_bytes
+        self.patch_sleeps = patch_sleeps
+        self.requests = 0
+        self._patches = []
+
+    def handle(self, method, url, **kwargs):
+        self.requests += 1
+        path = url.replace(HOST, "")
+
+        match = re.match(r"^/course/([^/]+)/?$", path)
+        if match:
+            return make_response(url, fake_pages.course_landing_page(match.group(1)))
+
+        match = re.match(r"^/course/([^/]+)/continue$", path)
+        if match:
+            location = f"{HOST}/course/{match.group(1)}/task/1001"
+            return make_response(url, status=302, headers={"location": location})
+
+        match = re.match(r"^/course/([^/]+)/section/(\d+)/tasks$", path)
+        if match:
+            section = int(match.group(2)) - 1000
+            page = fake_pages.section_page(section, self.items, slug=match.group(1))
+            return make_response(url, page)
+
+        match = re.match(r"^/course/([^/]+)/task/(\d+)/video$", path)
+        if match:
+            videos = [
+                {"quality": quality, "mp4": f"{HOST}/fake-video/{quality}.mp4"}
+                for quality in ("hd", "sd")
+            ]
+            return make_response(url, json.dumps(videos))
+
+        match = re.match(r"^/course/([^/]+)/task/(\d+)$", path)
+        if match:
+            page = fake_pages.task_page(self.paragraphs, alternatives=3)
+            select = fake_pages.course_page(self.sections, slug=match.group(1))
+            page = page.replace("</body>", select.split("<body>")[1])
+            return make_response(url, page)
+
+        if path.startswith("/fake-video/"):
+            return make_response(url, b"\0" * self.video_bytes)
+
+        if method == "POST":
+            return make_response(url, "{}")
+        return make_response(url, "", status=404)
+
+    def __enter__(self):
+        self._patches = [
+            mock.patch("requests.get", lambda url, **kw: self.handle("GET", url, **kw)),
+            mock.patch(
+                "requests.head", lambda url, **kw: self.handle("HEAD", url, **kw)
+            ),
+            mock.patch(
+                "requests.post", lambda url, **kw: self.handle("POST", url, **kw)
+            ),
+        ]
+        if self.patch_sleeps:
+            self._patches += [
+                mock.patch("pyalura.utils.sleep_progress", no_sleep),
+                mock.patch("pyalura.downloader.sleep_progress", no_sleep),
+            ]
+        self._patches.append(
+            mock.patch(
+                "pyalura.cookie_manager.CookieManager.get_cookies",
+                lambda self: {"SESSION": "fake"},
+            )
+        )
+        for patch in self._patches:
+            patch.start()
+        return self
+
+    def __exit__(self, *exc):
+        for patch in reversed(self._patches):
+            patch.stop()
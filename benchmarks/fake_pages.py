@@ -0,0 +1,77 @@
+"""
+Paginas HTML sinteticas con la misma estructura que las de Alura.
+
+Las usan los benchmarks para medir el parseo sin hacer peticiones reales.
+"""
+
+COURSE = "https://app.aluracursos.com/course/curso-de-prueba"
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, <strong>consectetur</strong> adipiscing elit, "
+    "sed do eiusmod tempor <code>incididunt</code> ut labore et dolore magna aliqua. "
+)
+
+
+def course_page(sections: int = 8, slug: str = "curso-de-prueba") -> str:
+    options = "".join(
+        f"<option value='{1000 + i}'>{i:02d}. Seccion {i}</option>"
+        for i in range(1, sections + 1)
+    )
+    return (
+        "<html><head><title>Curso de prueba | Alura</title></head><body>"
+        "<select class='task-menu-sections-select' "
+        f"onchange=\"window.location='/course/{slug}/section/'+this.value+'/tasks';\">"
+        f"{options}</select></body></html>"
+    )
+
+
+def section_page(
+    section: int = 1, items: int = 10, slug: str = "curso-de-prueba"
+) -> str:
+    types = ["VIDEO", "TEXT_CONTENT", "SINGLE_CHOICE", "WHAT_WE_LEARNED"]
+    lis = []
+    for i in range(1, items + 1):
+        task_id = section * 1000 + i
+        done = "task-menu-nav-item-svg--done" if i % 2 else ""
+        lis.append(
+            f"<li><a href='/course/{slug}/task/{task_id}'>"
+            f"<span class='task-menu-nav-item-number'>{i:02d}</span>"
+            f"<span title='Item {task_id}'>Item {task_id}</span>"
+            f"<svg class='task-menu-nav-item-svg {done}'>"
+            f"<use xlink:href='#{types[i % len(types)]}'></use></svg></a></li>"
+        )
+    return (
+        "<html><body><ul class='task-menu-nav-list'>"
+        + "".join(lis)
+        + "</ul></body></html>"
+    )
+
+
+def task_page(paragraphs: int = 200, alternatives: int = 0) -> str:
+    body = "".join(
+        f"<p>{LOREM * 3}</p><pre><code>print({i})</code></pre>"
+        for i in range(paragraphs)
+    )
+    answers = "".join(
+        f"<li class='alternativeList-item' data-alternative-id='{i}'>"
+        f"<p>Alternativa {i}</p>"
+        "<span class='alternativeList-item-alternativeOpinion'>"
+        f"{'Correcta' if i == 0 else 'Incorrecta'}</span></li>"
+        for i in range(alternatives)
+    )
+    return (
+        "<html><head><title>Item | Alura</title></head><body>"
+        "<span class='task-body-header-title-text'>Titulo</span>"
+        f"<section id='task-content'>{body}</section>"
+        f"<div class='container'><form>{answers}</form></div></body></html>"
+    )
+
+
+def course_landing_page(slug: str = "curso-de-prueba", category: str = "Programacion"):
+    return (
+        "<html><body><nav id='profileList'></nav>"
+        "<a class='course-header-banner-breadcrumb__category-link'>"
+        f"{category}</a><section class='course'><div class='container'>"
+        f"<a href='/course/{slug}/continue'>Continuar</a></div></section>"
+        "</body></html>"
+    )
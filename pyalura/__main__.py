@@ -0,0 +1,3 @@
+from pyalura.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,121 @@
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerStore:
+    """
+    Almacen local (SQLite) de las respuestas correctas de las preguntas.
+
+    Las respuestas son las mismas para todas las cuentas, asi que una vez que se
+    conocen no hace falta volver a pedir la pagina de la pregunta: basta con
+    enviar las alternativas guardadas. Se llena desde `QuestionItem.get_content`
+    y se consulta en `QuestionItem.resolve_question`.
+
+    Atributos:
+        path (Path): Ruta del archivo SQLite.
+    """
+
+    def __init__(self, path: Union[str, Path] = "answers.sqlite3"):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                task_id TEXT PRIMARY KEY,
+                alternatives TEXT NOT NULL,
+                choice_type TEXT NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def get(self, task_id: str) -> Optional[dict]:
+        """
+        Devuelve las respuestas guardadas de una pregunta.
+
+        Returns:
+            dict | None: `alternatives` (list[str]) y `choice_type`
+                ("singlechoice" o "multiplechoice"), o None si no esta guardada.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT alternatives, choice_type FROM answers WHERE task_id = ?",
+                (str(task_id),),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"alternatives": json.loads(row[0]), "choice_type": row[1]}
+
+    def put(self, task_id: str, alternatives: list[str], choice_type: str):
+        """Guarda las alternativas correctas de una pregunta."""
+        if not alternatives:
+            logger.debug(
+                "Pregunta %s sin alternativas correctas, no se guarda", task_id
+            )
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?)",
+                (str(task_id), json.dumps(alternatives), choice_type),
+            )
+            self._conn.commit()
+        logger.debug("Respuestas guardadas para la pregunta: %s", task_id)
+
+    def export_json(self, path: Union[str, Path]) -> int:
+        """
+        Exporta todas las respuestas a un archivo JSON.
+
+        Returns:
+            int: Cantidad de preguntas exportadas.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_id, alternatives, choice_type FROM answers"
+            ).fetchall()
+        data = {
+            task_id: {"alternatives": json.loads(alternatives), "choice_type": kind}
+            for task_id, alternatives, kind in rows
+        }
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        return len(data)
+
+    def import_json(self, path: Union[str, Path], overwrite: bool = False) -> int:
+        """
+        Importa respuestas desde un archivo JSON creado con `export_json`.
+
+        Args:
+            path (str | Path): Archivo a importar.
+            overwrite (bool): Si es True reemplaza las respuestas ya guardadas.
+
+        Returns:
+            int: Cantidad de preguntas nuevas o reemplazadas.
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        verb = "REPLACE" if overwrite else "IGNORE"
+        rows = [
+            (str(task_id), json.dumps(i["alternatives"]), i["choice_type"])
+            for task_id, i in data.items()
+            if i.get("alternatives")
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR {verb} INTO answers VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+            imported = self._conn.total_changes - before
+        logger.info("Importadas %d preguntas desde: %s", imported, path)
+        return imported
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,212 @@
+import hashlib
+import logging
+import posixpath
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Optional
+from urllib.parse import unquote, urlsplit
+
+from pyalura.manifest import Manifest
+from pyalura.retry import IncompleteDownloadError
+from pyalura.storage import Storage
+from pyalura.utils import HOST, string_to_slug
+
+if TYPE_CHECKING:
+    from pyalura.item import Item
+
+logger = logging.getLogger(__name__)
+
+# Carpeta, dentro de la de cada curso, donde se guardan imagenes y adjuntos.
+ASSETS_FOLDER = "assets"
+
+
+def asset_key(course_key: str, url: str) -> str:
+    """
+    Clave de un recurso: `subcategoria/curso/assets/<nombre>-<hash de la URL><ext>`.
+
+    Depende solo de la URL, asi que una misma URL cae siempre en la misma clave
+    y una descarga repetida se reconoce sin consultar nada.
+    """
+    name = posixpath.basename(unquote(urlsplit(url).path))
+    stem, ext = posixpath.splitext(name)
+    ext = ext.lower() if re.fullmatch(r"\.[a-z0-9]{1,5}", ext.lower()) else ""
+    stem = string_to_slug(stem)[:40].strip("-_")
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+    name = f"{stem}-{digest}{ext}" if stem else f"{digest}{ext}"
+    return f"{course_key}/{ASSETS_FOLDER}/{name}"
+
+
+def rewrite_markdown(markdown: str, local_keys: dict, document_key: str) -> str:
+    """
+    Cambia las URLs de los recursos por rutas relativas a sus copias locales.
+
+    Args:
+        markdown (str): Markdown del item.
+        local_keys (dict): Clave local de cada `ref` (la URL tal como aparece).
+        document_key (str): Clave del Markdown, para calcular la ruta relativa.
+    """
+    folder = posixpath.dirname(document_key)
+    for ref, key in local_keys.items():
+        local = posixpath.relpath(key, folder)
+        # ![alt](ref) y [texto](ref "titulo")
+        markdown = re.sub(
+            r"\]\(" + re.escape(ref) + r"(?=[\s)])", lambda _: f"]({local}", markdown
+        )
+        # <ref>: enlace automatico, que solo admite URLs absolutas.
+        markdown = markdown.replace(f"<{ref}>", f"[{posixpath.basename(key)}]({local})")
+    return markdown
+
+
+class AssetFetcher:
+    """
+    Descarga en paralelo las imagenes y los adjuntos de los items.
+
+    Cada recurso se guarda una vez por curso (ver `asset_key`). Varios items que
+    piden la misma URL a la vez comparten una sola descarga, y si la URL ya se
+    descargo para otro curso de la copia se lee del almacenamiento en lugar de
+    pedirla de nuevo.
+
+    Atributos:
+        storage (Storage): Donde se guardan los recursos, el mismo del `Downloader`.
+        manifest (Manifest, opcional): Registra tamaño y hash de cada recurso y
+            permite encontrar URLs descargadas en ejecuciones anteriores.
+        max_workers (int): Descargas simultaneas.
+        downloaded (int): Recursos descargados.
+        reused (int): Recursos que ya existian o se copiaron de otro curso.
+        failed (int): Recursos que no se pudieron descargar.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        manifest: Optional[Manifest] = None,
+        max_workers: int = 8,
+    ):
+        self.storage = storage
+        self.manifest = manifest
+        self.max_workers = max_workers
+        self.downloaded = 0
+        self.reused = 0
+        self.failed = 0
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="asset")
+        self._lock = threading.Lock()
+        self._futures: dict[str, Future] = {}
+        # Clave ya escrita de cada URL, en cualquier curso.
+        self._known: dict[str, str] = {}
+
+    def fetch(self, item: "Item", assets: list[dict], course_key: str) -> dict:
+        """
+        Descarga los recursos de un item y espera a que terminen.
+
+        Args:
+            item (Item): Item al que pertenecen; sus peticiones pasan por el
+                limitador, los reintentos y el transporte del curso.
+            assets (list[dict]): `ref` y `url` de cada recurso, como los devuelve
+                `parsing.parse_asset_refs`.
+            course_key (str): `subcategoria/curso`.
+
+        Returns:
+            dict: Clave local de cada `ref` descargado. Los que fallan no aparecen
+                (ni se vuelven a pedir en esta ejecucion) y su enlace queda
+                apuntando a la URL original.
+        """
+        futures = {
+            asset["ref"]: self._submit(item, asset["url"], course_key)
+            for asset in assets
+        }
+        local_keys = {}
+        for ref, future in futures.items():
+            if future.exception() is None:
+                local_keys[ref] = future.result()
+        return local_keys
+
+    def _submit(self, item: "Item", url: str, course_key: str) -> Future:
+        key = asset_key(course_key, url)
+        with self._lock:
+            future = self._futures.get(key)
+            # Un recurso que fallo (ya con sus reintentos) no se vuelve a pedir.
+            if future is None:
+                future = self._executor.submit(self._fetch, item, url, key)
+                self._futures[key] = future
+            return future
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _source_key(self, url: str) -> Optional[str]:
+        """Otra clave donde ya se guardo la misma URL, si la hay."""
+        with self._lock:
+            key = self._known.get(url)
+        if key is None and self.manifest is not None:
+            entry = self.manifest.find_source(url)
+            key = entry["key"] if entry is not None else None
+        if key is not None and self.storage.exists(key):
+            return key
+        return None
+
+    def _fetch(self, item: "Item", url: str, key: str) -> str:
+        try:
+            if self.storage.exists(key):
+                self._count("reused")
+            else:
+                source = self._source_key(url)
+                if source is not None:
+                    logger.debug("Copiando recurso %s desde %s", url, source)
+                    self._write(item, url, key, self.storage.iter_bytes(source), None)
+                    self._count("reused")
+                else:
+                    logger.debug("Descargando recurso %s", url)
+                    self._download(item, url, key)
+                    self._count("downloaded")
+        except Exception as e:
+            self._count("failed")
+            logger.warning("No se pudo descargar el recurso %s: %s", url, e)
+            raise
+        with self._lock:
+            self._known[url] = key
+        return key
+
+    def _download(self, item: "Item", url: str, key: str):
+        # Las cookies de la cuenta solo se envian a la propia plataforma.
+        same_host = urlsplit(url).netloc == urlsplit(HOST).netloc
+        kwargs = {} if same_host else {"cookies": None}
+        response = item.get_resource_stream(url, **kwargs)
+        try:
+            content_length = response.headers.get("Content-Length")
+            content_length = int(content_length) if content_length else None
+            if response.headers.get("Content-Encoding", "identity") != "identity":
+                content_length = None
+            chunks = response.iter_content(chunk_size=8192)
+            self._write(item, url, key, chunks, content_length)
+        finally:
+            response.close()
+
+    def _write(
+        self,
+        item: "Item",
+        url: str,
+        key: str,
+        chunks: Iterator[bytes],
+        content_length: Optional[int],
+    ):
+        sha256 = hashlib.sha256()
+        size = 0
+        with self.storage.open_write(key) as f:
+            for chunk in chunks:
+                if chunk:
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    size += len(chunk)
+            if content_length is not None and size != content_length:
+                raise IncompleteDownloadError(
+                    f"Se recibieron {size} de {content_length} bytes"
+                )
+        if self.manifest is not None:
+            self.manifest.put(
+                key, size, sha256.hexdigest(), item.url, url, content_length
+            )
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,225 @@
+"""
+Auditoria de integridad de una carpeta de descargas.
+
+Compara cada archivo con el tamaño y el hash que registro el `Downloader` en el
+manifiesto, y opcionalmente con el `Content-Length` actual del servidor. Los
+items rotos se borran del almacenamiento y se vuelven a encolar.
+
+Uso:
+    python -m pyalura.audit CARPETA [--storage zip] [--queue work_queue.sqlite3]
+"""
+
+import argparse
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from pyalura.cookie_manager import CookieManager
+from pyalura.manifest import MANIFEST_NAME, Manifest
+from pyalura.storage import STORAGES, Storage, get_storage
+from pyalura.utils import HOST
+from pyalura.work_queue import WorkQueue
+
+logger = logging.getLogger(__name__)
+
+# Extensiones que escribe el Downloader.
+ITEM_SUFFIXES = (".md", ".mp4")
+
+
+def _remote_cookies(cookie_manager: CookieManager, url: str) -> Optional[dict]:
+    # Las cookies de la cuenta solo se envian a la propia plataforma.
+    if urlsplit(url).netloc != urlsplit(HOST).netloc:
+        return None
+    try:
+        return cookie_manager.get_cookies()
+    except FileNotFoundError:
+        return None
+
+
+def check_entry(
+    storage: Storage,
+    entry: dict,
+    check_remote: bool = False,
+    cookie_manager: Optional[CookieManager] = None,
+) -> Optional[str]:
+    """
+    Verifica un registro del manifiesto.
+
+    Con `check_remote`, la peticion HEAD lleva las cookies y cabeceras de
+    `cookie_manager` (por defecto, las del directorio actual).
+
+    Returns:
+        str | None: El motivo por el que el archivo esta roto, o None si esta bien.
+    """
+    key = entry["key"]
+    if not storage.exists(key):
+        return "missing"
+
+    sha256 = hashlib.sha256()
+    size = 0
+    for chunk in storage.iter_bytes(key):
+        sha256.update(chunk)
+        size += len(chunk)
+
+    if size != entry["size"]:
+        return "size"
+    if entry["content_length"] is not None and size != entry["content_length"]:
+        return "content_length"
+    if sha256.hexdigest() != entry["sha256"]:
+        return "hash"
+
+    if check_remote and entry["source_url"]:
+        try:
+            cookie_manager = cookie_manager or CookieManager()
+            response = requests.head(
+                entry["source_url"],
+                cookies=_remote_cookies(cookie_manager, entry["source_url"]),
+                headers=cookie_manager.headers,
+                allow_redirects=True,
+            )
+        except requests.RequestException as e:
+            logger.warning("No se pudo consultar el servidor para %s: %s", key, e)
+            return None
+        remote = response.headers.get("Content-Length")
+        if response.ok and remote is not None and int(remote) != size:
+            return "remote_size"
+    return None
+
+
+def audit(
+    storage: Storage,
+    manifest: Manifest,
+    max_workers: int = 8,
+    check_remote: bool = False,
+    queue: Optional[WorkQueue] = None,
+    cookie_manager: Optional[CookieManager] = None,
+) -> dict:
+    """
+    Audita en paralelo todos los archivos registrados en el manifiesto.
+
+    Args:
+        storage (Storage): Almacenamiento que uso el `Downloader`.
+        manifest (Manifest): Manifiesto que lleno el `Downloader`.
+        max_workers (int): Hilos que leen y calculan hashes a la vez.
+        check_remote (bool): Si es True, tambien compara con el `Content-Length`
+            actual del servidor (una peticion HEAD por video).
+        queue (WorkQueue, opcional): Si se indica, los items rotos se borran del
+            almacenamiento y del manifiesto y se vuelven a encolar.
+        cookie_manager (CookieManager, opcional): Cookies de las peticiones HEAD
+            de `check_remote`.
+
+    Returns:
+        dict: `checked`, `ok`, `unrecorded` (archivos sin registro, que no se
+            pueden verificar) y `broken` (lista de dicts con `key`, `url` y
+            `reason`).
+    """
+    entries = manifest.entries()
+    recorded = {entry["key"] for entry in entries}
+    unrecorded = sum(
+        1
+        for key in storage.keys()
+        if key.endswith(ITEM_SUFFIXES) and key not in recorded
+    )
+
+    if check_remote and cookie_manager is None:
+        cookie_manager = CookieManager()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        reasons = list(
+            executor.map(
+                lambda e: check_entry(storage, e, check_remote, cookie_manager),
+                entries,
+            )
+        )
+
+    broken = [
+        {"key": entry["key"], "url": entry["url"], "reason": reason}
+        for entry, reason in zip(entries, reasons)
+        if reason is not None
+    ]
+    for item in broken:
+        logger.warning("Archivo roto (%s): %s", item["reason"], item["key"])
+
+    if queue is not None and broken:
+        for item in broken:
+            storage.delete(item["key"])
+            manifest.remove(item["key"])
+        storage.close()
+        queue.enqueue_items([i["url"] for i in broken if i["url"]], requeue=True)
+
+    result = {
+        "checked": len(entries),
+        "ok": len(entries) - len(broken),
+        "unrecorded": unrecorded,
+        "broken": broken,
+    }
+    logger.info(
+        "Auditoria: %d/%d correctos, %d rotos, %d sin registro.",
+        result["ok"],
+        result["checked"],
+        len(broken),
+        unrecorded,
+    )
+    return result
+
+
+def audit_folder(
+    base_folder: Union[str, Path],
+    storage: str = "folder",
+    manifest_path: Optional[Union[str, Path]] = None,
+    queue_path: Optional[Union[str, Path]] = None,
+    cookies_path: Optional[Union[str, Path]] = None,
+    **kwargs,
+) -> dict:
+    """Audita una carpeta de descargas; ver `audit`."""
+    base_folder = Path(base_folder)
+    if cookies_path is not None:
+        kwargs["cookie_manager"] = CookieManager(str(cookies_path))
+    manifest = Manifest(manifest_path or base_folder / MANIFEST_NAME)
+    queue = WorkQueue(queue_path) if queue_path else None
+    backend = get_storage(storage, base_folder)
+    try:
+        return audit(backend, manifest, queue=queue, **kwargs)
+    finally:
+        backend.close()
+        manifest.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pyalura.audit",
+        description="Verifica los archivos descargados contra el manifiesto.",
+    )
+    parser.add_argument("base_folder")
+    parser.add_argument("--storage", choices=sorted(STORAGES), default="folder")
+    parser.add_argument("--manifest", help=f"Por defecto CARPETA/{MANIFEST_NAME}")
+    parser.add_argument("--queue", help="Cola donde reencolar los items rotos")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--check-remote", action="store_true")
+    parser.add_argument("--cookies", help="Archivo de cookies para --check-remote")
+    args = parser.parse_args(argv)
+
+    result = audit_folder(
+        args.base_folder,
+        storage=args.storage,
+        manifest_path=args.manifest,
+        queue_path=args.queue,
+        max_workers=args.workers,
+        check_remote=args.check_remote,
+        cookies_path=args.cookies,
+    )
+    for item in result["broken"]:
+        print(f"{item['reason']}\t{item['key']}")
+    print(
+        f"{result['ok']}/{result['checked']} correctos, "
+        f"{len(result['broken'])} rotos, {result['unrecorded']} sin registro"
+    )
+    return 1 if result["broken"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+import enum
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from pyalura.clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(enum.IntEnum):
+    """
+    Clases de prioridad del trafico. Un numero menor significa mayor prioridad.
+
+    - INTERACTIVE: Peticiones pequeñas y sensibles a la latencia (listados de
+      secciones, JSON de `/video`, envio de respuestas).
+    - CONTENT: Paginas de items que se convierten a Markdown.
+    - BULK: Bytes de los videos.
+    """
+
+    INTERACTIVE = 0
+    CONTENT = 1
+    BULK = 2
+
+
+class _TokenBucket:
+    """Cubeta de bytes que admite deuda: quien consume de mas espera a pagarla."""
+
+    def __init__(self, bytes_per_second: Optional[float], clock: Clock):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.set_rate(bytes_per_second)
+
+    def set_rate(self, bytes_per_second: Optional[float]):
+        with self._lock:
+            self.bytes_per_second = bytes_per_second
+            self._capacity = max(64 * 1024, bytes_per_second or 0)
+            self._tokens = self._capacity
+            self._last = self.clock.monotonic()
+
+    def reserve(self, nbytes: int) -> float:
+        """Descuenta `nbytes` y devuelve los segundos que hay que esperar."""
+        with self._lock:
+            if not self.bytes_per_second:
+                return 0.0
+            now = self.clock.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last) * self.bytes_per_second,
+            )
+            self._last = now
+            self._tokens -= nbytes
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.bytes_per_second
+
+
+class WorkerLimit:
+    """
+    Limite de bytes por segundo de un solo trabajador, dentro del limite global.
+
+    Atributos:
+        bytes_per_second (float, opcional): Limite del trabajador; None es sin limite.
+    """
+
+    def __init__(
+        self, bytes_per_second: Optional[float] = None, clock: Optional[Clock] = None
+    ):
+        self._bucket = _TokenBucket(bytes_per_second, clock or SYSTEM_CLOCK)
+
+    @property
+    def bytes_per_second(self) -> Optional[float]:
+        return self._bucket.bytes_per_second
+
+    def set_rate(self, bytes_per_second: Optional[float]):
+        """Cambia el limite en caliente."""
+        self._bucket.set_rate(bytes_per_second)
+        logger.info("Limite del trabajador: %s bytes/s", bytes_per_second)
+
+
+class BandwidthShaper:
+    """
+    Reparte el ancho de banda entre trabajadores y clases de prioridad.
+
+    Hay un limite global de bytes por segundo (opcional) y uno por trabajador
+    (`worker`). Las peticiones de mayor prioridad se registran con `request`;
+    mientras haya alguna en vuelo, los consumidores de menor prioridad (los
+    videos) ceden el paso hasta `max_yield` segundos por bloque, para que no
+    queden bloqueados indefinidamente.
+
+    Los limites se pueden cambiar en caliente con `set_rate`.
+
+    Atributos:
+        bytes_per_second (float, opcional): Limite global; None es sin limite.
+        max_yield (float): Tiempo maximo que cede un bloque de menor prioridad.
+        clock (Clock): Reloj con el que se mide y se espera; lo heredan los
+            limites de los trabajadores.
+    """
+
+    def __init__(
+        self,
+        bytes_per_second: Optional[float] = None,
+        max_yield: float = 0.5,
+        clock: Optional[Clock] = None,
+    ):
+        self.clock = clock or SYSTEM_CLOCK
+        self._bucket = _TokenBucket(bytes_per_second, self.clock)
+        self.max_yield = max_yield
+        self._in_flight = {priority: 0 for priority in Priority}
+        self._condition = threading.Condition()
+
+    @property
+    def bytes_per_second(self) -> Optional[float]:
+        return self._bucket.bytes_per_second
+
+    def set_rate(self, bytes_per_second: Optional[float]):
+        """Cambia el limite global en caliente."""
+        self._bucket.set_rate(bytes_per_second)
+        logger.info("Limite global de ancho de banda: %s bytes/s", bytes_per_second)
+
+    def worker(self, bytes_per_second: Optional[float] = None) -> WorkerLimit:
+        """Crea el limite de un trabajador."""
+        return WorkerLimit(bytes_per_second, self.clock)
+
+    @contextmanager
+    def request(self, priority: Priority):
+        """Registra una peticion en vuelo de la prioridad dada."""
+        with self._condition:
+            self._in_flight[priority] += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight[priority] -= 1
+                self._condition.notify_all()
+
+    def _has_higher(self, priority: Priority) -> bool:
+        return any(self._in_flight[p] for p in Priority if p < priority)
+
+    def consume(
+        self,
+        nbytes: int,
+        priority: Priority = Priority.BULK,
+        worker: Optional[WorkerLimit] = None,
+    ):
+        """
+        Espera lo necesario para transferir `nbytes` respetando limites y prioridades.
+        """
+        with self._condition:
+            deadline = self.clock.monotonic() + self.max_yield
+            while self._has_higher(priority):
+                remaining = deadline - self.clock.monotonic()
+                if remaining <= 0:
+                    break
+                self.clock.wait(self._condition, remaining)
+
+        wait = self._bucket.reserve(nbytes)
+        if worker is not None:
+            wait = max(wait, worker._bucket.reserve(nbytes))
+        self.clock.sleep(wait)
@@ -1,20 +1,58 @@
 import logging
+import threading
+import time
 
 import requests
 from lxml import html
 
-from pyalura.cookie_manager import CookieManager
+from pyalura.bandwidth import Priority
+from pyalura.clock import SYSTEM_CLOCK
+from pyalura.cookie_manager import CookieManager, SessionExpiredError
+from pyalura.retry import RetryPolicy, parse_retry_after
+from pyalura.transport import HTTPTransport
 from pyalura.utils import string_to_slug
 
 logger = logging.getLogger(__name__)
 
 
 class Base:
-    def __init__(self, cookies_path=None, cookie_manager=None) -> None:
+    def __init__(
+        self,
+        cookies_path=None,
+        cookie_manager=None,
+        rate_limiter=None,
+        parser_pool=None,
+        retry_policy=None,
+        bandwidth_shaper=None,
+        transport=None,
+        hedge_policy=None,
+        clock=None,
+    ) -> None:
         if cookie_manager:
             self.cookie_manager = cookie_manager
         else:
             self.cookie_manager = CookieManager(cookies_path=cookies_path)
+        self.rate_limiter = rate_limiter
+        self.parser_pool = parser_pool
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.bandwidth_shaper = bandwidth_shaper
+        self.transport = transport or HTTPTransport()
+        self.hedge_policy = hedge_policy
+        # Reloj de las esperas (reintentos, pausas entre items); ver `pyalura.clock`.
+        self.clock = clock or SYSTEM_CLOCK
+
+    def _shared_options(self) -> dict:
+        """Opciones que heredan los objetos hijos (Section de Course, Item de Section)."""
+        return {
+            "cookie_manager": self.cookie_manager,
+            "rate_limiter": self.rate_limiter,
+            "parser_pool": self.parser_pool,
+            "retry_policy": self.retry_policy,
+            "bandwidth_shaper": self.bandwidth_shaper,
+            "transport": self.transport,
+            "hedge_policy": self.hedge_policy,
+            "clock": self.clock,
+        }
 
     @property
     def headers(self):
@@ -24,23 +62,144 @@ class Base:
     def cookies(self):
         return self.cookie_manager.get_cookies()
 
-    def _make_request(self, url, method="GET", **kwargs):
-        logger.debug(f"Request: {url}, method: {method}, kwargs: {kwargs}")
+    def _make_request(
+        self, url, method="GET", priority=None, retry_policy=None, **kwargs
+    ):
+        """
+        Hace una peticion pasando por el limitador y la reintenta segun
+        `retry_policy` (por defecto, la del objeto).
 
-        if method.upper() == "GET":
-            method = requests.get
-        elif method.upper() == "POST":
-            method = requests.post
-        elif method.upper() == "HEAD":
-            method = requests.head
-        else:
+        Las peticiones con `stream=True` ocupan su lugar en el limitador hasta que
+        se cierra la respuesta: quien las pide debe cerrarlas.
+        """
+        logger.debug("Request: %s, method: %s, kwargs: %s", url, method, kwargs)
+        retry_policy = retry_policy or self.retry_policy
+
+        method_name = method.upper()
+        if method_name not in ("GET", "POST", "HEAD"):
             raise NotImplementedError
 
-        response = method(url, cookies=self.cookies, headers=self.headers, **kwargs)
-        logger.debug(f"Response: {response.status_code}")
-        response.raise_for_status()
+        # Solo las peticiones con las cookies de la cuenta dependen de la sesion.
+        with_session = self.transport.needs_cookies and "cookies" not in kwargs
+        if with_session:
+            self.cookie_manager.ensure_session()
+
+        attempt = 0
+        while True:
+            response, error = self._send_attempt(method_name, url, priority, **kwargs)
+            if not retry_policy.should_retry(
+                method_name, attempt, response=response, error=error
+            ):
+                break
+            delay = retry_policy.delay(attempt, response, self.clock.random)
+            status = response.status_code if response is not None else error
+            logger.warning(
+                "Reintentando %s en %.1fs (%s), intento %d",
+                url,
+                delay,
+                status,
+                attempt + 1,
+            )
+            if response is not None:
+                response.close()
+            self.clock.sleep(delay)
+            attempt += 1
+
+        if error is not None:
+            raise error
+        logger.debug("Response: %s", response.status_code)
+        if with_session and self.cookie_manager.is_login_redirect(response):
+            response.close()
+            self.cookie_manager.mark_expired()
+            raise SessionExpiredError(f"La sesion vencio (redireccion al login): {url}")
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            # Libera la conexion (y el lugar en el limitador) de un stream fallido.
+            response.close()
+            raise
         return response
 
+    def _send_attempt(self, method, url, priority=None, **kwargs):
+        """Como `_send_request`, pero repite los GET lentos si hay `hedge_policy`."""
+        if self.hedge_policy is None or method != "GET" or kwargs.get("stream"):
+            return self._send_request(method, url, priority, **kwargs)
+        return self.hedge_policy.send(
+            lambda timing: self._send_request(
+                method, url, priority, timing=timing, **kwargs
+            )
+        )
+
+    def _send_request(self, method, url, priority=None, timing=None, **kwargs):
+        """
+        Hace una sola peticion pasando por el limitador. Devuelve (response, error).
+
+        `timing` (`hedging.Timing`) registra cuando sale la peticion, ya fuera
+        del limitador, y cuanto tarda.
+        """
+        if priority is None:
+            priority = Priority.BULK if kwargs.get("stream") else Priority.INTERACTIVE
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        if "cookies" in kwargs:
+            # Quien llama decide, p. ej. None para no enviarlas a otro dominio.
+            cookies = kwargs.pop("cookies")
+        else:
+            cookies = self.cookies if self.transport.needs_cookies else None
+        send = self.transport.request
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        start = time.monotonic()
+        if timing is not None:
+            timing.start()
+        response, error = None, None
+        try:
+            if self.bandwidth_shaper is None:
+                response = send(method, url, cookies=cookies, headers=headers, **kwargs)
+            else:
+                with self.bandwidth_shaper.request(priority):
+                    response = send(
+                        method, url, cookies=cookies, headers=headers, **kwargs
+                    )
+                if not kwargs.get("stream"):
+                    self.bandwidth_shaper.consume(len(response.content), priority)
+        except requests.RequestException as e:
+            error = e
+        finally:
+            if timing is not None:
+                timing.stop()
+            if self.rate_limiter is not None:
+                result = {
+                    "latency": time.monotonic() - start,
+                    "status": response.status_code if response is not None else None,
+                    "retry_after": parse_retry_after(response),
+                }
+                if response is not None and kwargs.get("stream"):
+                    # El cuerpo todavia no se descargo: sigue en vuelo hasta cerrarla.
+                    self._release_on_close(response, result)
+                else:
+                    self.rate_limiter.release(**result)
+        return response, error
+
+    def _release_on_close(self, response, result: dict):
+        """Libera el lugar de la peticion en el limitador al cerrar la respuesta."""
+        original_close = response.close
+        released = threading.Lock()
+
+        def close():
+            try:
+                original_close()
+            finally:
+                if released.acquire(blocking=False):
+                    self.rate_limiter.release(**result)
+
+        response.close = close
+
+    def _run_parser(self, func, *args):
+        """Ejecuta una funcion de `pyalura.parsing` en el pool, si hay uno configurado."""
+        if self.parser_pool is None:
+            return func(*args)
+        return self.parser_pool.run(func, *args)
+
     def _fetch_root(self, url):
         response = self._make_request(url)
         return html.fromstring(response.text)
@@ -0,0 +1,255 @@
+import logging
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Optional, Union
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from lxml import html
+from lxml.html import HtmlElement
+
+from pyalura import parsing
+from pyalura.base import Base
+from pyalura.cookie_manager import CookieManager
+from pyalura.parsing import ParserPool
+from pyalura.rate_limit import RateLimiter
+from pyalura.transport import Transport
+from pyalura.utils import HOST, string_to_slug
+
+logger = logging.getLogger(__name__)
+
+# /course/<slug> en app.aluracursos.com y /curso-online-<slug> en www.aluracursos.com
+COURSE_PATH_PATTERNS = [
+    re.compile(r"^/course/(?P<slug>[^/]+)/?$"),
+    re.compile(r"^/curso-online-(?P<slug>[^/]+)/?$"),
+]
+# Paginas de categoria, subcategoria y formacion (ruta de aprendizaje).
+LISTING_PATH_PATTERNS = [
+    re.compile(r"^/cursos-online-(?P<category>[^/]+)(?:/(?P<subcategory>[^/]+))?/?$"),
+    re.compile(r"^/category/(?P<category>[^/]+)(?:/(?P<subcategory>[^/]+))?/?$"),
+    re.compile(r"^/(?:formacion|formacao)-(?P<formation>[^/]+)/?$"),
+]
+
+
+class CatalogCrawler(Base):
+    """
+    Recorre paginas de categoria o de formacion y enumera los cursos que contienen.
+
+    Parte de una URL de categoria (`/cursos-online-<categoria>`), subcategoria o
+    formacion (`/formacion-<nombre>`) y sigue los enlaces a otras paginas de
+    listado del mismo sitio. Las paginas se piden en paralelo con un numero
+    acotado de hilos y una frontera de tamaño maximo `max_frontier`; cada URL se
+    visita una sola vez. Todas las peticiones pasan por `_make_request`, por lo que
+    respetan el `RateLimiter` compartido (el mismo que se le pasa al `Downloader`).
+    Las paginas del sitio publico (www) no necesitan cookies.
+
+    El resultado de `crawl` se puede pasar directamente a `Downloader.download_list`.
+
+    Atributos:
+        max_workers (int): Cantidad de paginas que se piden a la vez.
+        max_frontier (int): Paginas pendientes maximas; las que sobran se descartan.
+        max_depth (int): Profundidad maxima de enlaces a seguir desde la URL inicial.
+
+    Con un `ParserPool` las paginas se parsean en otros procesos, como en `Course`.
+    """
+
+    def __init__(
+        self,
+        cookies_path: Optional[Union[str, Path]] = None,
+        cookie_manager: Optional[CookieManager] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_workers: int = 4,
+        max_frontier: int = 256,
+        max_depth: int = 2,
+        fetch_root: Optional[Callable[[str], HtmlElement]] = None,
+        transport: Optional[Transport] = None,
+        parser_pool: Optional[ParserPool] = None,
+    ):
+        super().__init__(
+            cookies_path=cookies_path,
+            cookie_manager=cookie_manager,
+            rate_limiter=rate_limiter,
+            parser_pool=parser_pool,
+            transport=transport,
+        )
+        self.max_workers = max_workers
+        self.max_frontier = max_frontier
+        self.max_depth = max_depth
+        # Permite inyectar paginas guardadas en disco (fixtures) en lugar de la red.
+        self._fetch = fetch_root
+
+    @staticmethod
+    def to_course_url(url: str) -> Union[str, None]:
+        """
+        Convierte una URL de curso (de la app o del sitio publico) en la URL del curso en la app.
+
+        Ejemplo:
+            https://www.aluracursos.com/curso-online-java-orientacion-objetos
+            -> https://app.aluracursos.com/course/java-orientacion-objetos
+        """
+        path = urlparse(url).path
+        for pattern in COURSE_PATH_PATTERNS:
+            match = pattern.match(path)
+            if match:
+                return f"{HOST}/course/{match.group('slug')}"
+        return None
+
+    @staticmethod
+    def parse_listing_url(url: str) -> Union[dict, None]:
+        """
+        Devuelve la categoria, subcategoria y formacion de una URL de listado, o None
+        si la URL no es una pagina de listado.
+        """
+        path = urlparse(url).path
+        for pattern in LISTING_PATH_PATTERNS:
+            match = pattern.match(path)
+            if match:
+                groups = match.groupdict()
+                return {
+                    "category": groups.get("category"),
+                    "subcategory": groups.get("subcategory"),
+                    "formation": groups.get("formation"),
+                }
+        return None
+
+    @staticmethod
+    def parse_page(root: "HtmlElement", page_url: str) -> dict:
+        """
+        Extrae los cursos y los enlaces a otras paginas de listado de una pagina.
+
+        Returns:
+            dict: Un diccionario con los campos:
+                - `courses` (list[dict]): Cursos encontrados, con `url`, `title`,
+                  `subcategory`, `formation` y `source`.
+                - `listings` (list[str]): URLs de otras paginas de listado.
+        """
+        page_info = CatalogCrawler.parse_listing_url(page_url) or {}
+        page_host = urlparse(page_url).netloc
+
+        heading = root.find(".//h1")
+        page_title = heading.text_content().strip() if heading is not None else ""
+        subcategory = page_info.get("subcategory") or page_info.get("category")
+        subcategory = string_to_slug(subcategory) if subcategory else None
+
+        courses = []
+        listings = []
+        for anchor in root.xpath(".//a[@href]"):
+            href, _ = urldefrag(urljoin(page_url, anchor.get("href")))
+            course_url = CatalogCrawler.to_course_url(href)
+            if course_url:
+                title = anchor.get("title") or anchor.text_content()
+                courses.append(
+                    {
+                        "url": course_url,
+                        "title": " ".join(title.split()),
+                        "subcategory": subcategory,
+                        "formation": page_title if page_info.get("formation") else None,
+                        "source": page_url,
+                    }
+                )
+                continue
+            same_site = urlparse(href).netloc == page_host
+            if same_site and CatalogCrawler.parse_listing_url(href):
+                listings.append(href)
+
+        return {"courses": courses, "listings": listings}
+
+    def _fetch_page(self, url: str) -> bytes:
+        if urlparse(url).netloc == urlparse(HOST).netloc:
+            return self._make_request(url).content
+        # Las paginas del sitio publico se ven sin sesion: las cookies se envian
+        # solo si hay un archivo de cookies.
+        cookies = None
+        if self.transport.needs_cookies:
+            try:
+                cookies = self.cookies
+            except FileNotFoundError:
+                logger.debug("Sin archivo de cookies, se pide sin sesion: %s", url)
+        return self._make_request(url, cookies=cookies).content
+
+    def _crawl_page(self, url: str) -> dict:
+        logger.debug("Recorriendo pagina del catalogo: %s", url)
+        if self._fetch is not None:
+            return self.parse_page(self._fetch(url), url)
+        raw = self._fetch_page(url)
+        return self._run_parser(parsing.parse_catalog_page, raw, url)
+
+    def crawl(self, url: str) -> list[dict]:
+        """
+        Recorre el catalogo desde `url` y devuelve los cursos encontrados, sin duplicados.
+
+        Args:
+            url (str): URL de una categoria, subcategoria o formacion.
+
+        Returns:
+            list[dict]: Cursos encontrados en el orden en que se descubrieron.
+        """
+        logger.info("Recorriendo catalogo desde: %s", url)
+        seen_pages = {url}
+        courses: dict[str, dict] = {}
+        frontier = deque([(url, 0)])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            while frontier or pending:
+                while frontier and len(pending) < self.max_workers:
+                    page_url, depth = frontier.popleft()
+                    future = executor.submit(self._crawl_page, page_url)
+                    pending[future] = (page_url, depth)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_url, depth = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error("No se pudo recorrer %s: %s", page_url, e)
+                        continue
+
+                    for course in result["courses"]:
+                        known = courses.get(course["url"])
+                        if known is None:
+                            courses[course["url"]] = course
+                        else:
+                            # Completa los datos que falten con los de otras paginas y
+                            # prefiere la subcategoria de la pagina mas especifica.
+                            for key, value in course.items():
+                                if not known.get(key) and value:
+                                    known[key] = value
+                            source_info = self.parse_listing_url(course["source"])
+                            if source_info and source_info["subcategory"]:
+                                known["subcategory"] = course["subcategory"]
+
+                    if depth >= self.max_depth:
+                        continue
+                    for listing in result["listings"]:
+                        if listing in seen_pages:
+                            continue
+                        if len(frontier) >= self.max_frontier:
+                            logger.warning(
+                                "Frontera llena (%d), se descarta: %s",
+                                self.max_frontier,
+                                listing,
+                            )
+                            continue
+                        seen_pages.add(listing)
+                        frontier.append((listing, depth + 1))
+
+        logger.info(
+            "Catalogo recorrido: %d paginas, %d cursos.", len(seen_pages), len(courses)
+        )
+        return list(courses.values())
+
+    def crawl_many(self, urls: list[str]) -> list[dict]:
+        """Recorre varias paginas de inicio y une los resultados sin duplicados."""
+        courses: dict[str, dict] = {}
+        for url in urls:
+            for course in self.crawl(url):
+                courses.setdefault(course["url"], course)
+        return list(courses.values())
+
+    @staticmethod
+    def load_fixture(path: Union[str, Path]) -> "HtmlElement":
+        """Carga una pagina guardada en disco, util para usar con `fetch_root`."""
+        return html.fromstring(Path(path).read_bytes())
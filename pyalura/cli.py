@@ -0,0 +1,237 @@
+"""
+Ejecuta un archivo de trabajos (ver `pyalura.jobs`) con varios trabajadores y
+emite el avance como eventos JSON, uno por linea.
+
+Uso:
+    pyalura trabajos.txt --output "Mis Cursos Alura" --workers 4 --rate 2
+    python -m pyalura trabajos.txt --progress avance.jsonl
+
+Eventos (campo `event`):
+    job_started   trabajo que empieza: `job`, `action`, `url`.
+    progress      avance de un trabajo: ver `jobs.JobProgress.snapshot`.
+    job_finished  `status` ("done" o "failed"), `error` y el ultimo avance.
+    summary       totales al terminar: trabajos hechos y fallidos, y tiempo.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Optional
+
+from pyalura.answer_store import AnswerStore
+from pyalura.cookie_manager import CookieManager
+from pyalura.downloader import Downloader
+from pyalura.filters import VIDEO_QUALITIES, ItemFilter
+from pyalura.hedging import HedgePolicy
+from pyalura.item_index import ITEM_INDEX_NAME, ItemIndex
+from pyalura.jobs import JobProgress, job_filter, load_jobs, run_job
+from pyalura.log import log_context, setup_logging
+from pyalura.manifest import MANIFEST_NAME, Manifest
+from pyalura.page_store import PAGE_STORE_NAME, PageStore
+from pyalura.rate_limit import RateLimiter
+from pyalura.storage import STORAGES, get_storage
+from pyalura.transport import SessionTransport
+
+logger = logging.getLogger(__name__)
+
+
+class JsonLinesReporter:
+    """Escribe eventos como JSON lines; seguro entre hilos."""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def event(self, name: str, **fields):
+        line = json.dumps({"event": name, "time": time.time(), **fields}, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class BatchRunner:
+    """
+    Reparte los trabajos entre `workers` hilos. Cada hilo tiene su propio
+    `Downloader`; todos comparten cookies, conexiones, limitador y
+    almacenamiento.
+    """
+
+    def __init__(
+        self,
+        reporter: JsonLinesReporter,
+        workers: int = 1,
+        progress_interval: float = 1.0,
+        **downloader_options,
+    ):
+        self.reporter = reporter
+        self.workers = workers
+        self.progress_interval = progress_interval
+        self.downloader_options = downloader_options
+        self._local = threading.local()
+
+    def _downloader(self) -> Downloader:
+        downloader = getattr(self._local, "downloader", None)
+        if downloader is None:
+            downloader = Downloader(**self.downloader_options)
+            self._local.downloader = downloader
+        return downloader
+
+    def run_one(self, job_id: int, job: dict) -> bool:
+        self.reporter.event(
+            "job_started", job=job_id, action=job["action"], url=job["url"]
+        )
+        progress = JobProgress(
+            lambda snapshot: self.reporter.event("progress", job=job_id, **snapshot),
+            job_filter(job),
+            self.progress_interval,
+        )
+        error = None
+        try:
+            with log_context(job=job_id):
+                run_job(self._downloader(), job, progress)
+        except Exception as e:
+            logger.error("Trabajo %s fallido: %s", job_id, e)
+            error = str(e)
+        self.reporter.event(
+            "job_finished",
+            job=job_id,
+            status="failed" if error else "done",
+            error=error,
+            **progress.snapshot(),
+        )
+        return error is None
+
+    def run(self, jobs: list[dict]) -> dict:
+        start = time.monotonic()
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="job") as executor:
+            results = list(executor.map(self.run_one, range(1, len(jobs) + 1), jobs))
+        summary = {
+            "jobs": len(jobs),
+            "done": results.count(True),
+            "failed": results.count(False),
+            "elapsed": time.monotonic() - start,
+        }
+        self.reporter.event("summary", **summary)
+        return summary
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="pyalura",
+        description="Ejecuta un archivo de trabajos (download, sync, complete).",
+    )
+    parser.add_argument("jobs", help="Archivo de trabajos, uno por linea")
+    parser.add_argument("-o", "--output", default="Descargas", help="Carpeta")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--rate", type=float, help="Peticiones por segundo (total)")
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--cookies", help="Archivo de cookies")
+    parser.add_argument("--storage", choices=sorted(STORAGES))
+    parser.add_argument(
+        "--history", help="Historial de cursos (por defecto en la carpeta)"
+    )
+    parser.add_argument(
+        "--manifest",
+        nargs="?",
+        const="",
+        help=f"Registra tamaño y hash (por defecto CARPETA/{MANIFEST_NAME})",
+    )
+    parser.add_argument(
+        "--pages",
+        nargs="?",
+        const="",
+        help=f"Guarda el HTML para `pyalura.rerender` (por defecto CARPETA/{PAGE_STORE_NAME})",
+    )
+    parser.add_argument(
+        "--item-index",
+        nargs="?",
+        const="",
+        help=f"Indice de items de los cursos (por defecto CARPETA/{ITEM_INDEX_NAME})",
+    )
+    parser.add_argument("--answers", help="Base de respuestas de las preguntas")
+    parser.add_argument("--max-quality", choices=VIDEO_QUALITIES)
+    parser.add_argument(
+        "--hedge",
+        type=float,
+        metavar="PERCENTIL",
+        help="Repite las paginas que tardan mas que este percentil (p. ej. 0.95)",
+    )
+    parser.add_argument("--progress", default="-", help="Destino de los eventos")
+    parser.add_argument("--progress-interval", type=float, default=1.0)
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+
+    if args.hedge is not None and not 0 < args.hedge < 1:
+        parser.error("--hedge es un percentil entre 0 y 1 (p. ej. 0.95)")
+
+    setup_logging(getattr(logging, args.log_level.upper()))
+    try:
+        jobs = load_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    cookie_manager = CookieManager(cookies_path=args.cookies)
+    manifest = None
+    if args.manifest is not None:
+        manifest = Manifest(args.manifest or output / MANIFEST_NAME)
+    page_store = None
+    if args.pages is not None:
+        page_store = PageStore(args.pages or output / PAGE_STORE_NAME)
+    item_index = None
+    if args.item_index is not None:
+        item_index = ItemIndex(args.item_index or output / ITEM_INDEX_NAME)
+    # Un solo almacenamiento para todos los hilos, como en el demonio.
+    storage = get_storage(args.storage or "folder", output)
+    hedge_policy = HedgePolicy(args.hedge) if args.hedge else None
+    stream = (
+        sys.stdout
+        if args.progress == "-"
+        else open(args.progress, "a", encoding="utf-8")
+    )
+
+    try:
+        with SessionTransport() as transport:
+            runner = BatchRunner(
+                JsonLinesReporter(stream),
+                workers=args.workers,
+                progress_interval=args.progress_interval,
+                base_folder=output,
+                storage=storage,
+                cookie_manager=cookie_manager,
+                transport=transport,
+                rate_limiter=(
+                    RateLimiter(args.rate, args.burst) if args.rate else None
+                ),
+                manifest=manifest,
+                page_store=page_store,
+                item_index=item_index,
+                answer_store=AnswerStore(args.answers) if args.answers else None,
+                history_file=args.history,
+                item_filter=ItemFilter(max_video_quality=args.max_quality),
+                hedge_policy=hedge_policy,
+            )
+            summary = runner.run(jobs)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        storage.close()
+        if manifest is not None:
+            manifest.close()
+        if page_store is not None:
+            page_store.close()
+        if item_index is not None:
+            item_index.close()
+        if hedge_policy is not None:
+            hedge_policy.close()
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
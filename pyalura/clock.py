@@ -0,0 +1,96 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Clock:
+    """
+    Reloj, espera y azar que usan las esperas entre peticiones y actividades
+    (`sleep_progress`, `PacingScheduler`, `RateLimiter`, `AdaptiveLimiter`,
+    `BandwidthShaper`, los reintentos y las esperas entre items).
+
+    Esta implementacion usa el tiempo real; `SimulatedClock` permite recorrer
+    cursos enteros en segundos midiendo cuanto habrian durado.
+
+    Atributos:
+        random: Generador de numeros aleatorios (por defecto, el modulo `random`).
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.random = rng or random
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, condition: threading.Condition, timeout: Optional[float] = None):
+        """Espera en `condition` (ya tomada) hasta que la notifiquen o pase `timeout`."""
+        condition.wait(timeout)
+
+
+# Reloj por defecto de todos los objetos.
+SYSTEM_CLOCK = Clock()
+
+
+class SimulatedClock(Clock):
+    """
+    Reloj simulado: `sleep` no espera, solo adelanta el reloj.
+
+    Con el sustituto local de la plataforma (`benchmarks/fake_alura.py`) un curso
+    se completa en segundos y `elapsed` dice cuanto habria tardado de verdad,
+    lo que permite comparar politicas de espera.
+
+    Las esperas de varios hilos se suman, como si fueran una tras otra; con un
+    solo hilo (p. ej. `complete_all_activities`) el tiempo es exacto.
+
+    Atributos:
+        start (datetime): Fecha y hora simuladas al crear el reloj.
+        elapsed (float): Segundos simulados transcurridos.
+        sleeps (int): Cantidad de esperas.
+        random (random.Random): Generador con semilla `seed`, para que dos
+            ejecuciones esperen lo mismo.
+    """
+
+    def __init__(self, start: Optional[datetime] = None, seed: Optional[int] = 0):
+        super().__init__(random.Random(seed))
+        self.start = start or datetime.now()
+        self.elapsed = 0.0
+        self.sleeps = 0
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self.elapsed
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self.elapsed)
+
+    def sleep(self, seconds: float):
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.elapsed += seconds
+            self.sleeps += 1
+
+    def wait(self, condition: threading.Condition, timeout: Optional[float] = None):
+        # Sin plazo hay que esperar de verdad a otro hilo; con plazo, se da por
+        # vencido y quien espera vuelve a comprobar con el reloj adelantado.
+        if timeout is None:
+            condition.wait()
+        else:
+            self.sleep(timeout)
+
+    def advance(self, seconds: float):
+        """Adelanta el reloj sin contar una espera (p. ej. la latencia simulada de la red)."""
+        with self._lock:
+            self.elapsed += max(0.0, seconds)
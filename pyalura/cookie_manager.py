@@ -1,10 +1,20 @@
 import json
+import logging
+import threading
+import time
 from pathlib import Path
+from urllib.parse import urljoin, urlsplit
 
 import requests
 from lxml import html
 
-from pyalura.utils import get_downloads_folder
+from pyalura.utils import HOST, get_downloads_folder
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_URL = f"{HOST}/dashboard"
+# Rutas a las que la plataforma redirige cuando la sesion no es valida.
+LOGIN_PATHS = ("/signin", "/loginForm", "/login")
 
 headers = {
     "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
@@ -22,14 +32,41 @@ headers = {
 }
 
 
+class SessionExpiredError(Exception):
+    """Las cookies ya no abren una sesion: la plataforma redirige al login."""
+
+
 class CookieManager:
+    """
+    Lee las cookies de la cuenta y lleva el estado de la sesion.
+
+    Las cookies se recargan solas si el archivo cambia (se mira su fecha de
+    modificacion como mucho cada `reload_interval` segundos), y el resultado de
+    `check_cookies` se guarda durante `validation_ttl` segundos. Cuando una
+    respuesta redirige al login, la sesion se marca como vencida y las
+    peticiones siguientes fallan enseguida con `SessionExpiredError` hasta que
+    el archivo de cookies cambie.
 
-    def __init__(self, cookies_path=None):
+    Atributos:
+        validation_ttl (float): Segundos que vale una validacion de la sesion.
+        reload_interval (float): Cada cuanto se mira si el archivo cambio.
+        expired (bool): Si la sesion se detecto vencida.
+    """
+
+    def __init__(self, cookies_path=None, validation_ttl=300, reload_interval=1.0):
         self.path = (
             Path(cookies_path) if isinstance(cookies_path, str) else Path("cookies.txt")
         )
         self.headers = headers
         self._cached_cookies = None
+        self.validation_ttl = validation_ttl
+        self.reload_interval = reload_interval
+        self.expired = False
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._stat_checked_at = 0.0
+        self._validated_at = None
+        self._valid = None
 
     def _simple_cookies_file_finder(self):
         possible_names = [
@@ -51,8 +88,9 @@ class CookieManager:
         if self.path.exists():
             return self.path.read_text()
 
-        self.path = self._simple_cookies_file_finder()
-        if self.path:
+        found = self._simple_cookies_file_finder()
+        if found:
+            self.path = found
             return self.path.read_text()
 
         raise FileNotFoundError(f"Cookie file not found: {self.path}")
@@ -97,11 +135,41 @@ class CookieManager:
         except KeyError:
             return {}
 
+    def _file_mtime(self):
+        try:
+            return self.path.stat().st_mtime_ns
+        except (OSError, AttributeError):
+            return None
+
+    def _file_changed(self) -> bool:
+        """True si el archivo de cookies cambio desde la ultima lectura."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._stat_checked_at < self.reload_interval:
+                return False
+            self._stat_checked_at = now
+            mtime = self._file_mtime()
+            return mtime is not None and mtime != self._mtime
+
     def get_cookies(self):
-        if self._cached_cookies:
+        if self._cached_cookies and not self._file_changed():
             return self._cached_cookies
 
+        with self._lock:
+            if not self._cached_cookies:
+                return self._reload()
+            logger.info("El archivo de cookies cambio, recargando: %s", self.path)
+            try:
+                return self._reload()
+            except (OSError, ValueError, KeyError) as e:
+                # Puede estar a medio escribir: se sigue con las cookies anteriores.
+                logger.warning("No se pudo recargar el archivo de cookies: %s", e)
+                return self._cached_cookies
+
+    def _reload(self):
         content = self.load()
+        self._mtime = self._file_mtime()
+        self._stat_checked_at = time.monotonic()
         parsed_cookies = {}
 
         if content.startswith("{"):
@@ -112,6 +180,9 @@ class CookieManager:
             parsed_cookies = self.parse_cookies(content, format_type="netscape")
 
         self._cached_cookies = parsed_cookies
+        # Cookies nuevas: lo que se sabia de la sesion anterior ya no vale.
+        self.expired = False
+        self._validated_at = None
         return self._cached_cookies
 
     def is_dashboard_page(self, response):
@@ -119,18 +190,89 @@ class CookieManager:
         page_title = root.find(".//title").text.strip()
         return "Dashboard | Alura Latam - Cursos online de tecnologia" == page_title
 
-    def check_cookies(self):
+    @staticmethod
+    def is_login_redirect(response) -> bool:
+        """True si la respuesta (o una de sus redirecciones) lleva al login."""
+        targets = [response.url or ""]
+        for r in [*response.history, response]:
+            if 300 <= r.status_code < 400:
+                targets.append(r.headers.get("location", ""))
+        return any(
+            urlsplit(urljoin(HOST, target)).path.rstrip("/") in LOGIN_PATHS
+            for target in targets
+            if target
+        )
+
+    def mark_valid(self):
+        """Registra que la sesion funciona (p. ej. tras cargar una pagina logueada)."""
+        self.expired = False
+        self._valid = True
+        self._validated_at = time.monotonic()
+
+    def mark_expired(self):
+        """Registra que la sesion vencio; las peticiones siguientes fallan enseguida."""
+        if not self.expired:
+            logger.error(
+                "La sesion vencio; actualiza el archivo de cookies: %s", self.path
+            )
+        self.expired = True
+        self._valid = False
+        self._validated_at = time.monotonic()
+
+    def ensure_session(self):
+        """
+        Lanza SessionExpiredError si la sesion se detecto vencida y el archivo de
+        cookies no cambio desde entonces.
+        """
+        if self.expired:
+            self.get_cookies()  # Si el archivo cambio, recarga y limpia `expired`.
+            if self.expired:
+                raise SessionExpiredError(
+                    f"La sesion vencio; actualiza el archivo de cookies: {self.path}"
+                )
+
+    def check_cookies(self, force=False):
+        """
+        Comprueba si las cookies abren una sesion.
+
+        El resultado se guarda `validation_ttl` segundos. La comprobacion pide el
+        dashboard sin seguir redirecciones ni descargar la pagina: una respuesta
+        200 es una sesion valida y una redireccion al login, una vencida. Solo si
+        la respuesta es otra cosa se descarga y se revisa el dashboard completo.
+
+        Args:
+            force (bool): Si es True, ignora el resultado guardado.
+        """
         cookies = self.get_cookies()
+        if (
+            not force
+            and self._validated_at is not None
+            and time.monotonic() - self._validated_at < self.validation_ttl
+        ):
+            return self._valid
 
-        url = "https://app.aluracursos.com/dashboard"
-        response = requests.get(
-            url,
+        with requests.get(
+            DASHBOARD_URL,
             cookies=cookies,
             headers=self.headers,
-        )
-        if self.is_dashboard_page(response):
-            return True
-        return False
+            allow_redirects=False,
+            stream=True,
+        ) as response:
+            if response.status_code == 200:
+                valid = True
+            elif self.is_login_redirect(response):
+                valid = False
+            else:
+                dashboard = requests.get(
+                    DASHBOARD_URL, cookies=cookies, headers=self.headers
+                )
+                valid = self.is_dashboard_page(dashboard)
+
+        if valid:
+            self.mark_valid()
+        else:
+            self.mark_expired()
+        return valid
 
 
 if __name__ == "__main__":
@@ -1,18 +1,27 @@
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, Optional, Union
-from urllib.parse import urljoin
+from typing import Callable, Iterable, Iterator, Optional, Union
 
-import requests
-from lxml import html
-
-from pyalura import utils
+from pyalura import parsing, utils
+from pyalura.answer_store import AnswerStore
+from pyalura.bandwidth import BandwidthShaper
 from pyalura.base import Base
-from pyalura.cookie_manager import CookieManager
+from pyalura.clock import Clock
+from pyalura.cookie_manager import CookieManager, SessionExpiredError
+from pyalura.filters import ItemFilter
+from pyalura.hedging import HedgePolicy
 from pyalura.item import Item
+from pyalura.item_index import ItemIndex, task_id_from_url
+from pyalura.log import log_context
+from pyalura.pacing import PacingPolicy, PacingScheduler
+from pyalura.parsing import ParserPool
+from pyalura.rate_limit import RateLimiter
+from pyalura.retry import RetryPolicy
 from pyalura.section import Section
-from pyalura.utils import HOST, string_to_slug
+from pyalura.transport import Transport
+from pyalura.utils import string_to_slug
 
 # Configuración del logger para este módulo
 logger = logging.getLogger(__name__)
@@ -25,68 +34,104 @@ class Course(Base):
     Esta clase se encarga de gestionar la información principal del curso,
     como su URL, secciones, y el acceso a los items del mismo.
 
+    Un mismo Course se puede compartir entre hilos: la pagina del curso, la
+    subcategoria y las secciones se cargan una sola vez, y quien las pide mientras
+    otro hilo las esta cargando espera a esa carga en lugar de repetirla.
+
     Atributos:
         url (str): La URL original del curso.
         url_base (str): La URL base del curso.
         title (str): El título del curso extraído de la URL.
     """
 
-    def __init__(self, url: str, cookies_path: Optional[Union[str, Path]] = None):
+    def __init__(
+        self,
+        url: str,
+        cookies_path: Optional[Union[str, Path]] = None,
+        cookie_manager: Optional[CookieManager] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        parser_pool: Optional[ParserPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        bandwidth_shaper: Optional[BandwidthShaper] = None,
+        item_index: Optional[ItemIndex] = None,
+        answer_store: Optional[AnswerStore] = None,
+        bounded_memory: bool = False,
+        transport: Optional[Transport] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        clock: Optional[Clock] = None,
+    ):
         self.url = url
         self.url_base = utils.extract_base_url(self.url)
         self.title = utils.extract_name_url(self.url)
-
-        logger.info(f"Course instanciado con URL: {self.url}")
-        super().__init__(cookies_path=cookies_path)
+        self.item_index = item_index
+        self.answer_store = answer_store
+        # Si es True se liberan paginas y secciones en cuanto se consumen.
+        self.bounded_memory = bounded_memory
+        # Protege las cargas perezosas; es reentrante porque `sections` usa la
+        # pagina del curso y la subcategoria.
+        self._load_lock = threading.RLock()
+        # Las esperas entre paginas de items se reparten entre todos los hilos.
+        self.content_request_lock = threading.Lock()
+
+        logger.info("Course instanciado con URL: %s", self.url)
+        super().__init__(
+            cookies_path=cookies_path,
+            cookie_manager=cookie_manager,
+            rate_limiter=rate_limiter,
+            parser_pool=parser_pool,
+            retry_policy=retry_policy,
+            bandwidth_shaper=bandwidth_shaper,
+            transport=transport,
+            hedge_policy=hedge_policy,
+            clock=clock,
+        )
 
     def __get_course_url_button_access(self) -> bool:
         logger.debug("Obteniendo la URL del boton principal para ver el curso")
-        root_base = self._get_course_page(self.url)["root"]
+        page = self._get_course_page(self.url)
 
-        has_try_to_enroll = root_base.find(".//a[@id='tryToEnroll']")
-        has_data_workload = bool(
-            root_base.xpath(".//a[@id='tryToEnroll' and @data-workload]")
-        )
-        evaluationForm = root_base.find(".//form[@id='evaluationForm']")
-        if evaluationForm is not None:
-            logger.info(f"El curso '{self.title}' necesita una evaluacion manual.")
+        if page["needs_evaluation"]:
+            logger.info("El curso '%s' necesita una evaluacion manual.", self.title)
             raise Exception(f"El curso '{self.title}' necesita una evaluacion manual.")
 
-        if has_try_to_enroll and not has_data_workload:
+        if not page["visible"]:
             logger.info("El curso no es visible para el usuario.")
             raise Exception("El curso no es visible para el usuario.")
 
-        url_relative = root_base.find(
-            ".//section[@class='course']//div[@class='container']/a"
-        ).get("href")
-        url_botton_access = urljoin(HOST, url_relative)
+        url_botton_access = page["access_url"]
         setattr(self, "_course_url_button_access", url_botton_access)
-        logger.debug(f"URL obtenida: {url_botton_access}")
+        logger.debug("URL obtenida: %s", url_botton_access)
         return url_botton_access
 
     def _get_course_page(self, url: str) -> dict:
-        if not hasattr(self, "__course_page"):
+        page = getattr(self, "__course_page", None)
+        if page is not None:
+            return page
+        with self._load_lock:
+            if hasattr(self, "__course_page"):
+                return getattr(self, "__course_page")
             logger.debug("Obteniendo la página del curso")
             response = self._make_request(url)
-            root = html.fromstring(response.text)
-            # la presencia de este elemento indica que el usuario esta logueado
-            element_profile = root.find(".//nav[@id='profileList']")
-            if element_profile is None:
+            page = self._run_parser(parsing.parse_landing_page, response.content)
+            if not page["logged_in"]:
                 msg_error = (
                     "No se esta logueado, confirma que las cookies sean correctas"
                 )
                 logger.error(msg_error)
-                raise Exception(msg_error)
-            setattr(self, "__course_page", {"root": root, "response": response})
-        return getattr(self, "__course_page")
+                self.cookie_manager.mark_expired()
+                raise SessionExpiredError(msg_error)
+            self.cookie_manager.mark_valid()
+            setattr(self, "__course_page", page)
+            return page
 
     @property
     def subcategory(self) -> str:
-        root = self._get_course_page(self.url)["root"]
-        subcategory = root.find(
-            ".//a[@class='course-header-banner-breadcrumb__category-link']"
-        ).text.strip()
-        return string_to_slug(subcategory)
+        if not hasattr(self, "_subcategory"):
+            with self._load_lock:
+                if not hasattr(self, "_subcategory"):
+                    subcategory = self._get_course_page(self.url)["subcategory"]
+                    setattr(self, "_subcategory", string_to_slug(subcategory))
+        return getattr(self, "_subcategory")
 
     @property
     def sections(self) -> list["Section"]:
@@ -98,17 +143,22 @@ class Course(Base):
         Returns:
             list[Section]: Lista de objetos Section que componen el curso.
         """
-        if not hasattr(self, "_course_sections"):
+        sections = getattr(self, "_course_sections", None)
+        if sections is not None:
+            return sections
+        with self._load_lock:
+            if hasattr(self, "_course_sections"):
+                return getattr(self, "_course_sections")
             url_botton_access = self.__get_course_url_button_access()
 
             if url_botton_access.endswith("access"):
-                logger.info(f"El curso '{self.title}' aparece como completado.")
+                logger.info("El curso '%s' aparece como completado.", self.title)
                 r_temp = self._make_request(url_botton_access, method="HEAD")
                 url_botton_access = r_temp.headers["location"]
             elif url_botton_access.endswith("continue"):
-                logger.info(f"El curso '{self.title}' aparece como NO completado.")
+                logger.info("El curso '%s' aparece como NO completado.", self.title)
             elif url_botton_access.endswith("tryToEnroll"):
-                logger.info(f"El curso '{self.title}' aparece NO iniciado.")
+                logger.info("El curso '%s' aparece NO iniciado.", self.title)
                 r_temp = self._make_request(url_botton_access, method="HEAD")
                 url_botton_access = r_temp.headers["location"]
             else:
@@ -117,23 +167,50 @@ class Course(Base):
             r = self._make_request(url_botton_access, method="HEAD")
             url_course = r.headers["location"]
             try:
-                root = self._fetch_root(url_course)
+                response = self._make_request(url_course)
             except Exception as e:
-                logger.error(f"No se pudo obtener el contenido del curso: {e}")
+                logger.error("No se pudo obtener el contenido del curso: %s", e)
                 raise e
 
-            page_title = root.find(".//title").text.strip()
-            logger.info(f"Título de la página: {page_title}")
+            course_page = self._run_parser(parsing.parse_course_page, response.content)
+            logger.info("Título de la página: %s", course_page["page_title"])
 
             course_sections = [
-                Section(**i, course=self)
-                for i in Section.parse_sections_from_html(root)
+                Section(**i, course=self) for i in course_page["sections"]
             ]
-            logger.debug(
-                f"Secciones del curso: {len(course_sections)}, primer elemento: {course_sections[0].__dict__}"
-            )
+            if logger.isEnabledFor(logging.DEBUG) and course_sections:
+                logger.debug(
+                    "Secciones del curso: %d, primer elemento: %s",
+                    len(course_sections),
+                    course_sections[0].__dict__,
+                )
+            if self.bounded_memory:
+                # Lo unico que falta de la pagina del curso es la subcategoria.
+                self.subcategory
+                self._release_course_page()
             setattr(self, "_course_sections", course_sections)
-        return getattr(self, "_course_sections")
+            return course_sections
+
+    def _release_course_page(self):
+        with self._load_lock:
+            if hasattr(self, "__course_page"):
+                delattr(self, "__course_page")
+
+    def release(self):
+        """
+        Libera la pagina del curso y el arbol de secciones e items.
+
+        Rompe las referencias circulares (Course -> Section -> Item) para que la
+        memoria se libere sin esperar al recolector de basura. Si se vuelve a
+        acceder a `sections`, se piden de nuevo.
+        """
+        with self._load_lock:
+            self._release_course_page()
+            sections = getattr(self, "_course_sections", None)
+            if sections is not None:
+                delattr(self, "_course_sections")
+        for section in sections or []:
+            section.release()
 
     @property
     def last_item_get_content_time(self) -> Union[datetime, None]:
@@ -161,31 +238,61 @@ class Course(Base):
             raise TypeError("El valor debe ser un objeto datetime o None")
 
         setattr(self, "_last_item_get_content_time", value)
-        logger.debug(f"Estableciendo last_item_get_content_time a: {value}")
+        logger.debug("Estableciendo last_item_get_content_time a: %s", value)
         return getattr(self, "_last_item_get_content_time")
 
-    def iter_items(self) -> Iterator["Item"]:
+    def iter_items(self, item_filter: Optional[ItemFilter] = None) -> Iterator["Item"]:
         """
         Itera sobre todos los items (episodios/tareas) del curso.
 
+        Args:
+            item_filter (ItemFilter, opcional): Solo se recorren las secciones e
+                items que acepta. Las secciones descartadas no se piden.
+
         Yields:
             Item: Cada uno de los items del curso.
         """
-        logger.info(f"Iterando sobre los items del curso")
+        logger.info("Iterando sobre los items del curso")
         for section in self.sections:
+            if item_filter is not None and not item_filter.accepts_section(section):
+                logger.debug("Seccion omitida por el filtro: %s", section.index)
+                continue
             for item in section.items:
-                logger.info(
-                    f"Yielding item: {item.taks_id} de la sección: {section.index} del curso: {self.title}"
+                if item_filter is not None and not item_filter.accepts_item(item):
+                    continue
+                logger.debug(
+                    "Yielding item: %s de la sección: %s del curso: %s",
+                    item.taks_id,
+                    section.index,
+                    self.title,
                 )
                 yield item
+            if self.bounded_memory:
+                section.release()
 
     @classmethod
-    def get_item(cls, item_url: str) -> "Item":
+    def get_item(
+        cls,
+        item_url: str,
+        cookies_path: Optional[Union[str, Path]] = None,
+        item_index: Optional[ItemIndex] = None,
+        answer_store: Optional[AnswerStore] = None,
+        **course_options,
+    ) -> "Item":
         """
         Instancia un objeto Item a partir de una URL.
 
+        Si se pasa un `ItemIndex` y el item ya esta indexado, se instancia sin hacer
+        ninguna peticion. Si no, se pide la pagina del item (y se indexa su seccion).
+
         Args:
             item_url (str): La URL del item que se desea instanciar.
+            cookies_path (str, opcional): Ruta del archivo de cookies.
+            item_index (ItemIndex, opcional): Indice donde buscar el item.
+            answer_store (AnswerStore, opcional): Respuestas guardadas, para
+                resolver la pregunta sin pedir su pagina.
+            **course_options: Otros argumentos del `Course` del item
+                (`cookie_manager`, `rate_limiter`, `transport`, ...).
 
         Returns:
             Item: Una instancia del objeto Item correspondiente a la URL.
@@ -193,32 +300,121 @@ class Course(Base):
         Raises:
             ValueError: Si la URL no es válida o no se puede instanciar el item.
         """
-        logger.info(f"Intentando instanciar un Item desde la URL: {item_url}")
+        logger.info("Intentando instanciar un Item desde la URL: %s", item_url)
+
+        if item_index is not None:
+            entry = item_index.get(item_url)
+            if entry is not None:
+                logger.debug("Item encontrado en el indice: %s", item_url)
+                course = cls(
+                    entry["course_url"],
+                    cookies_path=cookies_path,
+                    item_index=item_index,
+                    answer_store=answer_store,
+                    **course_options,
+                )
+                return course._item_from_index(entry)
 
         try:
-            # Realizar una solicitud a la URL del item
-            icookies = CookieManager()
-            cookies = icookies.get_cookies()
-            response = requests.get(item_url, cookies=cookies, headers=icookies.headers)
-            root = html.fromstring(response.text)
-
-            if response.status_code != 200:
-                logger.warning("La solicitud no fue exitosa")
-            select_selected = root.find(
-                ".//select[@class='task-menu-sections-select']//option[@selected]"
-            ).text
-            curse = Course(item_url)
-            section = Section(select_selected, item_url, curse)
-            item_data = [i for i in utils.get_items(root) if i["url"] == item_url][0]
-            item = Item(**item_data, section=section)
-            return item
+            course = cls(
+                utils.extract_base_url(item_url),
+                cookies_path=cookies_path,
+                item_index=item_index,
+                answer_store=answer_store,
+                **course_options,
+            )
+            return course._item_from_page(item_url)
 
         except Exception as e:
-            logger.error(f"Error al instanciar el Item desde la URL: {e}")
+            logger.error("Error al instanciar el Item desde la URL: %s", e)
             raise ValueError(
                 f"No se pudo instanciar el item desde la URL proporcionada: {e}"
             )
 
+    @classmethod
+    def get_items(
+        cls,
+        item_urls: Iterable[str],
+        cookies_path: Optional[Union[str, Path]] = None,
+        item_index: Optional[ItemIndex] = None,
+        answer_store: Optional[AnswerStore] = None,
+    ) -> list["Item"]:
+        """
+        Instancia varios Items a la vez, resolviendolos desde el indice cuando es posible.
+
+        Los items de un mismo curso y seccion comparten los objetos `Course` y
+        `Section`, y todos comparten el mismo `CookieManager`.
+
+        Returns:
+            list[Item]: Los items, en el mismo orden que `item_urls`.
+        """
+        item_urls = list(item_urls)
+        entries = item_index.get_many(item_urls) if item_index is not None else {}
+        cookie_manager = CookieManager(cookies_path=cookies_path)
+        courses: dict[str, "Course"] = {}
+        sections: dict[str, Section] = {}
+
+        items = []
+        for item_url in item_urls:
+            entry = entries.get(task_id_from_url(item_url))
+            course_url = (
+                entry["course_url"] if entry else utils.extract_base_url(item_url)
+            )
+            course = courses.get(course_url)
+            if course is None:
+                course = cls(
+                    course_url,
+                    cookie_manager=cookie_manager,
+                    item_index=item_index,
+                    answer_store=answer_store,
+                )
+                courses[course_url] = course
+
+            if entry is None:
+                items.append(course._item_from_page(item_url))
+            else:
+                items.append(course._item_from_index(entry, sections))
+        return items
+
+    def _item_from_index(
+        self, entry: dict, sections: Optional[dict[str, Section]] = None
+    ) -> "Item":
+        sections = {} if sections is None else sections
+        section = sections.get(entry["section_url"])
+        if section is None:
+            section = Section(entry["section_name"], entry["section_url"], self)
+            sections[entry["section_url"]] = section
+
+        data = {
+            "url": entry["url"],
+            "title": entry["title"],
+            "index": entry["index"],
+            "type": entry["type"],
+            # Solo se confia en "visto": el progreso tambien avanza desde el
+            # navegador. Si no, queda desconocido y se consulta al usarlo.
+            "is_marked_as_seen": True if entry["seen"] else None,
+        }
+        return Item.create(data, section)
+
+    def _item_from_page(self, item_url: str) -> "Item":
+        response = self._make_request(item_url)
+        page = self._run_parser(parsing.parse_item_page, response.content)
+
+        sections_urls = {i["name"]: i["url"] for i in page["sections"]}
+        section_name = page["section_name"]
+        section = Section(section_name, sections_urls[section_name], self)
+
+        items = [Item.create(i, section) for i in page["items"]]
+        setattr(section, "_items", items)
+        if self.item_index is not None:
+            self.item_index.add_section(section, items)
+
+        task_id = task_id_from_url(item_url)
+        for item in items:
+            if item.taks_id == task_id:
+                return item
+        raise ValueError(f"El item no aparece en su seccion: {item_url}")
+
     @property
     def index_last_section(self) -> int:
         if hasattr(self, "_is_last_section") is False:
@@ -226,20 +422,48 @@ class Course(Base):
             setattr(self, "_is_last_section", index_last_section)
         return getattr(self, "_is_last_section")
 
-    def complete_all_activities(self):
-        """Recorre y completa todas las actividades pendientes."""
-        logger.info(f"Completando actividades para: {self.title}")
+    def complete_all_activities(
+        self,
+        pacing: Optional[PacingPolicy] = None,
+        item_filter: Optional[ItemFilter] = None,
+        progress: Optional[Callable[["Item", Optional[int]], None]] = None,
+    ):
+        """
+        Recorre y completa todas las actividades pendientes.
 
-        for item in self.iter_items():
-            if item.is_marked_as_seen:
+        Args:
+            pacing (PacingPolicy, opcional): Cuanto esperar tras cada actividad. Por
+                defecto, tras un video se espera su duracion real.
+            item_filter (ItemFilter, opcional): Solo se completan los items que acepta.
+            progress (Callable, opcional): Se llama con `(item, 0)` tras cada item,
+                incluidos los que ya estaban vistos (ver `jobs.JobProgress`).
+        """
+        logger.info("Completando actividades para: %s", self.title)
+        pacing = pacing or PacingPolicy()
+        scheduler = PacingScheduler(self.clock)
+
+        for item in self.iter_items(item_filter):
+            if item.is_seen():
+                if progress is not None:
+                    progress(item, 0)
                 continue
 
-            logger.info(f"Procesando: {item.title}")
-
-            if item.is_question:
-                item.resolve_question()
-                utils.sleep_progress(60)
-            else:
-                item.mark_as_watched()
-                wait_time = 300 if item.is_video else 60
-                utils.sleep_progress(wait_time)
+            with log_context(
+                course=self.title_slug, section=item.section.index, item=item.taks_id
+            ):
+                # La duracion se consulta antes de esperar: ese tiempo cuenta como espera.
+                duration = item.get_duration() if item.is_video else None
+                scheduler.wait()
+                logger.info("Procesando: %s", item.title)
+
+                if item.is_question:
+                    item.resolve_question()
+                else:
+                    item.mark_as_watched()
+                scheduler.defer(pacing.wait_for(item, duration))
+            if progress is not None:
+                progress(item, 0)
+
+        # La espera de la ultima actividad tambien se cumple antes de terminar: si
+        # no, la primera del siguiente curso se haria enseguida.
+        scheduler.wait()
@@ -0,0 +1,371 @@
+"""
+Modo demonio: un proceso que queda corriendo con la sesion, las cookies y las
+conexiones ya preparadas, y recibe trabajos por una carpeta de entrada o por un
+socket local.
+
+Uso:
+    python -m pyalura.daemon serve CARPETA --inbox entrada/ --socket /tmp/pyalura.sock
+    python -m pyalura.daemon send /tmp/pyalura.sock '{"action": "download", "url": "..."}'
+    python -m pyalura.daemon send /tmp/pyalura.sock '{"action": "status"}'
+
+Un trabajo es un objeto JSON con `action` (ver `jobs.ACTIONS`), `url` y,
+opcionalmente, `filter` (ver `ItemFilter.from_dict`). En la carpeta de entrada
+cada archivo `.json` puede tener un trabajo o una lista de trabajos; conviene
+escribirlo con otro nombre y renombrarlo al final para que no se lea a medias.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from pyalura.cookie_manager import CookieManager
+from pyalura.downloader import Downloader
+from pyalura.instrumentation import Metrics
+from pyalura.jobs import JobProgress, job_filter, run_job, validate_job
+from pyalura.log import log_context
+from pyalura.transport import SessionTransport
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Daemon:
+    """
+    Proceso de larga duracion que mantiene caliente todo lo que cada ejecucion
+    suelta tenia que preparar: las cookies se leen una vez, las conexiones HTTP
+    se reutilizan (`SessionTransport`) y los `Downloader` (historial,
+    almacenamiento, manifiesto, indices) se crean una sola vez por trabajador.
+
+    Atributos:
+        base_folder (Path): Carpeta de descargas.
+        inbox (Path, opcional): Carpeta vigilada de la que se leen trabajos.
+        socket_path (Path, opcional): Socket Unix por el que se reciben comandos.
+        workers (int): Trabajos que se procesan a la vez.
+        poll_interval (float): Cada cuantos segundos se revisa la carpeta de entrada.
+        metrics (Metrics): Contadores compartidos por todos los trabajadores.
+    """
+
+    def __init__(
+        self,
+        base_folder: Union[str, Path],
+        inbox: Optional[Union[str, Path]] = None,
+        socket_path: Optional[Union[str, Path]] = None,
+        workers: int = 1,
+        poll_interval: float = 2.0,
+        cookies_path: Optional[Union[str, Path]] = None,
+        check_cookies: bool = True,
+        **downloader_options,
+    ):
+        self.base_folder = Path(base_folder)
+        self.inbox = Path(inbox) if inbox else None
+        self.socket_path = Path(socket_path) if socket_path else None
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.check_cookies = check_cookies
+
+        self.cookie_manager = downloader_options.pop(
+            "cookie_manager", None
+        ) or CookieManager(cookies_path=str(cookies_path) if cookies_path else None)
+        self.transport = downloader_options.pop("transport", None) or SessionTransport()
+        self.metrics = Metrics()
+        self._downloader_options = downloader_options
+
+        self._jobs: dict[int, dict] = {}
+        self._ids = itertools.count(1)
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._server: Optional[socket.socket] = None
+        self.started_at = time.time()
+
+    def _new_downloader(self) -> Downloader:
+        downloader = Downloader(
+            self.base_folder,
+            transport=self.transport,
+            cookie_manager=self.cookie_manager,
+            **self._downloader_options,
+        )
+        downloader.metrics = self.metrics
+        return downloader
+
+    def warm_up(self):
+        """Lee las cookies y, si se pidio, comprueba que la sesion sea valida."""
+        self.cookie_manager.get_cookies()
+        if self.check_cookies and not self.cookie_manager.check_cookies():
+            logger.warning("Las cookies no abren una sesion valida.")
+
+    # -- trabajos -----------------------------------------------------------
+
+    def submit(self, job: dict) -> dict:
+        """
+        Encola un trabajo.
+
+        Returns:
+            dict: El estado del trabajo, con su `id`.
+        """
+        validate_job(job)
+        action, url = job["action"], job["url"].strip()
+        with self._lock:
+            job_id = next(self._ids)
+            record = {
+                "id": job_id,
+                "action": action,
+                "url": url,
+                "filter": job.get("filter"),
+                "status": QUEUED,
+                "submitted_at": time.time(),
+            }
+            self._jobs[job_id] = dict(record)
+        self._queue.put(job_id)
+        logger.info("Trabajo %s encolado: %s %s", job_id, action, url)
+        self._write_status()
+        return record
+
+    def _update(self, job_id: int, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+        self._write_status()
+
+    def _worker(self):
+        downloader = self._new_downloader()
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            with self._lock:
+                job = dict(self._jobs[job_id])
+            self._update(job_id, status=RUNNING, started_at=time.time())
+            progress = JobProgress(
+                lambda snapshot: self._update(job_id, progress=snapshot),
+                job_filter(job),
+            )
+            try:
+                with log_context(job=job_id):
+                    run_job(downloader, job, progress)
+            except Exception as e:
+                logger.error("Trabajo %s fallido: %s", job_id, e)
+                self.metrics.incr("jobs_failed")
+                self._update(
+                    job_id,
+                    status=FAILED,
+                    error=str(e),
+                    finished_at=time.time(),
+                    progress=progress.snapshot(),
+                )
+            else:
+                self.metrics.incr("jobs_done")
+                self._update(
+                    job_id,
+                    status=DONE,
+                    finished_at=time.time(),
+                    progress=progress.snapshot(),
+                )
+
+    # -- progreso -----------------------------------------------------------
+
+    def status(self) -> dict:
+        """Estado de los trabajos y metricas del proceso."""
+        with self._lock:
+            jobs = [dict(job) for job in self._jobs.values()]
+        counts = {state: 0 for state in (QUEUED, RUNNING, DONE, FAILED)}
+        for job in jobs:
+            counts[job["status"]] += 1
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "jobs": counts,
+            "running": [job for job in jobs if job["status"] == RUNNING],
+            "recent": jobs[-20:],
+            "metrics": self.metrics.snapshot(),
+        }
+
+    def _write_status(self):
+        if self.inbox is None:
+            return
+        status_file = self.inbox / "status.json"
+        temp_file = status_file.with_name(f"status.{threading.get_ident()}.tmp")
+        temp_file.write_text(json.dumps(self.status(), indent=2, default=str))
+        os.replace(temp_file, status_file)
+
+    # -- entradas -----------------------------------------------------------
+
+    def _move(self, path: Path, folder: str):
+        target = self.inbox / folder
+        target.mkdir(exist_ok=True)
+        os.replace(path, target / path.name)
+
+    def scan_inbox(self) -> int:
+        """Encola los trabajos de los `.json` de la carpeta de entrada."""
+        submitted = 0
+        for path in sorted(self.inbox.glob("*.json")):
+            if path.name == "status.json":
+                continue
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                jobs = data if isinstance(data, list) else [data]
+                # Se valida todo el archivo antes de encolar: o entra entero o nada.
+                for job in jobs:
+                    validate_job(job)
+            except ValueError as e:
+                logger.error("Archivo de trabajos invalido %s: %s", path.name, e)
+                self._move(path, "rejected")
+            else:
+                for job in jobs:
+                    self.submit(job)
+                submitted += len(jobs)
+                self._move(path, "accepted")
+        return submitted
+
+    def _watch_inbox(self):
+        while not self._stop.is_set():
+            self.scan_inbox()
+            self._stop.wait(self.poll_interval)
+
+    def handle_command(self, command: dict) -> dict:
+        """Atiende un comando del socket: un trabajo, "status" o "stop"."""
+        if not isinstance(command, dict):
+            return {"ok": False, "error": f"Se esperaba un objeto JSON: {command!r}"}
+        action = command.get("action")
+        try:
+            if action == "status":
+                return {"ok": True, "status": self.status()}
+            if action == "stop":
+                self.stop()
+                return {"ok": True}
+            return {"ok": True, "job": self.submit(command)}
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+
+    def _serve_connection(self, conn: socket.socket):
+        with conn, conn.makefile("rwb") as stream:
+            for line in stream:
+                try:
+                    reply = self.handle_command(json.loads(line))
+                except ValueError as e:
+                    reply = {"ok": False, "error": f"JSON invalido: {e}"}
+                stream.write(json.dumps(reply, default=str).encode("utf-8") + b"\n")
+                stream.flush()
+
+    def _serve_socket(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(
+                target=self._serve_connection, args=(conn,), daemon=True
+            ).start()
+
+    def _open_socket(self):
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)  # Solo el usuario que lo lanzo.
+        self._server.listen()
+        self._server.settimeout(1.0)
+
+    # -- ciclo de vida ------------------------------------------------------
+
+    def _start_thread(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def start(self):
+        """Prepara la sesion y arranca los trabajadores y las entradas."""
+        self.warm_up()
+        for _ in range(self.workers):
+            self._start_thread(self._worker)
+        if self.inbox is not None:
+            self.inbox.mkdir(parents=True, exist_ok=True)
+            self._start_thread(self._watch_inbox)
+        if self.socket_path is not None:
+            self._open_socket()
+            self._start_thread(self._serve_socket)
+        logger.info("Demonio iniciado (pid %d).", os.getpid())
+
+    def stop(self):
+        """Deja de aceptar trabajos; los que estan en curso terminan."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        for _ in range(self.workers):
+            self._queue.put(None)
+        if self._server is not None:
+            self._server.close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def run(self):
+        """Arranca y atiende trabajos hasta `stop` o Ctrl+C."""
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            self.stop()
+        for thread in self._threads:
+            thread.join()
+        self.transport.close()
+        logger.info("Demonio detenido.")
+
+
+def send_command(
+    socket_path: Union[str, Path], command: dict, timeout: Optional[float] = 30
+) -> dict:
+    """Envia un comando a un demonio en marcha y devuelve su respuesta."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(command).encode("utf-8") + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m pyalura.daemon")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Inicia el demonio")
+    serve.add_argument("base_folder")
+    serve.add_argument("--inbox")
+    serve.add_argument("--socket")
+    serve.add_argument("--workers", type=int, default=1)
+    serve.add_argument("--cookies")
+    serve.add_argument("--no-check-cookies", action="store_true")
+
+    send = subparsers.add_parser("send", help="Envia un comando a un demonio")
+    send.add_argument("socket")
+    send.add_argument("json")
+
+    args = parser.parse_args(argv)
+    if args.command == "send":
+        print(json.dumps(send_command(args.socket, json.loads(args.json)), indent=2))
+        return
+    if not args.inbox and not args.socket:
+        parser.error("Se necesita --inbox o --socket para recibir trabajos")
+    Daemon(
+        args.base_folder,
+        inbox=args.inbox,
+        socket_path=args.socket,
+        workers=args.workers,
+        cookies_path=args.cookies,
+        check_cookies=not args.no_check_cookies,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
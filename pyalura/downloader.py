@@ -1,32 +1,183 @@
+import hashlib
 import json
 import logging
+import os
+import posixpath
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Union
+from typing import Callable, List, Optional, Union
 
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from pyalura.answer_store import AnswerStore
+from pyalura.assets import AssetFetcher, rewrite_markdown
+from pyalura.bandwidth import BandwidthShaper, Priority
+from pyalura.clock import SYSTEM_CLOCK, Clock
+from pyalura.cookie_manager import CookieManager, SessionExpiredError
 from pyalura.course import Course
+from pyalura.filters import ItemFilter
+from pyalura.hedging import HedgePolicy
+from pyalura.instrumentation import Metrics
 from pyalura.item import Item
+from pyalura.item_index import ItemIndex
+from pyalura.log import log_context
+from pyalura.manifest import Manifest
+from pyalura.page_store import PageStore
+from pyalura.parsing import ParserPool
+from pyalura.quality import QualityPolicy
+from pyalura.rate_limit import RateLimiter
+from pyalura.retry import NO_RETRY, IncompleteDownloadError, RetryPolicy
+from pyalura.search_index import SearchIndex
+from pyalura.storage import FolderStorage, Storage
+from pyalura.transport import Transport
 from pyalura.utils import sleep_progress
 
 logger = logging.getLogger(__name__)
 
+# El historial es un solo archivo que pueden compartir varios Downloader.
+_history_lock = threading.Lock()
+
+
+@contextmanager
+def _locked_history(history_file: Path):
+    """
+    Bloquea el historial entre hilos y entre procesos mientras se actualiza.
+
+    El bloqueo se toma sobre un archivo aparte (`<historial>.lock`), porque el
+    historial se reemplaza entero en cada escritura.
+    """
+    lock_path = history_file.with_name(f"{history_file.name}.lock")
+    with _history_lock, open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
 
 class Downloader:
-    def __init__(self, base_folder: Union[str, Path]):
+    def __init__(
+        self,
+        base_folder: Union[str, Path],
+        rate_limiter: Optional[RateLimiter] = None,
+        parser_pool: Optional[ParserPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        bandwidth_shaper: Optional[BandwidthShaper] = None,
+        worker_bytes_per_second: Optional[float] = None,
+        search_index: Optional[SearchIndex] = None,
+        answer_store: Optional[AnswerStore] = None,
+        bounded_memory: bool = False,
+        storage: Optional[Storage] = None,
+        manifest: Optional[Manifest] = None,
+        transport: Optional[Transport] = None,
+        item_filter: Optional[ItemFilter] = None,
+        cookie_manager: Optional[CookieManager] = None,
+        asset_fetcher: Optional[AssetFetcher] = None,
+        quality_policy: Optional[QualityPolicy] = None,
+        history_file: Optional[Union[str, Path]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        page_store: Optional[PageStore] = None,
+        item_index: Optional[ItemIndex] = None,
+        clock: Optional[Clock] = None,
+    ):
         self.base_folder = (
             Path(base_folder) if isinstance(base_folder, str) else base_folder
         )
+        self.rate_limiter = rate_limiter
+        self.parser_pool = parser_pool
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.bandwidth_shaper = bandwidth_shaper
+        # Limite propio de este Downloader dentro del limite global del shaper.
+        self.worker_limit = (
+            bandwidth_shaper.worker(worker_bytes_per_second)
+            if bandwidth_shaper is not None
+            else None
+        )
+        self.search_index = search_index
+        self.answer_store = answer_store
+        self.bounded_memory = bounded_memory
+        self.metrics = Metrics()
+        # Donde se guardan los items; por defecto, un archivo por item.
+        self.storage = storage or FolderStorage(self.base_folder)
+        # Tamaño y hash de cada archivo escrito, para `pyalura.audit`.
+        self.manifest = manifest
+        self.transport = transport
+        # Si se comparte, las cookies se leen una sola vez para todos los cursos.
+        self.cookie_manager = cookie_manager
+        # Que items descargar y en que calidad; por defecto, todos.
+        self.item_filter = item_filter or ItemFilter()
+        # Si se indica, las imagenes y adjuntos se descargan y el Markdown se
+        # reescribe para apuntar a las copias locales.
+        self.asset_fetcher = asset_fetcher
+        # Si se indica, elige la calidad de cada video por presupuesto o
+        # rendimiento, dentro de la calidad maxima del filtro.
+        self.quality_policy = quality_policy
+        # Si se indica, las paginas que tardan mas de lo habitual se piden dos veces.
+        self.hedge_policy = hedge_policy
+        # Si se indica, guarda el HTML de cada leccion para `pyalura.rerender`.
+        self.page_store = page_store
+        # Si se indica, los items de cada seccion listada se guardan en el indice.
+        self.item_index = item_index
+        # Reloj de las esperas; un `SimulatedClock` permite medirlas sin esperar.
+        self.clock = clock or SYSTEM_CLOCK
+        if page_store is not None and bounded_memory:
+            logger.warning("Con bounded_memory no se guardan las paginas originales")
         self.base_folder.mkdir(parents=True, exist_ok=True)
-        self.history_file = self.base_folder / "cursos_descargados.json"
+        self.history_file = (
+            Path(history_file)
+            if history_file
+            else self.base_folder / "cursos_descargados.json"
+        )
 
-    def _get_output_path(self, item: Item) -> Path:
-        """Calcula la ruta de guardado."""
+    def _get_output_key(self, item: Item) -> str:
+        """Calcula la clave de guardado: `subcategoria/curso/seccion/item.ext`."""
         course = item.section.course
         section = item.section
-        course_path = self.base_folder / course.subcategory / course.title_slug
-        section_path = course_path / f"{section.index}-{section.title_slug}"
-        item_path = section_path / f"{item.index}-{item.title_slug}"
-        item_path.parent.mkdir(parents=True, exist_ok=True)
-        return item_path
+        suffix = ".mp4" if item.is_video else ".md"
+        return "/".join(
+            [
+                course.subcategory,
+                course.title_slug,
+                f"{section.index}-{section.title_slug}",
+                f"{item.index}-{item.title_slug}{suffix}",
+            ]
+        )
+
+    def course_key(self, item: Item) -> str:
+        """Clave del curso del item (`subcategoria/curso`)."""
+        return posixpath.dirname(posixpath.dirname(self._get_output_key(item)))
+
+    def course_options(self) -> dict:
+        """Opciones compartidas con las que se crea el `Course` de cada descarga."""
+        return {
+            "rate_limiter": self.rate_limiter,
+            "parser_pool": self.parser_pool,
+            "retry_policy": self.retry_policy,
+            "bandwidth_shaper": self.bandwidth_shaper,
+            "transport": self.transport,
+            "cookie_manager": self.cookie_manager,
+            "answer_store": self.answer_store,
+            "bounded_memory": self.bounded_memory,
+            "hedge_policy": self.hedge_policy,
+            "item_index": self.item_index,
+            "clock": self.clock,
+        }
 
     def _load_history(self) -> List[str]:
         if self.history_file.exists():
@@ -34,60 +185,280 @@ class Downloader:
         return []
 
     def _save_history(self, url: str):
-        history = self._load_history()
-        if url not in history:
-            history.append(url)
-            self.history_file.write_text(json.dumps(history, indent=2))
+        with _locked_history(self.history_file):
+            history = self._load_history()
+            if url not in history:
+                history.append(url)
+                # Escritura atomica: quien lo lee sin bloquear nunca ve un archivo
+                # a medias.
+                temp_file = self.history_file.with_name(
+                    f"{self.history_file.name}.{os.getpid()}.tmp"
+                )
+                temp_file.write_text(json.dumps(history, indent=2))
+                os.replace(temp_file, self.history_file)
+
+    def download_item(
+        self, item: Item, item_filter: Optional[ItemFilter] = None
+    ) -> Optional[int]:
+        """
+        Descarga un item individual.
+
+        Returns:
+            int: Bytes escritos (0 si ya existia), o None si fallo.
+        """
+        with log_context(
+            course=item.section.course.title_slug,
+            section=item.section.index,
+            item=item.taks_id,
+        ):
+            return self._download_item(item, item_filter or self.item_filter)
 
-    def download_item(self, item: Item):
-        """Descarga un item individual."""
-        output_path = self._get_output_path(item)
-        final_path = output_path.with_suffix(".mp4" if item.is_video else ".md")
+    def _download_item(self, item: Item, item_filter: ItemFilter) -> Optional[int]:
+        key = self._get_output_key(item)
 
-        if final_path.exists():
-            logger.info(f"Omitiendo {item.title}, ya existe.")
-            return
+        if self.storage.exists(key):
+            logger.info("Omitiendo %s, ya existe.", item.title)
+            return 0
 
-        logger.info(f"Descargando: {item.title}")
+        logger.info("Descargando: %s", item.title)
         try:
             content = item.get_content()
 
             if item.is_video:
-                download_url = content["videos"]["hd"]["mp4"]
-                response = item.get_resource_stream(download_url)
-                with open(final_path, "wb") as f:
+                quality = self._choose_quality(item, content["videos"], item_filter)
+                download_url = content["videos"][quality]["mp4"]
+                start = time.monotonic()
+                try:
+                    size = self._stream_to_storage(item, download_url, key)
+                except BaseException:
+                    if self.quality_policy is not None:
+                        self.quality_policy.release(item)
+                    raise
+                if self.quality_policy is not None:
+                    self.quality_policy.record(size, time.monotonic() - start, item)
+            else:
+                markdown = content["content"]
+                if self.asset_fetcher is not None and content["assets"]:
+                    markdown = self._localize_assets(item, key, markdown, content)
+                location = self.storage.write_text(key, markdown)
+                if self.page_store is not None and content["raw_html"] is not None:
+                    self.page_store.put(
+                        key,
+                        item.url,
+                        content["raw_html"].encode("utf-8"),
+                        item.is_question,
+                    )
+                data = markdown.encode("utf-8")
+                size = len(data)
+                self._record(key, item, len(data), hashlib.sha256(data).hexdigest())
+                self.metrics.incr("bytes_written", len(data))
+                if self.search_index is not None:
+                    self.search_index.add_item(item, location, markdown)
+
+            self.metrics.incr("items_downloaded")
+            sleep_progress(3, self.clock)
+            return size
+
+        except SessionExpiredError:
+            # Sin sesion fallarian todos los items siguientes: se corta el curso.
+            self.metrics.incr("items_failed")
+            raise
+
+        except Exception as e:
+            self.metrics.incr("items_failed")
+            logger.error("Error descargando %s: %s", item.title, e)
+            return None
+
+    def _choose_quality(self, item: Item, videos: dict, item_filter: ItemFilter):
+        """Calidad a descargar: la mejor que acepta el filtro, o la de la politica."""
+        qualities = item_filter.video_qualities(videos)
+        if not qualities:
+            raise ValueError(f"Sin video en una calidad aceptada: {list(videos)}")
+        if self.quality_policy is None:
+            quality = qualities[0]
+        else:
+            previous = (
+                self.manifest.get_quality(item.url)
+                if self.manifest is not None
+                else None
+            )
+            quality = self.quality_policy.choose(item, videos, qualities, previous)
+        if self.manifest is not None:
+            self.manifest.set_quality(item.url, quality)
+        return quality
+
+    def _localize_assets(self, item: Item, key: str, markdown: str, content: dict):
+        """Descarga las imagenes y adjuntos del item y los enlaza en el Markdown."""
+        course_key = posixpath.dirname(posixpath.dirname(key))
+        local_keys = self.asset_fetcher.fetch(item, content["assets"], course_key)
+        self.metrics.incr("assets_linked", len(local_keys))
+        return rewrite_markdown(markdown, local_keys, key)
+
+    def _stream_to_storage(self, item: Item, url: str, key: str):
+        """
+        Descarga un recurso al almacenamiento, reintentando si la conexion se corta
+        a mitad.
+
+        El hash y el tamaño se calculan sobre los mismos bloques que se escriben y
+        se comparan con el `Content-Length` del servidor. Si no se logra, el
+        almacenamiento descarta lo escrito para que no parezca terminado.
+
+        Los reintentos (de la peticion y del cuerpo) se cuentan solo aqui: la
+        peticion se hace sin los reintentos de `_make_request`.
+
+        Returns:
+            int: Bytes escritos.
+        """
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = item.get_resource_stream(url, retry_policy=NO_RETRY)
+                content_length = response.headers.get("Content-Length")
+                content_length = int(content_length) if content_length else None
+                if response.headers.get("Content-Encoding", "identity") != "identity":
+                    # Con compresion el Content-Length no es el tamaño escrito.
+                    content_length = None
+                sha256 = hashlib.sha256()
+                size = 0
+                with self.storage.open_write(key) as f:
                     for chunk in response.iter_content(chunk_size=8192):
                         if chunk:
+                            if self.bandwidth_shaper is not None:
+                                self.bandwidth_shaper.consume(
+                                    len(chunk), Priority.BULK, self.worker_limit
+                                )
                             f.write(chunk)
-            else:
-                final_path.write_text(content["content"], encoding="utf-8")
+                            sha256.update(chunk)
+                            size += len(chunk)
+                            self.metrics.incr("bytes_written", len(chunk))
+                    if content_length is not None and size != content_length:
+                        raise IncompleteDownloadError(
+                            f"Se recibieron {size} de {content_length} bytes"
+                        )
+                self._record(key, item, size, sha256.hexdigest(), url, content_length)
+                return size
+            except requests.RequestException as e:
+                if isinstance(e, requests.HTTPError):
+                    # Un 429/5xx del servidor, con su `Retry-After` si lo trae.
+                    failed = e.response
+                    retry = self.retry_policy.should_retry(
+                        "GET", attempt, response=failed
+                    )
+                else:
+                    failed = None
+                    retry = self.retry_policy.should_retry("GET", attempt, error=e)
+                if not retry:
+                    raise
+                delay = self.retry_policy.delay(attempt, failed, self.clock.random)
+                logger.warning(
+                    "Descarga interrumpida de %s, reintentando en %.1fs: %s",
+                    item.title,
+                    delay,
+                    e,
+                )
+                self.clock.sleep(delay)
+                attempt += 1
+            finally:
+                if response is not None:
+                    response.close()
 
-            sleep_progress(3)
+    def _record(
+        self,
+        key: str,
+        item: Item,
+        size: int,
+        sha256: str,
+        source_url: Optional[str] = None,
+        content_length: Optional[int] = None,
+    ):
+        if self.manifest is not None:
+            self.manifest.put(key, size, sha256, item.url, source_url, content_length)
 
-        except Exception as e:
-            logger.error(f"Error descargando {item.title}: {e}")
+    def download_course(
+        self,
+        url: str,
+        item_filter: Optional[ItemFilter] = None,
+        ignore_history: bool = False,
+        progress: Optional[Callable[[Item, Optional[int]], None]] = None,
+    ) -> bool:
+        """
+        Descarga un curso completo, o la parte que acepte el filtro.
+
+        Args:
+            url (str): URL del curso.
+            item_filter (ItemFilter, opcional): Reemplaza al filtro del Downloader.
+                Las secciones e items descartados no se piden.
+            ignore_history (bool): Si es True, recorre el curso aunque ya figure
+                en el historial (sincronizacion): solo se descargan los items que
+                no existen todavia.
+            progress (Callable, opcional): Se llama con `(item, bytes)` tras cada
+                item; `bytes` es None si el item fallo (ver `jobs.JobProgress`).
 
-    def download_course(self, url: str):
-        """Descarga un curso completo."""
+        Returns:
+            bool: True si el curso quedo descargado (ahora o anteriormente); False
+                si fallo, o si fallo alguno de sus items.
+        """
+        item_filter = item_filter or self.item_filter
         history = self._load_history()
-        if url in history:
-            logger.info(f"Curso ya descargado anteriormente: {url}")
-            return
+        if url in history and not ignore_history:
+            logger.info("Curso ya descargado anteriormente: %s", url)
+            return True
 
-        logger.info(f"Iniciando descarga del curso: {url}")
-        course = Course(url)
+        logger.info("Iniciando descarga del curso: %s", url)
+        course = Course(url, **self.course_options())
+        course_key = None
+        failed = 0
         try:
-            for item in course.iter_items():
-                self.download_item(item)
+            for item in course.iter_items(item_filter):
+                course_key = course_key or self.course_key(item)
+                size = self.download_item(item, item_filter)
+                if size is None:
+                    failed += 1
+                if progress is not None:
+                    progress(item, size)
 
-            self._save_history(url)
-            logger.info(f"Curso completado: {course.title}")
+            if failed:
+                # No va al historial: la proxima vez se reintentan los que faltan.
+                self.metrics.incr("courses_failed")
+                logger.error(
+                    "Curso incompleto, fallaron %d items: %s", failed, course.title
+                )
+                return False
+            # Una descarga parcial no cuenta como curso descargado.
+            if not item_filter.is_partial:
+                self._save_history(url)
+            self.metrics.incr("courses_completed")
+            logger.info("Curso completado: %s", course.title)
+            return True
 
         except Exception as e:
-            logger.error(f"Error descargando el curso {course.title}: {e}")
+            self.metrics.incr("courses_failed")
+            logger.error("Error descargando el curso %s: %s", course.title, e)
+            return False
+
+        finally:
+            # Cierra el archivo del curso si el almacenamiento empaqueta cursos.
+            # Solo el de este curso: el almacenamiento puede ser compartido.
+            if course_key is not None:
+                self.storage.close_course(course_key)
+            if self.bounded_memory:
+                course.release()
+            if logger.isEnabledFor(logging.DEBUG):
+                # La lectura de la memoria (RSS) tiene su costo: solo si se va a ver.
+                peak_rss = self.metrics.snapshot()["peak_rss_bytes"]
+                if peak_rss is not None:
+                    logger.debug("Memoria maxima: %.1f MiB", peak_rss / 1024 / 1024)
+
+    def download_list(
+        self, urls: list[Union[str, dict]], item_filter: Optional[ItemFilter] = None
+    ):
+        """
+        Descarga una lista de URLs.
 
-    def download_list(self, urls: list[str]):
-        """Descarga una lista de URLs."""
-        urls = list(set(u for u in urls if u.strip()))
+        Acepta tambien los diccionarios que devuelve `CatalogCrawler.crawl`.
+        """
+        urls = [u["url"] if isinstance(u, dict) else u for u in urls]
+        urls = list(dict.fromkeys(u.strip() for u in urls if u.strip()))
         for url in urls:
-            self.download_course(url)
+            self.download_course(url, item_filter)
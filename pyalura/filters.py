@@ -0,0 +1,145 @@
+import logging
+import re
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Union
+
+from pyalura.utils import ArticleType
+
+if TYPE_CHECKING:
+    from pyalura.item import Item
+    from pyalura.section import Section
+
+logger = logging.getLogger(__name__)
+
+# Calidades de video de menor a mayor.
+VIDEO_QUALITIES = ("sd", "hd", "fullhd")
+# Calidad que se descarga si no se indica otra.
+DEFAULT_VIDEO_QUALITY = "hd"
+
+
+def parse_section_ranges(spec: str) -> set[int]:
+    """Convierte "1-3,5" en {1, 2, 3, 5}."""
+    indexes = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            indexes.update(range(int(start), int(end) + 1))
+        else:
+            indexes.add(int(part))
+    return indexes
+
+
+class ItemFilter:
+    """
+    Selecciona que secciones e items de un curso se procesan.
+
+    Los filtros se aplican lo antes posible: una seccion descartada no se pide
+    nunca, y un item descartado no llega a `get_content` ni a las esperas.
+
+    Atributos:
+        types (Callable[[ArticleType], bool], opcional): Tipos de item aceptados.
+            Se puede pasar una lista de `ArticleType` o una funcion, p. ej.
+            `lambda t: t.is_document`.
+        sections (set[int], opcional): Indices de seccion aceptados. Acepta
+            tambien un `range` o un texto como "1-3,5".
+        title (re.Pattern, opcional): Expresion regular que debe aparecer en el
+            titulo del item (sin distinguir mayusculas).
+        unseen_only (bool): Si es True, solo los items no vistos (ver `Item.is_seen`).
+        max_video_quality (str, opcional): Calidad maxima de video a descargar
+            (una de `VIDEO_QUALITIES`). Por defecto, `DEFAULT_VIDEO_QUALITY`.
+    """
+
+    def __init__(
+        self,
+        types: Optional[
+            Union[Iterable[ArticleType], Callable[[ArticleType], bool]]
+        ] = None,
+        sections: Optional[Union[Iterable[int], str]] = None,
+        title: Optional[Union[str, re.Pattern]] = None,
+        unseen_only: bool = False,
+        max_video_quality: Optional[str] = None,
+    ):
+        if types is not None and not callable(types):
+            accepted = set(types)
+            types = accepted.__contains__
+        self.types = types
+
+        if isinstance(sections, str):
+            sections = parse_section_ranges(sections)
+        self.sections = set(sections) if sections is not None else None
+
+        if isinstance(title, str):
+            title = re.compile(title, re.IGNORECASE)
+        self.title = title
+
+        self.unseen_only = unseen_only
+
+        if max_video_quality is not None and max_video_quality not in VIDEO_QUALITIES:
+            raise ValueError(f"Calidad de video desconocida: {max_video_quality}")
+        self.max_video_quality = max_video_quality
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "ItemFilter":
+        """
+        Crea un filtro desde un diccionario (por ejemplo, de un trabajo en JSON).
+
+        `types` es una lista de nombres de `ArticleType`; ademas acepta las
+        categorias "document" y "question".
+        """
+        data = dict(data or {})
+        types = data.pop("types", None)
+        if types is not None:
+            names = {
+                name.upper() for name in ([types] if isinstance(types, str) else types)
+            }
+
+            def accepts(article_type: ArticleType) -> bool:
+                return (
+                    article_type.name in names
+                    or ("DOCUMENT" in names and article_type.is_document)
+                    or ("QUESTION" in names and article_type.is_question)
+                )
+
+            data["types"] = accepts
+        return cls(**data)
+
+    @property
+    def is_partial(self) -> bool:
+        """True si el filtro puede dejar fuera algun item del curso."""
+        return any(
+            [
+                self.types is not None,
+                self.sections is not None,
+                self.title is not None,
+                self.unseen_only,
+            ]
+        )
+
+    def accepts_section(self, section: "Section") -> bool:
+        return self.sections is None or int(section.index) in self.sections
+
+    def accepts_item(self, item: "Item") -> bool:
+        if self.types is not None and not self.types(item.type):
+            return False
+        if self.title is not None and not self.title.search(item.title):
+            return False
+        if self.unseen_only and item.is_seen():
+            return False
+        return True
+
+    def video_qualities(self, videos: dict) -> list[str]:
+        """
+        Calidades disponibles que no superan `max_video_quality`, de mayor a menor.
+
+        Args:
+            videos (dict): Videos por calidad, como los devuelve `VideoItem.get_content`.
+        """
+        limit = VIDEO_QUALITIES.index(self.max_video_quality or DEFAULT_VIDEO_QUALITY)
+        return [q for q in reversed(VIDEO_QUALITIES[: limit + 1]) if q in videos]
+
+    def select_video(self, videos: dict) -> Optional[dict]:
+        """Elige la mejor calidad disponible que no supere `max_video_quality`."""
+        qualities = self.video_qualities(videos)
+        return videos[qualities[0]] if qualities else None
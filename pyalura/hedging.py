@@ -0,0 +1,171 @@
+import collections
+import logging
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# (response, error), como lo devuelve `Base._send_request`.
+Attempt = tuple[Optional[requests.Response], Optional[Exception]]
+
+
+class Timing:
+    """
+    Momento en que una peticion sale (tras esperar en el limitador) y cuanto
+    tarda desde entonces. Lo completa `Base._send_request`.
+    """
+
+    def __init__(self):
+        self.sent = threading.Event()
+        self.sent_at: Optional[float] = None
+        self.latency: Optional[float] = None
+
+    def start(self):
+        self.sent_at = time.monotonic()
+        self.sent.set()
+
+    def stop(self):
+        if self.sent_at is not None:
+            self.latency = time.monotonic() - self.sent_at
+
+
+class HedgePolicy:
+    """
+    Repite las peticiones GET que tardan mas de lo habitual ('hedged requests').
+
+    Si una peticion no responde dentro del percentil `percentile` de las
+    latencias recientes, se envia una segunda peticion identica. Tanto las
+    latencias como el plazo se cuentan desde que la peticion sale, sin la
+    espera en el limitador. Se usa la
+    primera respuesta que llegue; la otra se descarta y se cierra en cuanto
+    termina (`requests` no permite abortar una peticion en curso).
+
+    Las repeticiones pasan por el limitador como cualquier peticion, y ademas un
+    presupuesto acota la carga extra: como mucho `budget` repeticiones por cada
+    peticion hecha (0.05 = un 5 % mas de peticiones).
+
+    Solo se aplica a GET sin `stream`: los listados de secciones y las paginas
+    de los items. Los videos y los envios de respuestas no se repiten.
+
+    Atributos:
+        percentile (float): Percentil de latencia (entre 0 y 1) tras el que se repite.
+        budget (float): Repeticiones permitidas por cada peticion.
+        window (int): Cantidad de latencias recientes que se tienen en cuenta.
+        min_samples (int): Latencias necesarias antes de empezar a repetir.
+        min_delay (float): Espera minima en segundos antes de repetir.
+        requests (int): Peticiones hechas a traves de la politica.
+        hedged (int): Repeticiones enviadas.
+        hedge_wins (int): Repeticiones que respondieron antes que la original.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        max_workers: int = 16,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile debe estar entre 0 y 1")
+        self.percentile = percentile
+        self.budget = budget
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="hedge")
+
+    def delay(self) -> Optional[float]:
+        """Segundos a esperar antes de repetir, o None si aun no hay datos."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, math.ceil(self.percentile * len(latencies)) - 1)
+        return max(self.min_delay, latencies[index])
+
+    def record(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.budget * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    def _timed(self, send: Callable[[Timing], Attempt], timing: Timing) -> Attempt:
+        try:
+            response, error = send(timing)
+        finally:
+            # Si fallo antes de salir, quien espera a que salga no se queda colgado.
+            timing.sent.set()
+        if error is None and timing.latency is not None:
+            self.record(timing.latency)
+        return response, error
+
+    def send(self, send: Callable[[Timing], Attempt]) -> Attempt:
+        """
+        Hace la peticion con `send` y la repite si tarda demasiado.
+
+        Args:
+            send (Callable): Hace una peticion y devuelve `(response, error)`; se
+                llama una vez, o dos si se repite, con un `Timing` que debe
+                marcar cuando sale la peticion y cuando termina.
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.delay()
+        if delay is None:
+            return self._timed(send, Timing())
+
+        timing = Timing()
+        primary = self._executor.submit(self._timed, send, timing)
+        timing.sent.wait()
+        waited = time.monotonic() - timing.sent_at if timing.sent_at else 0.0
+        done, _ = wait([primary], timeout=max(0.0, delay - waited))
+        if done or not self._take_budget():
+            return primary.result()
+
+        logger.debug("Sin respuesta tras %.2fs, se repite la peticion", delay)
+        hedge = self._executor.submit(self._timed, send, Timing())
+        pending = {primary, hedge}
+        winner = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Se prefiere una respuesta a un error; con un error se espera a la otra.
+            winner = next((f for f in done if f.result()[1] is None), None)
+            if winner is not None:
+                break
+        if winner is None:
+            return primary.result()
+        if winner is hedge:
+            with self._lock:
+                self.hedge_wins += 1
+        for future in (primary, hedge):
+            if future is not winner and not future.cancel():
+                future.add_done_callback(self._discard)
+        return winner.result()
+
+    @staticmethod
+    def _discard(future: Future):
+        if future.exception() is not None:
+            return
+        response, _ = future.result()
+        if response is not None:
+            response.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
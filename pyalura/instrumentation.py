@@ -0,0 +1,58 @@
+import logging
+import platform
+import threading
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Memoria residente maxima del proceso en bytes, o None si no se puede medir."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo reporta en KiB y macOS en bytes.
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Memoria residente actual del proceso en bytes (solo Linux), o None."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * resource.getpagesize() if resource is not None else None
+
+
+class Metrics:
+    """
+    Contadores y medidas de una ejecucion, seguros entre hilos.
+
+    `snapshot` devuelve los contadores junto con la memoria actual y maxima del
+    proceso.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = dict(self._counters)
+        data["rss_bytes"] = current_rss_bytes()
+        data["peak_rss_bytes"] = peak_rss_bytes()
+        return data
@@ -1,15 +1,13 @@
 import logging
-import random
-from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from urllib.parse import urljoin, urlparse
 
-import html2text
-from lxml import html
+import requests
 from lxml.html import HtmlElement
 
-from pyalura import utils
+from pyalura import media, parsing, utils
+from pyalura.bandwidth import Priority
 from pyalura.question import Answer, Question
 from pyalura.utils import ArticleType
 
@@ -32,7 +30,7 @@ class Item(Base):
         index: str,
         type: ArticleType,
         section: "Section",
-        is_marked_as_seen: bool,
+        is_marked_as_seen: Optional[bool],
     ):
         self.url = url
         self.title = title
@@ -41,8 +39,8 @@ class Item(Base):
         self.section = section
         self.is_marked_as_seen = is_marked_as_seen
 
-        super().__init__(cookie_manager=section.cookie_manager)
-        logger.debug(f"Item creado ({self.__class__.__name__}): {self.title}")
+        super().__init__(**section._shared_options())
+        logger.debug("Item creado (%s): %s", self.__class__.__name__, self.title)
 
     @property
     def course(self) -> "Course":
@@ -68,70 +66,101 @@ class Item(Base):
                 setattr(self, "_is_last_item", is_last_item)
         return getattr(self, "_is_last_item")
 
+    def is_seen(self) -> bool:
+        """
+        Si el item ya esta visto.
+
+        Los items que salen del `ItemIndex` pueden no saberlo (`is_marked_as_seen`
+        es None): en ese caso se consulta la pagina de su seccion.
+        """
+        if self.is_marked_as_seen is None:
+            self.is_marked_as_seen = any(
+                item.is_marked_as_seen
+                for item in self.section.items
+                if item.taks_id == self.taks_id
+            )
+        return self.is_marked_as_seen
+
+    def _set_seen(self):
+        self.is_marked_as_seen = True
+        if self.course.item_index is not None:
+            self.course.item_index.mark_seen(self.taks_id)
+
     def _should_wait_for_request(self) -> bool:
         if self.section.course.last_item_get_content_time is None:
             return False
-        diff_time = datetime.now() - self.section.course.last_item_get_content_time
+        diff_time = self.clock.now() - self.section.course.last_item_get_content_time
         return diff_time.total_seconds() < 15
 
     def _wait_for_request(self):
-        randint = random.randint(5, 30)
-        logger.debug(f"Esperando {randint}s antes de pedir: {self.title}")
-        utils.sleep_progress(randint)
-        self.section.course.last_item_get_content_time = datetime.now()
+        randint = self.clock.random.randint(5, 30)
+        logger.debug("Esperando %ds antes de pedir: %s", randint, self.title)
+        utils.sleep_progress(randint, self.clock)
+        self.section.course.last_item_get_content_time = self.clock.now()
 
     def _convert_html_to_markdown(self, html_content: bytes, header: str) -> str:
-        string = html2text.html2text(html_content.decode("UTF-8"))
-        return f"# {header}\n\n{string}"
+        return parsing.html_to_markdown(html_content, header)
+
+    def get_resource_stream(self, url: str, **kwargs):
+        return self._make_request(url, stream=True, **kwargs)
 
-    def get_resource_stream(self, url: str):
-        return self._make_request(url, stream=True)
+    def get_resource_size(self, url: str) -> Optional[int]:
+        """Tamaño en bytes de un recurso segun un HEAD, o None si no se informa."""
+        response = self._make_request(url, method="HEAD", allow_redirects=True)
+        content_length = response.headers.get("Content-Length", "")
+        return int(content_length) if content_length.isdigit() else None
 
     def get_content(self) -> dict:
         """Lógica base: obtiene HTML y lo convierte a Markdown."""
-        logger.info(f"Solicitando contenido del item: {self.title}")
-        if self._should_wait_for_request():
-            self._wait_for_request()
-
-        response = self._make_request(self.url)
-        root = html.fromstring(response.text)
-        self.section.course.last_item_get_content_time = datetime.now()
-
-        # Extracción básica de texto
-        element = root.find(".//section[@id='task-content']")
-        if element is None:
+        logger.info("Solicitando contenido del item: %s", self.title)
+        # La comprobacion y la espera van juntas para que dos hilos del mismo
+        # curso no pidan a la vez creyendo que ya paso el tiempo.
+        with self.section.course.content_request_lock:
+            if self._should_wait_for_request():
+                self._wait_for_request()
+            self.section.course.last_item_get_content_time = self.clock.now()
+
+        response = self._make_request(self.url, priority=Priority.CONTENT)
+        self.section.course.last_item_get_content_time = self.clock.now()
+
+        # El parseo y la conversion a Markdown pueden ir al pool de procesos.
+        parsed = self._run_parser(
+            parsing.parse_task_page, response.content, self.is_question
+        )
+        markdown_content = parsed["content"]
+        if markdown_content is None:
             # Fallback para items que quizas no tienen task-content estandar
-            logger.warning(f"No se encontró task-content en {self.title}")
+            logger.warning("No se encontró task-content en %s", self.title)
             markdown_content = ""
-        else:
-            header = root.find(
-                ".//span[@class='task-body-header-title-text']"
-            ).text.strip()
-            markdown_content = self._convert_html_to_markdown(
-                html.tostring(element), header
-            )
 
         return {
             "videos": None,
             "content": markdown_content,
-            "raw_html": response.text,
+            # En modo de memoria acotada no se conserva el HTML crudo.
+            "raw_html": None if self.course.bounded_memory else response.text,
             "question": None,
+            "answers": parsed["answers"],
+            "assets": parsed["assets"],
         }
 
     def mark_as_watched(self):
         """Lógica base: Marca como visto haciendo GET a la URL."""
-        if self.is_marked_as_seen:
-            logger.info(f"Item ya visto: {self.title}")
+        if self.is_seen():
+            logger.info("Item ya visto: %s", self.title)
             return False
 
-        logger.info(f"Marcando como visto (Base): {self.title}")
+        logger.info("Marcando como visto (Base): %s", self.title)
         self._make_request(self.url)
-        self.is_marked_as_seen = True
+        self._set_seen()
         return True
 
+    def get_duration(self) -> Optional[float]:
+        """Duracion en segundos del item. Solo los videos tienen duracion."""
+        return None
+
     def resolve_question(self):
         """Por defecto un item no se puede 'resolver'."""
-        logger.info(f"El item {self.title} no es una pregunta, no se hace nada.")
+        logger.info("El item %s no es una pregunta, no se hace nada.", self.title)
         return False
 
     @staticmethod
@@ -152,32 +181,7 @@ class Item(Base):
         Parsea el HTML y retorna una lista de OBJETOS Item (o subclases).
         Nota: Ahora requiere recibir la sección para instanciar directamente.
         """
-        items_objects = []
-        for articulo in root.xpath(".//ul[@class='task-menu-nav-list']/li"):
-            url = urljoin(
-                "https://app.aluracursos.com/", articulo.find(".//a").get("href")
-            )
-            title = articulo.find(".//span[@title]").text.strip()
-            index = articulo.find(
-                ".//span[@class='task-menu-nav-item-number']"
-            ).text.strip()
-            type_enum = getattr(
-                ArticleType, articulo.find(".//use").get("xlink:href").split("#")[1]
-            )
-            is_seen = "task-menu-nav-item-svg--done" in articulo.find(".//svg").get(
-                "class"
-            )
-
-            data = {
-                "url": url,
-                "title": title,
-                "index": index,
-                "type": type_enum,
-                "is_marked_as_seen": is_seen,
-            }
-            items_objects.append(Item.create(data, section))
-
-        return items_objects
+        return [Item.create(data, section) for data in parsing.parse_items_data(root)]
 
 
 class VideoItem(Item):
@@ -195,19 +199,84 @@ class VideoItem(Item):
         content_data["videos"] = videos_formatted
         return content_data
 
+    def get_duration(self) -> Optional[float]:
+        """
+        Duracion real del video en segundos, o None si no se pudo averiguar.
+
+        Se toma de los metadatos de `/video` si los traen; si no, se lee la
+        cabecera `moov/mvhd` del mp4 con peticiones Range, sin descargar el video.
+        """
+        if hasattr(self, "_duration"):
+            return self._duration
+
+        duration = None
+        videos_json = self._fetch_item_video()
+        for video in videos_json:
+            for key in ("duration", "durationInSeconds", "length"):
+                if video.get(key):
+                    duration = float(video[key])
+                    break
+            if duration is not None:
+                break
+
+        if duration is None:
+            # Cualquier calidad tiene la misma duracion; la menor pesa menos.
+            for video in sorted(videos_json, key=lambda v: v.get("quality") != "sd"):
+                if video.get("mp4"):
+                    duration = self._probe_mp4_duration(video["mp4"])
+                    break
+
+        if duration is None:
+            logger.warning("No se pudo averiguar la duracion de: %s", self.title)
+        setattr(self, "_duration", duration)
+        return duration
+
+    def _read_range(self, url: str, offset: int, size: int) -> bytes:
+        headers = {"Range": f"bytes={offset}-{offset + size - 1}"}
+        response = self._make_request(
+            url, headers=headers, stream=True, priority=Priority.INTERACTIVE
+        )
+        try:
+            if offset and response.status_code != 206:
+                # El servidor ignoro el Range; no se descarga el video entero.
+                return b""
+            data = b""
+            for chunk in response.iter_content(chunk_size=size):
+                data += chunk
+                if len(data) >= size:
+                    break
+            return data[:size]
+        finally:
+            response.close()
+
+    def _probe_mp4_duration(
+        self, url: str, chunk_size: int = 64 * 1024, max_reads: int = 4
+    ) -> Optional[float]:
+        offset = 0
+        for _ in range(max_reads):
+            data = self._read_range(url, offset, chunk_size)
+            duration = media.parse_mp4_duration(data)
+            if duration is not None:
+                return duration
+            next_offset = media.next_box_offset(data)
+            if not next_offset:
+                return None
+            offset += next_offset
+        return None
+
     def mark_as_watched(self):
-        if self.is_marked_as_seen:
+        if self.is_seen():
             return False
 
         self._make_request(self.url)
-        logger.info(f"Marcando VIDEO como visto: {self.title}")
+        logger.info("Marcando VIDEO como visto: %s", self.title)
         url_api = f"{self.url}/mark-video"
         course_code = Path(urlparse(self.url).path).parent.parent.name
         data = {"courseCode": course_code, "videoTaskId": self.taks_id}
 
         response = self._make_request(url=url_api, method="POST", data=data)
         if response.ok:  # requests usa .ok para 200-299
-            self.is_marked_as_seen = True
+            self._set_seen()
             return True
         return False
 
@@ -217,29 +286,72 @@ class QuestionItem(Item):
 
     def get_content(self) -> dict:
         content_data = super().get_content()
-        root = html.fromstring(content_data["raw_html"])
 
         question = Question(answers=None, item=self)
-        answers = [Answer(choice=question, **i) for i in Answer.parse_from_html(root)]
+        answers = [Answer(choice=question, **i) for i in content_data["answers"]]
         question.answers = answers
 
+        answer_store = self.course.answer_store
+        if answer_store is not None:
+            correct = [answer.id for answer in answers if answer.is_correct]
+            answer_store.put(self.taks_id, correct, question.choice_type)
+
         content_data["question"] = question
         return content_data
 
+    def _resolve_from_store(self) -> bool:
+        """
+        Envia las respuestas guardadas en el `AnswerStore`, sin pedir la pagina.
+
+        Returns:
+            bool: False si no hay respuestas guardadas o si el envio fallo.
+        """
+        answer_store = self.course.answer_store
+        entry = answer_store.get(self.taks_id) if answer_store is not None else None
+        if entry is None:
+            return False
+
+        logger.info("Respuestas encontradas en el almacen local: %s", self.title)
+        question = Question(answers=None, item=self, choice_type=entry["choice_type"])
+        question.answers = [
+            Answer(
+                id=answer_id,
+                text="",
+                is_correct=True,
+                is_selected=True,
+                choice=question,
+            )
+            for answer_id in entry["alternatives"]
+        ]
+        try:
+            return question.send_selected_answers()
+        except requests.RequestException as e:
+            logger.warning(
+                "No se pudieron enviar las respuestas guardadas de %s: %s",
+                self.title,
+                e,
+            )
+            return False
+
     def mark_as_watched(self):
-        logger.warning(f"Use 'resolve_question' para el item: {self.title}")
+        logger.warning("Use 'resolve_question' para el item: %s", self.title)
         return False
 
     def resolve_question(self):
-        if self.is_marked_as_seen:
+        if self.is_seen():
             return False
 
-        logger.info(f"Resolviendo pregunta: {self.title}")
+        logger.info("Resolviendo pregunta: %s", self.title)
+        if self._resolve_from_store():
+            self._set_seen()
+            return True
+        # Sin respuestas guardadas, o las guardadas no sirvieron: se pide la pagina.
+
         # Necesitamos cargar el contenido para saber las respuestas
         content = self.get_content()
         question: Question = content["question"]
 
         if question and question.resolve():
-            self.is_marked_as_seen = True
+            self._set_seen()
             return True
         return False
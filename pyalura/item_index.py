@@ -0,0 +1,156 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+from urllib.parse import urlparse
+
+from pyalura.utils import ArticleType
+
+if TYPE_CHECKING:
+    from pyalura.item import Item
+    from pyalura.section import Section
+
+logger = logging.getLogger(__name__)
+
+# Nombre por defecto del indice dentro de la carpeta de descargas.
+ITEM_INDEX_NAME = "item_index.sqlite3"
+
+
+def task_id_from_url(url_or_task_id: Union[str, int]) -> str:
+    """Devuelve el id de la tarea a partir de su URL (o el id tal cual)."""
+    value = str(url_or_task_id).strip().rstrip("/")
+    if value.isdigit():
+        return value
+    return Path(urlparse(value).path).name
+
+
+class ItemIndex:
+    """
+    Indice persistente (SQLite) de items: id de tarea -> curso, seccion, posicion y tipo.
+
+    Se llena cada vez que se listan los items de una seccion de un `Course` que
+    tenga un indice asignado. Con el indice, `Course.get_item` puede instanciar un
+    Item sin volver a pedir su pagina.
+
+    Tambien guarda si el item ya estaba visto (`seen`), y se actualiza cuando
+    pyalura lo marca como visto. Como el progreso tambien avanza desde el
+    navegador, un item no visto segun el indice puede estarlo ya.
+
+    Atributos:
+        path (Path): Ruta del archivo SQLite.
+    """
+
+    def __init__(self, path: Union[str, Path] = ITEM_INDEX_NAME):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS items (
+                task_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                item_index TEXT NOT NULL,
+                type TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                course_url TEXT NOT NULL,
+                section_name TEXT NOT NULL,
+                section_url TEXT NOT NULL,
+                seen INTEGER
+            )
+            """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(items)")]
+        if "seen" not in columns:
+            # Indices creados antes de guardar el progreso: queda desconocido.
+            self._conn.execute("ALTER TABLE items ADD COLUMN seen INTEGER")
+        self._conn.commit()
+
+    def add_section(self, section: "Section", items: list["Item"]):
+        """Guarda (o actualiza) los items de una seccion."""
+        rows = [
+            (
+                item.taks_id,
+                item.url,
+                item.title,
+                item.index,
+                item.type.name,
+                position,
+                section.course.url_base,
+                f"{section.index}. {section.title}",
+                section.url,
+                None if item.is_marked_as_seen is None else int(item.is_marked_as_seen),
+            )
+            for position, item in enumerate(items)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        logger.debug("Indexados %d items de la seccion: %s", len(rows), section.url)
+
+    def mark_seen(self, url_or_task_id: Union[str, int]):
+        """Anota que el item ya esta visto."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE items SET seen = 1 WHERE task_id = ?",
+                (task_id_from_url(url_or_task_id),),
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _row_to_dict(row: tuple) -> dict:
+        task_id, url, title, index, type_name, position, course, name, section = row[:9]
+        seen = row[9]
+        return {
+            "task_id": task_id,
+            "url": url,
+            "title": title,
+            "index": index,
+            "type": ArticleType[type_name],
+            "position": position,
+            "course_url": course,
+            "section_name": name,
+            "section_url": section,
+            "seen": None if seen is None else bool(seen),
+        }
+
+    def get(self, url_or_task_id: Union[str, int]) -> Optional[dict]:
+        """Busca un item por URL o id de tarea. Devuelve None si no esta indexado."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM items WHERE task_id = ?",
+                (task_id_from_url(url_or_task_id),),
+            ).fetchone()
+        return None if row is None else self._row_to_dict(row)
+
+    def get_many(self, urls_or_task_ids: Iterable[Union[str, int]]) -> dict[str, dict]:
+        """
+        Busca varios items a la vez.
+
+        Returns:
+            dict[str, dict]: Items encontrados, por id de tarea. Los que no estan
+                indexados no aparecen.
+        """
+        task_ids = list(dict.fromkeys(task_id_from_url(i) for i in urls_or_task_ids))
+        found = {}
+        # SQLite limita la cantidad de parametros por consulta.
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT * FROM items WHERE task_id IN ({placeholders})", chunk
+                ).fetchall()
+            for row in rows:
+                found[row[0]] = self._row_to_dict(row)
+        return found
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,205 @@
+"""
+Trabajos por lotes: que hacer con cada curso y como medir su avance.
+
+Un trabajo es un diccionario con `action` (ver `ACTIONS`), `url` y, opcionalmente,
+`filter` (ver `ItemFilter.from_dict`). En un archivo de trabajos cada linea es
+un trabajo, en JSON o como texto:
+
+    https://app.aluracursos.com/course/ejemplo            # download
+    complete https://app.aluracursos.com/course/ejemplo
+    {"action": "sync", "url": "...", "filter": {"types": ["document"]}}
+"""
+
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+from pyalura.course import Course
+from pyalura.filters import ItemFilter
+
+if TYPE_CHECKING:
+    from pyalura.downloader import Downloader
+    from pyalura.item import Item
+
+# download: descarga el curso si no esta en el historial.
+# sync: lo recorre aunque este en el historial y descarga lo que falte.
+# complete: marca como vistas las actividades y responde las preguntas.
+ACTIONS = ("download", "sync", "complete")
+
+
+def validate_job(job: dict):
+    """Lanza ValueError si el trabajo no es valido."""
+    if not isinstance(job, dict):
+        raise ValueError(f"Se esperaba un objeto JSON: {job!r}")
+    if job.get("action") not in ACTIONS:
+        raise ValueError(f"Accion desconocida: {job.get('action')}")
+    if not (job.get("url") or "").strip():
+        raise ValueError("El trabajo no tiene URL")
+    try:
+        ItemFilter.from_dict(job.get("filter"))
+    except (TypeError, re.error) as e:
+        raise ValueError(f"Filtro invalido: {e}") from e
+
+
+def parse_job_line(line: str) -> Optional[dict]:
+    """Convierte una linea de un archivo de trabajos; None si esta vacia o es un comentario."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        job = json.loads(line)
+    else:
+        parts = line.split(" #", 1)[0].split()
+        if len(parts) == 1:
+            job = {"action": "download", "url": parts[0]}
+        elif len(parts) == 2:
+            job = {"action": parts[0], "url": parts[1]}
+        else:
+            raise ValueError(f"Linea invalida: {line}")
+    validate_job(job)
+    return job
+
+
+def load_jobs(path: Union[str, Path]) -> list[dict]:
+    """Lee un archivo de trabajos. Lanza ValueError indicando la linea invalida."""
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            try:
+                job = parse_job_line(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}") from e
+            if job is not None:
+                jobs.append(job)
+    return jobs
+
+
+def job_filter(job: dict) -> Optional[ItemFilter]:
+    """Filtro del trabajo, o None para usar el del `Downloader`."""
+    return ItemFilter.from_dict(job["filter"]) if job.get("filter") else None
+
+
+def run_job(
+    downloader: "Downloader",
+    job: dict,
+    progress: Optional[Callable[["Item", Optional[int]], None]] = None,
+):
+    """
+    Ejecuta un trabajo con la configuracion (sesion, limitador, almacenamiento)
+    de `downloader`. Lanza una excepcion si el trabajo falla.
+    """
+    url = job["url"].strip()
+    item_filter = job_filter(job)
+    if job["action"] in ("download", "sync"):
+        ok = downloader.download_course(
+            url,
+            item_filter,
+            ignore_history=job["action"] == "sync",
+            progress=progress,
+        )
+        if not ok:
+            raise RuntimeError(f"No se pudo descargar el curso: {url}")
+    else:
+        course = Course(
+            url,
+            cookie_manager=downloader.cookie_manager,
+            transport=downloader.transport,
+            rate_limiter=downloader.rate_limiter,
+            parser_pool=downloader.parser_pool,
+            retry_policy=downloader.retry_policy,
+            bandwidth_shaper=downloader.bandwidth_shaper,
+            answer_store=downloader.answer_store,
+            hedge_policy=downloader.hedge_policy,
+            item_index=downloader.item_index,
+            clock=downloader.clock,
+        )
+        course.complete_all_activities(item_filter=item_filter, progress=progress)
+
+
+class JobProgress:
+    """
+    Mide el avance de un trabajo: se pasa como `progress` a `run_job`.
+
+    El total de items se estima a medida que se cargan las secciones: los de las
+    secciones ya vistas, mas el promedio por seccion para las que faltan. El ETA
+    extrapola el ritmo de items por segundo (esperas incluidas).
+
+    Atributos:
+        emit (Callable[[dict], None]): Recibe cada `snapshot`, como mucho una vez
+            cada `interval` segundos.
+        interval (float): Segundos minimos entre dos llamadas a `emit`.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[dict], None],
+        item_filter: Optional[ItemFilter] = None,
+        interval: float = 1.0,
+    ):
+        self.emit = emit
+        self.item_filter = item_filter or ItemFilter()
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self.items_done = 0
+        self.items_failed = 0
+        self.bytes = 0
+        self._section_items: dict[str, int] = {}
+        self._sections_total = None
+        self._emitted_at = 0.0
+        self._lock = threading.Lock()
+
+    def _count_section(self, item: "Item"):
+        section = item.section
+        if section.url in self._section_items:
+            return
+        if self._sections_total is None:
+            sections = section.course.sections
+            self._sections_total = sum(
+                1 for s in sections if self.item_filter.accepts_section(s)
+            )
+        self._section_items[section.url] = sum(
+            1 for i in section.items if self.item_filter.accepts_item(i)
+        )
+
+    def __call__(self, item: "Item", size: Optional[int]):
+        with self._lock:
+            self._count_section(item)
+            if size is None:
+                self.items_failed += 1
+            else:
+                self.items_done += 1
+                self.bytes += size
+            now = time.monotonic()
+            if now - self._emitted_at < self.interval:
+                return
+            self._emitted_at = now
+        self.emit(self.snapshot())
+
+    @property
+    def items_estimated(self) -> Optional[int]:
+        seen = len(self._section_items)
+        if not seen:
+            return None
+        known = sum(self._section_items.values())
+        missing = max(0, (self._sections_total or seen) - seen)
+        return round(known + missing * known / seen)
+
+    def snapshot(self) -> dict:
+        elapsed = time.monotonic() - self.started_at
+        processed = self.items_done + self.items_failed
+        estimated = self.items_estimated
+        eta = None
+        if estimated is not None and processed:
+            eta = max(0, estimated - processed) * elapsed / processed
+        return {
+            "items_done": self.items_done,
+            "items_failed": self.items_failed,
+            "items_estimated": estimated,
+            "bytes": self.bytes,
+            "bytes_per_second": self.bytes / elapsed if elapsed > 0 else 0.0,
+            "elapsed": elapsed,
+            "eta_seconds": eta,
+        }
@@ -0,0 +1,209 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+FORMAT = "%(asctime)s [%(levelname)s] %(name)s%(context)s - %(message)s"
+DATEFMT = "%d-%m-%Y %I:%M:%S %p"
+
+# Campos de contexto que se agregan a cada registro.
+CONTEXT_FIELDS = ("course", "section", "item")
+
+# Niveles por subsistema, p. ej. "pyalura.base=DEBUG,pyalura.question=WARNING".
+LEVELS_ENV = "PYALURA_LOG_LEVELS"
+
+# Primera linea del log de cada proceso.
+BANNER = """
+    =====================
+     Incio del programa
+    ====================="""
+
+_context = contextvars.ContextVar("pyalura_log_context", default={})
+_queue_handler: Optional["LazyQueueHandler"] = None
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Agrega `course`, `section` o `item` a los registros emitidos dentro del bloque.
+
+    Los contextos se anidan: un `item` dentro de un `course` conserva el curso.
+    """
+    current = _context.get()
+    token = _context.set(
+        {**current, **{k: v for k, v in fields.items() if v is not None}}
+    )
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copia el contexto actual (`log_context`) a los atributos del registro."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            setattr(record, field, context.get(field))
+        record.context = (
+            " [" + " ".join(f"{k}={v}" for k, v in context.items()) + "]"
+            if context
+            else ""
+        )
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por linea, con los campos de contexto que haya."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, DATEFMT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    `QueueHandler` que arranca el hilo de escritura (`QueueListener`) con el
+    primer registro del proceso, no al configurarse: importar pyalura no crea
+    hilos, y un proceso hijo creado con `fork`, que no hereda el hilo, arranca
+    el suyo.
+
+    Atributos:
+        handlers (list): Handlers donde escribe el hilo.
+        listener (QueueListener | None): El hilo, si ya arranco.
+    """
+
+    def __init__(self, handlers: list[logging.Handler]):
+        super().__init__(queue.SimpleQueue())
+        self.handlers = handlers
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self._pid = None
+
+    def emit(self, record: logging.LogRecord):
+        # `Handler.handle` llama a `emit` con el lock del handler tomado.
+        if self._pid != os.getpid():
+            self._start()
+        super().emit(record)
+
+    def _start(self):
+        self._pid = os.getpid()
+        self.queue = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *self.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        if logging.getLogger("pyalura").isEnabledFor(logging.INFO):
+            banner = logging.makeLogRecord(
+                {
+                    "name": "pyalura",
+                    "levelno": logging.INFO,
+                    "levelname": "INFO",
+                    "msg": BANNER,
+                    "context": "",
+                }
+            )
+            super().emit(banner)
+
+    def stop(self):
+        """Vacia la cola y detiene el hilo, si lo arranco este proceso."""
+        with self.lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self._pid = None
+
+
+def parse_levels(value: str) -> dict[str, str]:
+    """Convierte "logger=NIVEL,logger=NIVEL" en un diccionario."""
+    levels = {}
+    for part in value.split(","):
+        if "=" in part:
+            name, level = part.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(
+    level: Union[int, str] = logging.INFO,
+    log_file: Optional[Union[str, Path]] = "alura.log",
+    console: bool = True,
+    levels: Optional[dict[str, Union[int, str]]] = None,
+    structured: bool = False,
+) -> LazyQueueHandler:
+    """
+    Configura el logging de pyalura sin bloquear a quien registra.
+
+    Los registros pasan por una cola (`QueueHandler`) y un hilo aparte
+    (`QueueListener`) los escribe en el archivo y la consola, asi que escribir
+    en disco no frena las descargas. El hilo y el archivo se crean con el primer
+    registro (ver `LazyQueueHandler`). Llamarla de nuevo reemplaza la
+    configuracion anterior.
+
+    Args:
+        level (int | str): Nivel general.
+        log_file (str | Path, opcional): Archivo de log; None para no escribirlo.
+        console (bool): Si es True tambien se escribe en la consola.
+        levels (dict, opcional): Niveles por subsistema (nombre de logger), que se
+            suman a los de la variable de entorno `PYALURA_LOG_LEVELS`.
+        structured (bool): Si es True, cada registro es una linea JSON.
+
+    Returns:
+        LazyQueueHandler: El handler instalado en el logger raiz.
+    """
+    global _queue_handler
+    stop_logging()
+
+    formatter = JsonFormatter() if structured else logging.Formatter(FORMAT, DATEFMT)
+    handlers = []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8", delay=True))
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    _queue_handler = LazyQueueHandler(handlers)
+    # El filtro corre en el hilo que registra, donde esta el contexto.
+    _queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    all_levels = parse_levels(os.environ.get(LEVELS_ENV, ""))
+    all_levels.update(levels or {})
+    for name, subsystem_level in all_levels.items():
+        logging.getLogger(name).setLevel(subsystem_level)
+    return _queue_handler
+
+
+def stop_logging():
+    """Vacia la cola, detiene el hilo de escritura y cierra los archivos."""
+    global _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler.stop()
+        for handler in _queue_handler.handlers:
+            handler.close()
+        _queue_handler = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,141 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Nombre por defecto del manifiesto dentro de la carpeta de descargas.
+MANIFEST_NAME = "manifest.sqlite3"
+
+
+class Manifest:
+    """
+    Registro (SQLite) del tamaño y el hash SHA-256 de cada archivo descargado.
+
+    El `Downloader` lo llena mientras escribe, calculando el hash sobre los mismos
+    bloques que guarda, sin releer nada. `pyalura.audit` lo usa despues para
+    encontrar archivos truncados o corruptos.
+
+    Atributos:
+        path (Path): Ruta del archivo SQLite.
+    """
+
+    def __init__(self, path: Union[str, Path] = MANIFEST_NAME):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                source_url TEXT,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                content_length INTEGER,
+                updated_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS files_source_url ON files (source_url)"
+        )
+        # Calidad elegida para cada video. Va aparte de `files` porque debe
+        # sobrevivir a `remove` (la auditoria borra los registros rotos).
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS video_qualities (
+                url TEXT PRIMARY KEY,
+                quality TEXT NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        keys = ("key", "url", "source_url", "size", "sha256", "content_length")
+        return dict(zip(keys, row))
+
+    def get(self, key: str) -> Optional[dict]:
+        """Devuelve el registro de una clave del almacenamiento, o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, url, source_url, size, sha256, content_length "
+                "FROM files WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def find_source(self, source_url: str) -> Optional[dict]:
+        """Devuelve un registro descargado desde `source_url`, o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, url, source_url, size, sha256, content_length "
+                "FROM files WHERE source_url = ? LIMIT 1",
+                (source_url,),
+            ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def put(
+        self,
+        key: str,
+        size: int,
+        sha256: str,
+        url: Optional[str] = None,
+        source_url: Optional[str] = None,
+        content_length: Optional[int] = None,
+    ):
+        """
+        Registra un archivo recien escrito.
+
+        Args:
+            key (str): Clave en el almacenamiento del `Downloader`.
+            size (int): Bytes escritos.
+            sha256 (str): Hash de lo escrito.
+            url (str, opcional): URL del item, para volver a descargarlo.
+            source_url (str, opcional): URL de la que salieron los bytes (el mp4).
+            content_length (int, opcional): `Content-Length` que informo el servidor.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, source_url, size, sha256, content_length, time.time()),
+            )
+            self._conn.commit()
+
+    def get_quality(self, url: str) -> Optional[str]:
+        """Calidad con la que se descargo el video del item `url`, o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT quality FROM video_qualities WHERE url = ?", (url,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set_quality(self, url: str, quality: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_qualities VALUES (?, ?)", (url, quality)
+            )
+            self._conn.commit()
+
+    def remove(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def entries(self) -> list[dict]:
+        """Todos los registros del manifiesto."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, url, source_url, size, sha256, content_length "
+                "FROM files ORDER BY key"
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,76 @@
+import logging
+import struct
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Cajas de MP4 que contienen otras cajas y que hay que recorrer para llegar a mvhd.
+CONTAINER_BOXES = {b"moov"}
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None):
+    """Recorre las cajas de un MP4: devuelve (tipo, inicio, inicio del contenido, fin)."""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack(">I4s", data[offset : offset + 8])
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                return
+            size = struct.unpack(">Q", data[offset + 8 : offset + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header:
+            return
+        yield box_type, offset, offset + header, offset + size
+        offset += size
+
+
+def next_box_offset(data: bytes) -> Optional[int]:
+    """
+    Posicion, relativa a `data`, desde la que conviene seguir leyendo para llegar a
+    `moov`: la de `moov` si empieza en `data`, o la de la primera caja que no cabe
+    en `data`. Devuelve None si no hay mas cajas.
+    """
+    for box_type, box_start, _, box_end in _iter_boxes(data):
+        if box_type == b"moov":
+            return box_start
+        if box_end > len(data):
+            return box_end
+    return None
+
+
+def parse_mp4_duration(data: bytes) -> Optional[float]:
+    """
+    Extrae la duracion en segundos de la caja `mvhd` de un MP4.
+
+    `data` puede ser solo una parte del archivo (por ejemplo, los primeros KiB
+    pedidos con una cabecera Range) siempre que incluya el comienzo de `moov`.
+
+    Returns:
+        float | None: Duracion en segundos, o None si no se encontro `mvhd`.
+    """
+
+    def search(start: int, end: int) -> Optional[float]:
+        for box_type, _, content_start, box_end in _iter_boxes(data, start, end):
+            box_end = min(box_end, len(data))
+            if box_type == b"mvhd":
+                version = data[content_start]
+                if version == 1:
+                    fields = data[content_start + 20 : content_start + 32]
+                    if len(fields) < 12:
+                        return None
+                    timescale, duration = struct.unpack(">IQ", fields)
+                else:
+                    fields = data[content_start + 12 : content_start + 20]
+                    if len(fields) < 8:
+                        return None
+                    timescale, duration = struct.unpack(">II", fields)
+                return duration / timescale if timescale else None
+            if box_type in CONTAINER_BOXES:
+                return search(content_start, box_end)
+        return None
+
+    return search(0, len(data))
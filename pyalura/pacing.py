@@ -0,0 +1,100 @@
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from pyalura.clock import SYSTEM_CLOCK, Clock
+
+if TYPE_CHECKING:
+    from pyalura.item import Item
+
+logger = logging.getLogger(__name__)
+
+
+class PacingPolicy:
+    """
+    Decide cuanto esperar despues de completar cada actividad.
+
+    Para los videos usa su duracion real multiplicada por `video_fraction` y
+    acotada entre `min_video_seconds` y `max_video_seconds`; si no se conoce la
+    duracion, espera `default_video_seconds`. El resto de actividades esperan un
+    tiempo fijo.
+
+    Atributos:
+        video_fraction (float): Fraccion de la duracion del video que se espera.
+        min_video_seconds (float): Espera minima tras un video.
+        max_video_seconds (float): Espera maxima tras un video.
+        default_video_seconds (float): Espera si no se conoce la duracion.
+        question_seconds (float): Espera tras responder una pregunta.
+        document_seconds (float): Espera tras el resto de actividades.
+    """
+
+    def __init__(
+        self,
+        video_fraction: float = 1.0,
+        min_video_seconds: float = 15,
+        max_video_seconds: float = 1200,
+        default_video_seconds: float = 300,
+        question_seconds: float = 60,
+        document_seconds: float = 60,
+    ):
+        self.video_fraction = video_fraction
+        self.min_video_seconds = min_video_seconds
+        self.max_video_seconds = max_video_seconds
+        self.default_video_seconds = default_video_seconds
+        self.question_seconds = question_seconds
+        self.document_seconds = document_seconds
+
+    def wait_for(self, item: "Item", duration: Optional[float] = None) -> float:
+        """Segundos a esperar despues de completar `item`."""
+        if item.is_question:
+            return self.question_seconds
+        if not item.is_video:
+            return self.document_seconds
+        if duration is None:
+            return self.default_video_seconds
+        wait = duration * self.video_fraction
+        return min(self.max_video_seconds, max(self.min_video_seconds, wait))
+
+
+class PacingScheduler:
+    """
+    Programa cuando puede ejecutarse la siguiente actividad.
+
+    A diferencia de `utils.sleep_progress`, la espera no bloquea justo despues de
+    cada actividad: `defer` solo fija el instante minimo de la siguiente, y el
+    trabajo que se hace mientras tanto (pedir la siguiente seccion, leer la
+    duracion del siguiente video) se descuenta de la espera en `wait`.
+
+    Atributos:
+        clock (Clock): Reloj con el que se mide y se espera.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SYSTEM_CLOCK
+        self._ready_at = 0.0
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self._ready_at - self.clock.monotonic())
+
+    def defer(self, seconds: float):
+        """La siguiente actividad no podra ejecutarse antes de `seconds` segundos."""
+        self._ready_at = max(self._ready_at, self.clock.monotonic() + seconds)
+
+    def wait(self):
+        """Espera hasta que se pueda ejecutar la siguiente actividad."""
+        remaining = self.remaining
+        if remaining <= 0:
+            return
+        logger.info(
+            "Esperando %d minutos y %d segundos antes de continuar...",
+            int(remaining) // 60,
+            int(remaining) % 60,
+        )
+        while True:
+            remaining = self.remaining
+            if remaining <= 0:
+                return
+            # Se informa una vez por minuto; el resto del tiempo se duerme.
+            self.clock.sleep(min(remaining, 60))
+            if self.remaining >= 60:
+                logger.info("Faltan %d minutos...", int(self.remaining) // 60)
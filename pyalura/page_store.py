@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # dependencia opcional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Nombre por defecto del archivo de paginas dentro de la carpeta de descargas.
+PAGE_STORE_NAME = "pages.sqlite3"
+
+
+def compress(data: bytes) -> tuple[str, bytes]:
+    """Comprime con zstd si esta instalado `zstandard`; si no, con zlib."""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "zlib", zlib.compress(data, 9)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Esta pagina esta en zstd: instala 'zstandard'")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Compresion desconocida: {codec}")
+
+
+class PageStore:
+    """
+    Archivo (SQLite) con el HTML original de las paginas de los items.
+
+    El `Downloader` guarda aqui cada pagina que convierte a Markdown, para poder
+    volver a generar el Markdown sin pedir nada a la plataforma (ver
+    `pyalura.rerender`). Las paginas se guardan comprimidas y por su hash
+    SHA-256, asi que una misma pagina descargada varias veces ocupa una sola vez.
+
+    Atributos:
+        path (Path): Ruta del archivo SQLite.
+    """
+
+    def __init__(self, path: Union[str, Path] = PAGE_STORE_NAME):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )
+            """)
+        # Pagina de cada clave del almacenamiento (el Markdown que sale de ella).
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                is_question INTEGER NOT NULL,
+                sha256 TEXT NOT NULL REFERENCES blobs (sha256),
+                updated_at REAL NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def put(self, key: str, url: str, raw: bytes, is_question: bool = False) -> str:
+        """
+        Guarda la pagina de la que sale `key`.
+
+        Args:
+            key (str): Clave del Markdown en el almacenamiento del `Downloader`.
+            url (str): URL del item.
+            raw (bytes): HTML de la pagina, tal como llego.
+            is_question (bool): Si el item es una pregunta.
+
+        Returns:
+            str: SHA-256 de la pagina.
+        """
+        sha256 = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        if known is None:
+            # La compresion va fuera del lock: es lo mas lento.
+            codec, data = compress(raw)
+        with self._lock:
+            if known is None:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?)",
+                    (sha256, codec, len(raw), data),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (key, url, int(is_question), sha256, time.time()),
+            )
+            self._conn.commit()
+        return sha256
+
+    def get_compressed(self, key: str) -> Optional[tuple[str, bytes]]:
+        """`(codec, datos)` de la pagina de `key`, sin descomprimir, o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.codec, b.data FROM pages p JOIN blobs b USING (sha256) "
+                "WHERE p.key = ?",
+                (key,),
+            ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """HTML de la pagina de la que sale `key`, o None."""
+        row = self.get_compressed(key)
+        return decompress(*row) if row is not None else None
+
+    def pages(self, prefix: str = "") -> list[dict]:
+        """`key`, `url` e `is_question` de las paginas cuyas claves empiezan por `prefix`."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, url, is_question FROM pages "
+                "WHERE substr(key, 1, ?) = ? ORDER BY key",
+                (len(prefix), prefix),
+            ).fetchall()
+        return [
+            {"key": key, "url": url, "is_question": bool(is_question)}
+            for key, url, is_question in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,291 @@
+"""
+Funciones puras para parsear las paginas de Alura.
+
+Reciben los bytes crudos de la respuesta y devuelven diccionarios y strings
+simples, de modo que se pueden ejecutar tanto en el hilo actual como en otro
+proceso a traves de `ParserPool` sin retener el GIL de los hilos de red.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional, Union
+from urllib.parse import quote, urljoin, urlsplit
+
+import html2text
+from html2text.utils import escape_md
+from lxml import html
+from lxml.html import HtmlElement
+
+from pyalura.question import Answer
+from pyalura.utils import HOST, ArticleType
+
+logger = logging.getLogger(__name__)
+
+
+def _fromstring(raw: Union[bytes, str]) -> "HtmlElement":
+    # Las paginas de Alura se sirven en UTF-8; se fija para no depender de <meta>.
+    if isinstance(raw, bytes):
+        return html.fromstring(raw, parser=html.HTMLParser(encoding="utf-8"))
+    return html.fromstring(raw)
+
+
+def html_to_markdown(html_content: bytes, header: str) -> str:
+    converter = html2text.HTML2Text()
+    # Sin cortar lineas: un corte dentro de un enlace largo parte la URL y
+    # `rewrite_markdown` ya no la encuentra.
+    converter.body_width = 0
+    string = converter.handle(html_content.decode("UTF-8"))
+    return f"# {header}\n\n{string}"
+
+
+# Enlaces de `task-content` que se descargan como adjuntos del item.
+ATTACHMENT_EXTENSIONS = (
+    ".zip",
+    ".rar",
+    ".7z",
+    ".tar",
+    ".gz",
+    ".pdf",
+    ".sql",
+    ".csv",
+    ".xlsx",
+    ".docx",
+    ".pptx",
+)
+
+
+# Caracteres que lxml deja sin escapar en `href` y `src` al serializar HTML.
+LIBXML_URI_SAFE = "@/:=?;#%&,+<>-_.!~*'()[]"
+
+
+def parse_asset_refs(element: "HtmlElement") -> list[dict]:
+    """
+    Extrae las imagenes y los adjuntos (zip, pdf, ...) de un `task-content`.
+
+    Returns:
+        list[dict]: `ref` (la URL tal como aparece en el Markdown de
+            `html_to_markdown`) y `url` (absoluta), sin repetir.
+    """
+    refs = list(element.xpath(".//img/@src"))
+    for href in element.xpath(".//a/@href"):
+        path = urlsplit(href).path.lower()
+        if path.endswith(ATTACHMENT_EXTENSIONS):
+            refs.append(href)
+
+    assets = {}
+    for ref in refs:
+        ref = ref.strip()
+        if not ref or ref.startswith("data:"):
+            continue
+        # Asi queda la URL en el Markdown: lxml la escapa al serializar el HTML
+        # (espacios, acentos) y html2text escapa los caracteres de Markdown.
+        ref = quote(ref, safe=LIBXML_URI_SAFE)
+        assets.setdefault(ref, {"ref": escape_md(ref), "url": urljoin(HOST, ref)})
+    return list(assets.values())
+
+
+def parse_items_data(root: "HtmlElement") -> list[dict]:
+    """
+    Extrae los items del menu lateral de una pagina de seccion.
+
+    Returns:
+        list[dict]: Diccionarios con `url`, `title`, `index`, `type` y `is_marked_as_seen`.
+    """
+    items = []
+    for articulo in root.xpath(".//ul[@class='task-menu-nav-list']/li"):
+        url = urljoin("https://app.aluracursos.com/", articulo.find(".//a").get("href"))
+        title = articulo.find(".//span[@title]").text.strip()
+        index = articulo.find(
+            ".//span[@class='task-menu-nav-item-number']"
+        ).text.strip()
+        type_enum = getattr(
+            ArticleType, articulo.find(".//use").get("xlink:href").split("#")[1]
+        )
+        is_seen = "task-menu-nav-item-svg--done" in articulo.find(".//svg").get("class")
+
+        items.append(
+            {
+                "url": url,
+                "title": title,
+                "index": index,
+                "type": type_enum,
+                "is_marked_as_seen": is_seen,
+            }
+        )
+    return items
+
+
+def parse_sections_data(root: "HtmlElement") -> list[dict]:
+    """Extrae el nombre y la URL de cada seccion del `<select>` de secciones."""
+    select_element = root.find(".//select[@class='task-menu-sections-select']")
+    url_raw = select_element.get("onchange").split("=")[1].strip(";'")
+    content = []
+    for option_element in select_element.xpath(".//option"):
+        value = option_element.get("value")
+        name = option_element.text.strip()
+        url_relative = url_raw.replace("'+this.value+'", value)
+        content.append({"name": name, "url": urljoin(HOST, url_relative)})
+    return content
+
+
+def parse_section_page(raw: bytes) -> list[dict]:
+    """Parsea la pagina de una seccion y devuelve los datos de sus items."""
+    return parse_items_data(_fromstring(raw))
+
+
+def parse_course_page(raw: bytes) -> dict:
+    """
+    Parsea la pagina interna del curso (la que tiene el selector de secciones).
+
+    Returns:
+        dict: `page_title` (str) y `sections` (list[dict]).
+    """
+    root = _fromstring(raw)
+    return {
+        "page_title": root.find(".//title").text.strip(),
+        "sections": parse_sections_data(root),
+    }
+
+
+def parse_landing_page(raw: bytes) -> dict:
+    """
+    Parsea la pagina publica del curso (`/course/<slug>`).
+
+    Returns:
+        dict: Un diccionario con los campos:
+            - `logged_in` (bool): Si la pagina muestra el menu del usuario.
+            - `subcategory` (str o None): Nombre de la subcategoria del curso.
+            - `access_url` (str o None): URL del boton para entrar al curso.
+            - `needs_evaluation` (bool): Si el curso pide una evaluacion manual.
+            - `visible` (bool): Si el usuario puede ver el curso.
+    """
+    root = _fromstring(raw)
+    category_link = root.find(
+        ".//a[@class='course-header-banner-breadcrumb__category-link']"
+    )
+    access_link = root.find(".//section[@class='course']//div[@class='container']/a")
+    has_try_to_enroll = root.find(".//a[@id='tryToEnroll']") is not None
+    has_data_workload = bool(root.xpath(".//a[@id='tryToEnroll' and @data-workload]"))
+    return {
+        "logged_in": root.find(".//nav[@id='profileList']") is not None,
+        "subcategory": (
+            category_link.text.strip() if category_link is not None else None
+        ),
+        "access_url": (
+            urljoin(HOST, access_link.get("href")) if access_link is not None else None
+        ),
+        "needs_evaluation": root.find(".//form[@id='evaluationForm']") is not None,
+        "visible": not has_try_to_enroll or has_data_workload,
+    }
+
+
+def parse_item_page(raw: bytes) -> dict:
+    """
+    Parsea la pagina de un item y devuelve los datos de su seccion.
+
+    Returns:
+        dict: `section_name` (str, la seccion seleccionada), `sections`
+            (ver `parse_sections_data`) e `items` (ver `parse_items_data`).
+    """
+    root = _fromstring(raw)
+    section_name = root.find(
+        ".//select[@class='task-menu-sections-select']//option[@selected]"
+    ).text.strip()
+    return {
+        "section_name": section_name,
+        "sections": parse_sections_data(root),
+        "items": parse_items_data(root),
+    }
+
+
+def parse_catalog_page(raw: bytes, page_url: str) -> dict:
+    """Parsea una pagina de categoria o formacion; ver `CatalogCrawler.parse_page`."""
+    # Se importa aqui para que los procesos del pool no carguen `Base` al arrancar.
+    from pyalura.catalog import CatalogCrawler
+
+    return CatalogCrawler.parse_page(_fromstring(raw), page_url)
+
+
+def parse_task_page(raw: bytes, with_answers: bool = False) -> dict:
+    """
+    Parsea la pagina de un item y convierte su contenido a Markdown.
+
+    Args:
+        raw (bytes): Cuerpo de la respuesta.
+        with_answers (bool): Si es True tambien extrae las alternativas de la pregunta.
+
+    Returns:
+        dict: `content` (str o None si la pagina no tiene `task-content`),
+            `answers` (list[dict] o None) y `assets` (ver `parse_asset_refs`).
+    """
+    root = _fromstring(raw)
+
+    element = root.find(".//section[@id='task-content']")
+    if element is None:
+        markdown_content = None
+        assets = []
+    else:
+        header = root.find(".//span[@class='task-body-header-title-text']").text.strip()
+        markdown_content = html_to_markdown(html.tostring(element), header)
+        assets = parse_asset_refs(element)
+
+    answers = Answer.parse_from_html(root) if with_answers else None
+    return {"content": markdown_content, "answers": answers, "assets": assets}
+
+
+class ParserPool:
+    """
+    Ejecuta las funciones de parseo en un pool de procesos.
+
+    Se crea perezosamente en la primera llamada y se puede compartir entre todos
+    los cursos y los hilos de una descarga. Con `max_workers=0` las funciones se ejecutan en
+    el hilo que las llama, sin pool.
+
+    Atributos:
+        max_workers (int): Cantidad de procesos del pool. Por defecto, uno por nucleo.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self._executor: Union[ProcessPoolExecutor, None] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        executor = self._executor
+        if executor is not None:
+            return executor
+        with self._lock:
+            if self._executor is None:
+                logger.debug(
+                    "Iniciando pool de parseo con %d procesos", self.max_workers
+                )
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def submit(self, func: Callable, *args) -> Future:
+        if self.max_workers == 0:
+            future = Future()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._get_executor().submit(func, *args)
+
+    def run(self, func: Callable, *args):
+        """Ejecuta `func(*args)` en el pool y espera el resultado."""
+        return self.submit(func, *args).result()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -0,0 +1,163 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from pyalura.item import Item
+
+logger = logging.getLogger(__name__)
+
+
+class QualityPolicy:
+    """
+    Elige la calidad de cada video segun un presupuesto de bytes, el rendimiento
+    medido de la conexion o una tasa de bits maxima.
+
+    Las calidades se prueban de mayor a menor y se elige la primera que cumple
+    todos los limites; si ninguna los cumple, la menor. El tamaño de cada calidad
+    se pide con un HEAD solo cuando hay algun limite que lo necesita, y se deja
+    de probar en cuanto una calidad cabe.
+
+    El tamaño de la calidad elegida se aparta del presupuesto hasta que la
+    descarga termina (`record`) o falla (`release`), asi varios hilos que eligen
+    a la vez no se pasan del presupuesto.
+
+    Atributos:
+        byte_budget (int, opcional): Bytes en total para los videos de esta
+            ejecucion. Cada descarga descuenta lo que ocupo.
+        max_seconds_per_video (float, opcional): Tiempo maximo de descarga de un
+            video, estimado con el rendimiento medido en las descargas anteriores.
+        max_bitrate (float, opcional): Bits por segundo maximos del video (tamaño
+            entre duracion). Necesita la duracion (`VideoItem.get_duration`).
+        smoothing (float): Peso de la ultima descarga en el rendimiento medido.
+        spent (int): Bytes de video descargados hasta ahora.
+        reserved (int): Bytes apartados para las descargas en curso.
+        throughput (float, opcional): Rendimiento medido, en bytes por segundo.
+    """
+
+    def __init__(
+        self,
+        byte_budget: Optional[int] = None,
+        max_seconds_per_video: Optional[float] = None,
+        max_bitrate: Optional[float] = None,
+        smoothing: float = 0.3,
+    ):
+        self.byte_budget = byte_budget
+        self.max_seconds_per_video = max_seconds_per_video
+        self.max_bitrate = max_bitrate
+        self.smoothing = smoothing
+        self.spent = 0
+        self.reserved = 0
+        self.throughput = None
+        self._reservations = {}
+        self._lock = threading.Lock()
+
+    @property
+    def has_limits(self) -> bool:
+        return any(
+            limit is not None
+            for limit in (
+                self.byte_budget,
+                self.max_seconds_per_video,
+                self.max_bitrate,
+            )
+        )
+
+    def choose(
+        self,
+        item: "Item",
+        videos: dict,
+        qualities: list[str],
+        previous: Optional[str] = None,
+    ) -> str:
+        """
+        Elige la calidad de un video.
+
+        Args:
+            item (Item): El video; se usa para los HEAD y para la duracion.
+            videos (dict): Videos por calidad, como los devuelve `VideoItem.get_content`.
+            qualities (list[str]): Calidades permitidas, de mayor a menor
+                (ver `ItemFilter.video_qualities`).
+            previous (str, opcional): Calidad elegida en una ejecucion anterior; si
+                sigue permitida y cabe en los limites se repite, para que la copia
+                sea consistente.
+        """
+        if not self.has_limits:
+            return previous if previous in qualities else qualities[0]
+
+        sizes = {}
+        if previous in qualities:
+            size = sizes[previous] = item.get_resource_size(videos[previous]["mp4"])
+            if self._fits(item, size) and self._reserve(item, size):
+                logger.debug("Calidad de %s repetida: %s", item.title, previous)
+                return previous
+            logger.info(
+                "La calidad anterior de %s (%s) ya no cabe en los limites",
+                item.title,
+                previous,
+            )
+
+        for quality in qualities:
+            if quality == previous:
+                continue
+            size = sizes[quality] = item.get_resource_size(videos[quality]["mp4"])
+            if self._fits(item, size) and self._reserve(item, size):
+                logger.debug("Calidad de %s: %s (%s bytes)", item.title, quality, size)
+                return quality
+        logger.info("Ninguna calidad cabe en los limites, se usa %s", qualities[-1])
+        self._reserve(item, sizes[qualities[-1]], force=True)
+        return qualities[-1]
+
+    def _reserve(self, item: "Item", size: Optional[int], force: bool = False) -> bool:
+        """Aparta `size` bytes del presupuesto para `item`, si caben (o si `force`)."""
+        with self._lock:
+            if (
+                not force
+                and self.byte_budget is not None
+                and size is not None
+                and self.spent + self.reserved + size > self.byte_budget
+            ):
+                return False
+            self.reserved += size or 0
+            self._reservations[item.url] = size or 0
+            return True
+
+    def _fits(self, item: "Item", size: Optional[int]) -> bool:
+        """Limites de tiempo y tasa de bits; el presupuesto lo mira `_reserve`."""
+        if size is None:
+            # Sin tamaño no se puede comparar: se acepta.
+            return True
+        with self._lock:
+            throughput = self.throughput
+        if (
+            self.max_seconds_per_video is not None
+            and throughput
+            and size / throughput > self.max_seconds_per_video
+        ):
+            return False
+        if self.max_bitrate is not None:
+            duration = item.get_duration()
+            if duration and size * 8 / duration > self.max_bitrate:
+                return False
+        return True
+
+    def release(self, item: "Item"):
+        """Devuelve al presupuesto lo apartado para `item` (p. ej. si su descarga fallo)."""
+        with self._lock:
+            self.reserved -= self._reservations.pop(item.url, 0)
+
+    def record(self, size: int, seconds: float, item: Optional["Item"] = None):
+        """
+        Registra una descarga terminada: descuenta el presupuesto, libera lo
+        apartado para `item` y mide el rendimiento.
+        """
+        with self._lock:
+            if item is not None:
+                self.reserved -= self._reservations.pop(item.url, 0)
+            self.spent += size
+            if seconds > 0 and size > 0:
+                rate = size / seconds
+                if self.throughput is None:
+                    self.throughput = rate
+                else:
+                    self.throughput += self.smoothing * (rate - self.throughput)
@@ -1,5 +1,5 @@
 import logging
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Optional, cast
 
 import html2text
 from lxml import html
@@ -12,6 +12,16 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def choice_type_for(article_type: utils.ArticleType) -> str:
+    """Tipo de pregunta que espera el backend para un tipo de item."""
+    if article_type in (
+        utils.ArticleType.SINGLE_CHOICE,
+        utils.ArticleType.PRACTICE_CLASS_CONTENT,
+    ):
+        return "singlechoice"
+    return "multiplechoice"
+
+
 class Answer:
     """
     Representa una respuesta individual a una pregunta de selección.
@@ -47,18 +57,18 @@ class Answer:
         self.is_correct = is_correct
         self.is_selected = is_selected
         self.choice = choice
-        logging.debug(f"Answer creada con id: {self.id}, text: '{self.text}'")
+        logger.debug("Answer creada con id: %s, text: '%s'", self.id, self.text)
 
     def select(self):
         """Marca la respuesta como seleccionada."""
         self.is_selected = True
-        logging.info(f"Respuesta con id: {self.id} seleccionada.")
+        logger.info("Respuesta con id: %s seleccionada.", self.id)
         return self
 
     def unselect(self):
         """Marca la respuesta como no seleccionada."""
         self.is_selected = False
-        logging.info(f"Respuesta con id: {self.id} deseleccionada.")
+        logger.info("Respuesta con id: %s deseleccionada.", self.id)
 
     @staticmethod
     def parse_from_html(root) -> list[dict]:
@@ -133,10 +143,17 @@ class Question:
         parent (Item): Objeto Item (pregunta) al que pertenece este conjunto de opciones.
     """
 
-    def __init__(self, answers: list["Answer"], item: "Item"):
+    def __init__(
+        self,
+        answers: list["Answer"],
+        item: "Item",
+        choice_type: Optional[str] = None,
+    ):
         self.answers = answers
         self.parent = item
-        logging.debug(f"Question creada para el item con id: {self.parent.taks_id}")
+        # Tipo ya conocido (p. ej. el guardado en el `AnswerStore`).
+        self._choice_type = choice_type
+        logger.debug("Question creada para el item con id: %s", self.parent.taks_id)
 
     def send_answers(self, answers: list["Answer"]):
         """
@@ -148,36 +165,40 @@ class Question:
         Args:
             answers (list[Answer]): Lista de objetos Answer que se van a marcar como seleccionadas.
         """
-        logging.info(
-            f"Enviando respuestas para Question del item: {self.parent.taks_id}"
+        logger.info(
+            "Enviando respuestas para Question del item: %s", self.parent.taks_id
         )
 
         for answer in self.answers:
             answer.unselect()
-            logging.debug(f"Respuesta con id: {answer.id} deseleccionada.")
+            logger.debug("Respuesta con id: %s deseleccionada.", answer.id)
 
         for answer in answers:
             answer.is_selected = True
-            logging.debug(f"Respuesta con id: {answer.id} seleccionada.")
+            logger.debug("Respuesta con id: %s seleccionada.", answer.id)
 
         self.send_selected_answers()
 
-    def send_selected_answers(self):
+    def send_selected_answers(self) -> bool:
         """
         Envía las respuestas seleccionadas al backend.
 
         Construye el payload JSON con las IDs de las respuestas seleccionadas y envía
         una petición POST a la URL correspondiente del backend.
+
+        Returns:
+            bool: True si el backend acepto las respuestas.
         """
-        logging.info(
-            f"Enviando respuestas seleccionadas para Question del item: {self.parent.taks_id}"
+        logger.info(
+            "Enviando respuestas seleccionadas para Question del item: %s",
+            self.parent.taks_id,
         )
         answers = []
         alternatives = []
         for answer in self.answers:
             if answer.is_selected:
                 answers.append(answer)
-                logging.debug(f"Respuesta con id: {answer.id} seleccionada.")
+                logger.debug("Respuesta con id: %s seleccionada.", answer.id)
 
         for answer in answers:
             alternatives.append(answer.id)
@@ -188,15 +209,24 @@ class Question:
         }
 
         section_index = self.parent.section.index.lstrip("0")
-        choice_type = "singlechoice" if self.is_single_question else "multiplechoice"
+        choice_type = self.choice_type
         course_url = self.parent.section.course.url_base
         url = f"{course_url}/section/{section_index}/{choice_type}/answer"
 
-        logging.debug(f"URL para enviar las respuestas: {url}, data: {json_data}")
-        self.parent._make_request(url, method="POST", json=json_data)
-        logging.info(
-            f"Respuestas enviadas correctamente para Question del item: {self.parent.taks_id}"
+        logger.debug("URL para enviar las respuestas: %s, data: %s", url, json_data)
+        response = self.parent._make_request(url, method="POST", json=json_data)
+        if not response.ok:
+            logger.warning(
+                "El backend rechazo las respuestas del item %s: %s",
+                self.parent.taks_id,
+                response.status_code,
+            )
+            return False
+        logger.info(
+            "Respuestas enviadas correctamente para Question del item: %s",
+            self.parent.taks_id,
         )
+        return True
 
     def get_selected_answers(self) -> list["Answer"]:
         """
@@ -206,9 +236,12 @@ class Question:
             list[Answer]: Lista de objetos Answer que están seleccionados.
         """
         selected_answers = [answer for answer in self.answers if answer.is_selected]
-        logging.debug(
-            f"Respuestas seleccionadas obtenidas: {[answer.id for answer in selected_answers]} para Question del item: {self.parent.taks_id}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Respuestas seleccionadas obtenidas: %s para Question del item: %s",
+                [answer.id for answer in selected_answers],
+                self.parent.taks_id,
+            )
         return selected_answers
 
     def resolve(self) -> bool:
@@ -216,13 +249,20 @@ class Question:
             for answer in self.answers:
                 if answer.is_correct:
                     answer.select()
-            self.send_selected_answers()
-            return True
+            return self.send_selected_answers()
         logger.info(
-            f"La pregunta {self.parent.taks_id} no tiene respuestas. No se puede resolver."
+            "La pregunta %s no tiene respuestas. No se puede resolver.",
+            self.parent.taks_id,
         )
         return False
 
+    @property
+    def choice_type(self) -> str:
+        """Tipo de pregunta como lo espera el backend: 'singlechoice' o 'multiplechoice'."""
+        if self._choice_type is not None:
+            return self._choice_type
+        return "singlechoice" if self.is_single_question else "multiplechoice"
+
     @property
     def is_single_question(self) -> bool:
         """
@@ -231,12 +271,11 @@ class Question:
         Returns:
             bool: True si el tipo es de opción única, False de lo contrario.
         """
-        is_single = (
-            self.parent.type == utils.ArticleType.SINGLE_CHOICE
-            or self.parent.type == utils.ArticleType.PRACTICE_CLASS_CONTENT
-        )
-        logging.debug(
-            f"Question del item: {self.parent.taks_id} es de tipo singlechoice: {is_single}"
+        is_single = choice_type_for(self.parent.type) == "singlechoice"
+        logger.debug(
+            "Question del item: %s es de tipo singlechoice: %s",
+            self.parent.taks_id,
+            is_single,
         )
         return is_single
 
@@ -249,7 +288,9 @@ class Question:
             bool: True si el tipo es de opción múltiple, False de lo contrario.
         """
         is_multiple = self.parent.type == utils.ArticleType.MULTIPLE_CHOICE
-        logging.debug(
-            f"Question del item: {self.parent.taks_id} es de tipo multiplechoice: {is_multiple}"
+        logger.debug(
+            "Question del item: %s es de tipo multiplechoice: %s",
+            self.parent.taks_id,
+            is_multiple,
         )
         return is_multiple
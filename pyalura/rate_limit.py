@@ -0,0 +1,206 @@
+import logging
+import threading
+from typing import Optional
+
+from pyalura.clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Limita la cantidad de peticiones por segundo que se hacen a la plataforma.
+
+    Una misma instancia se comparte entre todos los objetos (Course, Section, Item,
+    CatalogCrawler, ...) y entre hilos, de modo que el limite es global para todos
+    ellos. Implementa un 'token bucket': se permiten rafagas de hasta `burst`
+    peticiones y luego se reparte a `requests_per_second`.
+
+    Atributos:
+        requests_per_second (float): Peticiones permitidas por segundo.
+        burst (int): Cantidad maxima de peticiones que se pueden hacer de golpe.
+        clock (Clock): Reloj con el que se mide y se espera.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 2.0,
+        burst: int = 1,
+        clock: Optional[Clock] = None,
+    ):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second debe ser mayor que 0")
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, int(burst))
+        self.clock = clock or SYSTEM_CLOCK
+        self._tokens = float(self.burst)
+        self._last = self.clock.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last
+        self._last = now
+        self._tokens = min(
+            float(self.burst), self._tokens + elapsed * self.requests_per_second
+        )
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bloquea hasta que haya un token disponible.
+
+        Args:
+            timeout (float, opcional): Tiempo maximo de espera en segundos.
+
+        Returns:
+            bool: True si se obtuvo el token, False si se agoto el tiempo.
+        """
+        deadline = None if timeout is None else self.clock.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = self.clock.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.requests_per_second
+
+            if deadline is not None:
+                remaining = deadline - self.clock.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self.clock.sleep(wait)
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        """El limite por tasa no depende del resultado de la peticion."""
+
+
+class AdaptiveLimiter:
+    """
+    Ajusta la cantidad de peticiones simultaneas segun la respuesta del servidor (AIMD).
+
+    Mientras la latencia y los errores se mantienen sanos, el limite de
+    peticiones en vuelo sube de a poco (+1 por cada `limit` respuestas buenas).
+    Ante un 429, un 5xx, un `Retry-After` o una latencia mayor que
+    `latency_factor` veces la latencia tipica, el limite se reduce a la mitad y,
+    si el servidor lo pidio, se pausa hasta que pase el `Retry-After`.
+
+    El limite se reduce como mucho una vez por ventana (la latencia tipica, o
+    `decrease_window` segundos si todavia no se conoce): las fallas de las
+    peticiones que estaban en vuelo a la vez cuentan como una sola.
+
+    Se usa en el mismo lugar que `RateLimiter` (el argumento `rate_limiter`) y
+    tambien se comparte entre hilos.
+
+    Atributos:
+        limit (float): Limite actual de peticiones en vuelo.
+        min_limit (int): Limite minimo.
+        max_limit (int): Limite maximo.
+        latency_factor (float): Cuantas veces la latencia tipica se considera lenta.
+        decrease_window (float): Ventana entre reducciones sin latencia conocida.
+        clock (Clock): Reloj con el que se miden las pausas y se espera.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_factor: float = 2.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        clock: Optional[Clock] = None,
+        decrease_window: float = 1.0,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_factor = latency_factor
+        self.decrease_window = decrease_window
+        # Un limite por tasa opcional, ademas del limite de concurrencia.
+        self.rate_limiter = rate_limiter
+        self.clock = clock or SYSTEM_CLOCK
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self._paused_until = 0.0
+        self._last_decrease: Optional[float] = None
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else self.clock.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = self.clock.monotonic()
+                paused = self._paused_until - now
+                if paused <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    break
+
+                wait = paused if paused > 0 else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait = remaining if wait is None else min(wait, remaining)
+                self.clock.wait(self._condition, wait)
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return True
+
+    def _decrease(self, reason: str):
+        now = self.clock.monotonic()
+        window = self.latency_ewma or self.decrease_window
+        if self._last_decrease is not None and now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        logger.info(
+            "Reduciendo peticiones simultaneas %.1f -> %.1f (%s)",
+            previous,
+            self.limit,
+            reason,
+        )
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Libera el lugar de una peticion y ajusta el limite con su resultado.
+
+        Args:
+            latency (float, opcional): Segundos hasta recibir la respuesta.
+            status (int, opcional): Codigo HTTP, o None si hubo un error de red.
+            retry_after (float, opcional): Segundos pedidos por `Retry-After`.
+        """
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+
+            if retry_after is not None:
+                self._paused_until = max(
+                    self._paused_until, self.clock.monotonic() + retry_after
+                )
+
+            if status is None or status == 429 or status >= 500:
+                self._decrease(f"estado {status}")
+            elif latency is not None:
+                typical = self.latency_ewma
+                if typical is not None and latency > typical * self.latency_factor:
+                    self._decrease(f"latencia {latency:.2f}s")
+                else:
+                    self.limit = min(
+                        float(self.max_limit), self.limit + 1 / max(self.limit, 1)
+                    )
+                # La latencia tipica se actualiza con todas las respuestas.
+                self.latency_ewma = (
+                    latency if typical is None else typical * 0.9 + latency * 0.1
+                )
+            self._condition.notify_all()
@@ -0,0 +1,272 @@
+"""
+Representacion compacta de los arboles de cursos (curso -> secciones -> items).
+
+Los objetos `Course`, `Section` e `Item` guardan cookies, respuestas y caches en
+su `__dict__`, lo que no escala cuando se tienen decenas de miles de items en
+memoria (por ejemplo, al trabajar con un catalogo completo). `CatalogStore`
+guarda solo los metadatos en columnas (listas y `array`) y entrega vistas
+ligeras con `__slots__` que leen de esas columnas.
+"""
+
+import logging
+import re
+import sys
+from array import array
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from pyalura.utils import ArticleType, extract_base_url
+
+if TYPE_CHECKING:
+    from pyalura.course import Course
+
+logger = logging.getLogger(__name__)
+
+TASK_URL_PATTERN = re.compile(r"/task/(\d+)$")
+
+
+class CatalogStore:
+    """
+    Almacen columnar de cursos, secciones e items.
+
+    Cada entidad es una fila (un entero); las vistas (`CourseView`, `SectionView`,
+    `ItemView`) solo guardan el almacen y el numero de fila. La URL de un item no se
+    guarda: se reconstruye con la URL base del curso y el id de la tarea, salvo que
+    no siga el formato `/task/<id>`.
+    """
+
+    def __init__(self):
+        # Cursos
+        self._course_url: list[str] = []
+        self._course_title: list[str] = []
+        self._course_subcategory: list[Optional[str]] = []
+        self._course_by_url: dict[str, int] = {}
+        self._course_sections = array("I")  # [inicio, fin) de sus secciones
+        # Secciones
+        self._section_course = array("I")
+        self._section_index: list[str] = []
+        self._section_title: list[str] = []
+        self._section_url: list[str] = []
+        self._section_items = array("I")  # [inicio, fin) de sus items
+        # Items
+        self._item_section = array("I")
+        self._item_task_id = array("Q")
+        self._item_index: list[str] = []
+        self._item_title: list[str] = []
+        self._item_type = bytearray()
+        self._item_seen = bytearray()
+        self._item_url_fallback: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_title)
+
+    def add_course_data(
+        self,
+        url: str,
+        title: str,
+        subcategory: Optional[str],
+        sections: list[dict],
+    ) -> "CourseView":
+        """
+        Agrega un curso a partir de datos simples.
+
+        Args:
+            url (str): URL del curso.
+            title (str): Titulo (slug) del curso.
+            subcategory (str, opcional): Subcategoria del curso.
+            sections (list[dict]): Secciones con `name`, `url` e `items`, donde
+                `items` tiene el formato de `parsing.parse_items_data`.
+        """
+        url = extract_base_url(url)
+        row = self._course_by_url.get(url)
+        if row is not None:
+            return CourseView(self, row)
+
+        row = len(self._course_url)
+        self._course_url.append(url)
+        self._course_title.append(title)
+        self._course_subcategory.append(subcategory)
+        self._course_by_url[url] = row
+
+        self._course_sections.append(len(self._section_url))
+        for section in sections:
+            index, section_title = section["name"].split(".", 1)
+            section_row = len(self._section_url)
+            self._section_course.append(row)
+            self._section_index.append(sys.intern(index))
+            self._section_title.append(section_title.strip())
+            self._section_url.append(section["url"])
+            self._section_items.append(len(self._item_title))
+            for item in section.get("items", []):
+                self._add_item(section_row, url, item)
+            self._section_items.append(len(self._item_title))
+        self._course_sections.append(len(self._section_url))
+        return CourseView(self, row)
+
+    def _add_item(self, section_row: int, course_url: str, item: dict):
+        item_row = len(self._item_title)
+        match = TASK_URL_PATTERN.search(item["url"])
+        if match and item["url"] == f"{course_url}/task/{match.group(1)}":
+            self._item_task_id.append(int(match.group(1)))
+        else:
+            self._item_task_id.append(0)
+            self._item_url_fallback[item_row] = item["url"]
+        self._item_section.append(section_row)
+        self._item_index.append(sys.intern(item["index"]))
+        self._item_title.append(item["title"])
+        self._item_type.append(item["type"].value)
+        self._item_seen.append(1 if item["is_marked_as_seen"] else 0)
+
+    def add_course(self, course: "Course") -> "CourseView":
+        """Copia los metadatos de un `Course` ya cargado (hace las peticiones que falten)."""
+        sections = [
+            {
+                "name": f"{section.index}. {section.title}",
+                "url": section.url,
+                "items": [
+                    {
+                        "url": item.url,
+                        "title": item.title,
+                        "index": item.index,
+                        "type": item.type,
+                        "is_marked_as_seen": item.is_marked_as_seen,
+                    }
+                    for item in section.items
+                ],
+            }
+            for section in course.sections
+        ]
+        return self.add_course_data(
+            course.url, course.title, course.subcategory, sections
+        )
+
+    def get_course(self, url: str) -> Optional["CourseView"]:
+        row = self._course_by_url.get(extract_base_url(url))
+        return None if row is None else CourseView(self, row)
+
+    def iter_courses(self) -> Iterator["CourseView"]:
+        for row in range(len(self._course_url)):
+            yield CourseView(self, row)
+
+    def iter_items(self) -> Iterator["ItemView"]:
+        for row in range(len(self._item_title)):
+            yield ItemView(self, row)
+
+
+class CourseView:
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: CatalogStore, row: int):
+        self._store = store
+        self._row = row
+
+    def __repr__(self) -> str:
+        return f"<CourseView {self.url}>"
+
+    @property
+    def url(self) -> str:
+        return self._store._course_url[self._row]
+
+    @property
+    def title(self) -> str:
+        return self._store._course_title[self._row]
+
+    @property
+    def subcategory(self) -> Optional[str]:
+        return self._store._course_subcategory[self._row]
+
+    @property
+    def sections(self) -> list["SectionView"]:
+        start, end = self._store._course_sections[self._row * 2 : self._row * 2 + 2]
+        return [SectionView(self._store, row) for row in range(start, end)]
+
+    def iter_items(self) -> Iterator["ItemView"]:
+        for section in self.sections:
+            yield from section.items
+
+
+class SectionView:
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: CatalogStore, row: int):
+        self._store = store
+        self._row = row
+
+    def __repr__(self) -> str:
+        return f"<SectionView {self.index}. {self.title}>"
+
+    @property
+    def course(self) -> CourseView:
+        return CourseView(self._store, self._store._section_course[self._row])
+
+    @property
+    def index(self) -> str:
+        return self._store._section_index[self._row]
+
+    @property
+    def title(self) -> str:
+        return self._store._section_title[self._row]
+
+    @property
+    def url(self) -> str:
+        return self._store._section_url[self._row]
+
+    @property
+    def items(self) -> list["ItemView"]:
+        start, end = self._store._section_items[self._row * 2 : self._row * 2 + 2]
+        return [ItemView(self._store, row) for row in range(start, end)]
+
+
+class ItemView:
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: CatalogStore, row: int):
+        self._store = store
+        self._row = row
+
+    def __repr__(self) -> str:
+        return f"<ItemView {self.url}>"
+
+    @property
+    def section(self) -> SectionView:
+        return SectionView(self._store, self._store._item_section[self._row])
+
+    @property
+    def course(self) -> CourseView:
+        return self.section.course
+
+    @property
+    def url(self) -> str:
+        store = self._store
+        fallback = store._item_url_fallback.get(self._row)
+        if fallback is not None:
+            return fallback
+        return f"{self.course.url}/task/{store._item_task_id[self._row]}"
+
+    @property
+    def taks_id(self) -> str:
+        task_id = self._store._item_task_id[self._row]
+        return str(task_id) if task_id else self.url.rsplit("/", 1)[-1]
+
+    @property
+    def title(self) -> str:
+        return self._store._item_title[self._row]
+
+    @property
+    def index(self) -> str:
+        return self._store._item_index[self._row]
+
+    @property
+    def type(self) -> ArticleType:
+        return ArticleType(self._store._item_type[self._row])
+
+    @property
+    def is_marked_as_seen(self) -> bool:
+        return bool(self._store._item_seen[self._row])
+
+    @property
+    def is_video(self) -> bool:
+        return self.type == ArticleType.VIDEO
+
+    @property
+    def is_question(self) -> bool:
+        return self.type.is_question
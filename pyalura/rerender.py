@@ -0,0 +1,245 @@
+"""
+Vuelve a generar el Markdown de una carpeta de descargas desde las paginas
+originales que guardo el `Downloader` en un `PageStore`, sin hacer peticiones.
+
+Sirve para aplicar cambios en la conversion a Markdown o en los enlaces a los
+recursos sin volver a descargar (y esperar) cada leccion. El parseo se reparte
+entre los nucleos con un `ParserPool`; la escritura va en el proceso principal.
+De las paginas de preguntas tambien se vuelven a sacar las respuestas correctas,
+para llenar un `AnswerStore` sin conexion.
+
+Uso:
+    python -m pyalura.rerender CARPETA [--storage zip] [--workers 4]
+    python -m pyalura.rerender CARPETA --answers answers.sqlite3
+"""
+
+import argparse
+import collections
+import hashlib
+import logging
+import posixpath
+from pathlib import Path
+from typing import Optional, Union
+
+from pyalura import parsing
+from pyalura.answer_store import AnswerStore
+from pyalura.assets import asset_key, rewrite_markdown
+from pyalura.item_index import task_id_from_url
+from pyalura.manifest import MANIFEST_NAME, Manifest
+from pyalura.page_store import PAGE_STORE_NAME, PageStore, decompress
+from pyalura.parsing import ParserPool
+from pyalura.question import choice_type_for
+from pyalura.storage import STORAGES, Storage, get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def render_page(
+    codec: str, data: bytes, is_question: bool = False, url: Optional[str] = None
+) -> dict:
+    """
+    Convierte una pagina guardada en Markdown. Se ejecuta en el `ParserPool`.
+
+    Returns:
+        dict: `content` (str), `assets` (ver `parsing.parse_asset_refs`) y, si
+            es una pregunta, `answers` (ids de las alternativas correctas) y
+            `choice_type` (None si el menu de la pagina no trae el item).
+    """
+    raw = decompress(codec, data)
+    parsed = parsing.parse_task_page(raw, with_answers=is_question)
+    rendered = {"content": parsed["content"] or "", "assets": parsed["assets"]}
+    if is_question:
+        rendered["answers"] = [a["id"] for a in parsed["answers"] if a["is_correct"]]
+        rendered["choice_type"] = None
+        task_id = task_id_from_url(url) if url else None
+        for item in parsing.parse_section_page(raw):
+            if task_id_from_url(item["url"]) == task_id:
+                rendered["choice_type"] = choice_type_for(item["type"])
+    return rendered
+
+
+def _store_answers(answer_store: AnswerStore, url: str, rendered: dict) -> bool:
+    """Guarda las respuestas de una pregunta; False si no se pudo saber su tipo."""
+    task_id = task_id_from_url(url)
+    choice_type = rendered["choice_type"]
+    if choice_type is None:
+        known = answer_store.get(task_id)
+        if known is None:
+            return False
+        choice_type = known["choice_type"]
+    answer_store.put(task_id, rendered["answers"], choice_type)
+    return True
+
+
+def _localize(storage: Storage, key: str, markdown: str, assets: list[dict]) -> str:
+    """Enlaza los recursos que ya estan descargados; los demas quedan como URL."""
+    course_key = posixpath.dirname(posixpath.dirname(key))
+    local_keys = {}
+    for asset in assets:
+        local = asset_key(course_key, asset["url"])
+        if storage.exists(local):
+            local_keys[asset["ref"]] = local
+    return rewrite_markdown(markdown, local_keys, key)
+
+
+def rerender(
+    storage: Storage,
+    page_store: PageStore,
+    parser_pool: ParserPool,
+    manifest: Optional[Manifest] = None,
+    prefix: str = "",
+    window: Optional[int] = None,
+    answer_store: Optional[AnswerStore] = None,
+) -> dict:
+    """
+    Vuelve a generar el Markdown de las paginas guardadas.
+
+    Args:
+        storage (Storage): Almacenamiento que uso el `Downloader`.
+        page_store (PageStore): Paginas que guardo el `Downloader`.
+        parser_pool (ParserPool): Donde se parsean las paginas.
+        manifest (Manifest, opcional): Si se indica, se actualizan el tamaño y el
+            hash de los archivos reescritos, para que `pyalura.audit` los acepte.
+        prefix (str): Solo las claves que empiezan asi (p. ej. `subcategoria/curso`).
+        window (int, opcional): Paginas en vuelo a la vez; por defecto, cuatro por
+            proceso del pool.
+        answer_store (AnswerStore, opcional): Si se indica, se guardan las
+            respuestas correctas de las preguntas.
+
+    Returns:
+        dict: `pages`, `written`, `unchanged`, `failed` y `answers` (preguntas
+            guardadas en `answer_store`).
+    """
+    window = window or max(1, parser_pool.max_workers) * 4
+    result = {"pages": 0, "written": 0, "unchanged": 0, "failed": 0, "answers": 0}
+    pending = collections.deque()
+
+    def finish():
+        page, future = pending.popleft()
+        try:
+            rendered = future.result()
+        except Exception as e:
+            result["failed"] += 1
+            logger.error("No se pudo generar %s: %s", page["key"], e)
+            return
+        if answer_store is not None and rendered.get("answers"):
+            if _store_answers(answer_store, page["url"], rendered):
+                result["answers"] += 1
+            else:
+                logger.warning("Sin tipo de pregunta, no se guardan: %s", page["key"])
+        markdown = rendered["content"]
+        if rendered["assets"]:
+            markdown = _localize(storage, page["key"], markdown, rendered["assets"])
+        data = markdown.encode("utf-8")
+        if storage.exists(page["key"]) and storage.read_bytes(page["key"]) == data:
+            result["unchanged"] += 1
+            return
+        storage.write_text(page["key"], markdown)
+        if manifest is not None:
+            sha256 = hashlib.sha256(data).hexdigest()
+            manifest.put(page["key"], len(data), sha256, page["url"])
+        result["written"] += 1
+
+    for page in page_store.pages(prefix):
+        compressed = page_store.get_compressed(page["key"])
+        if compressed is None:
+            continue
+        result["pages"] += 1
+        future = parser_pool.submit(
+            render_page, *compressed, page["is_question"], page["url"]
+        )
+        pending.append((page, future))
+        if len(pending) >= window:
+            finish()
+    while pending:
+        finish()
+
+    logger.info(
+        "Markdown regenerado: %d reescritos, %d sin cambios, %d fallidos de %d paginas.",
+        result["written"],
+        result["unchanged"],
+        result["failed"],
+        result["pages"],
+    )
+    return result
+
+
+def rerender_folder(
+    base_folder: Union[str, Path],
+    storage: str = "folder",
+    pages_path: Optional[Union[str, Path]] = None,
+    manifest_path: Optional[Union[str, Path]] = None,
+    max_workers: Optional[int] = None,
+    answers_path: Optional[Union[str, Path]] = None,
+    **kwargs,
+) -> dict:
+    """Vuelve a generar el Markdown de una carpeta de descargas; ver `rerender`."""
+    base_folder = Path(base_folder)
+    pages_path = Path(pages_path or base_folder / PAGE_STORE_NAME)
+    if not pages_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de paginas: {pages_path}")
+    manifest_path = Path(manifest_path or base_folder / MANIFEST_NAME)
+    page_store = PageStore(pages_path)
+    manifest = Manifest(manifest_path) if manifest_path.exists() else None
+    answer_store = AnswerStore(answers_path) if answers_path else None
+    backend = get_storage(storage, base_folder)
+    try:
+        with ParserPool(max_workers) as parser_pool:
+            return rerender(
+                backend,
+                page_store,
+                parser_pool,
+                manifest,
+                answer_store=answer_store,
+                **kwargs,
+            )
+    finally:
+        backend.close()
+        page_store.close()
+        if manifest is not None:
+            manifest.close()
+        if answer_store is not None:
+            answer_store.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pyalura.rerender",
+        description="Vuelve a generar el Markdown desde las paginas guardadas.",
+    )
+    parser.add_argument("base_folder")
+    parser.add_argument("--storage", choices=sorted(STORAGES), default="folder")
+    parser.add_argument("--pages", help=f"Por defecto CARPETA/{PAGE_STORE_NAME}")
+    parser.add_argument("--manifest", help=f"Por defecto CARPETA/{MANIFEST_NAME}")
+    parser.add_argument("--prefix", default="", help="Solo este curso o subcategoria")
+    parser.add_argument(
+        "--answers", help="Base de respuestas donde guardar las de las preguntas"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Procesos de parseo (por defecto, uno por nucleo)"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        result = rerender_folder(
+            args.base_folder,
+            storage=args.storage,
+            pages_path=args.pages,
+            manifest_path=args.manifest,
+            max_workers=args.workers,
+            answers_path=args.answers,
+            prefix=args.prefix,
+        )
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    print(
+        f"{result['written']} reescritos, {result['unchanged']} sin cambios, "
+        f"{result['failed']} fallidos de {result['pages']} paginas"
+    )
+    if args.answers:
+        print(f"{result['answers']} preguntas guardadas en {args.answers}")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+import logging
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+class IncompleteDownloadError(requests.RequestException):
+    """La descarga termino con menos (o mas) bytes de los que anuncio el servidor."""
+
+
+RETRY_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    IncompleteDownloadError,
+)
+
+
+def parse_retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """
+    Devuelve los segundos que pide esperar la cabecera `Retry-After`, o None.
+
+    La cabecera puede venir en segundos o como fecha HTTP.
+    """
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Define cuando y cuanto esperar antes de reintentar una peticion.
+
+    Solo se reintentan los metodos idempotentes (GET y HEAD) ante errores de red
+    o respuestas 429/5xx. La espera crece exponencialmente con 'full jitter' y
+    respeta `Retry-After` cuando el servidor lo envia.
+
+    Atributos:
+        max_retries (int): Reintentos maximos (0 desactiva los reintentos).
+        backoff_base (float): Espera base en segundos.
+        backoff_max (float): Espera maxima en segundos.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        statuses: frozenset = RETRY_STATUSES,
+        methods: frozenset = IDEMPOTENT_METHODS,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.statuses = statuses
+        self.methods = methods
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> bool:
+        if attempt >= self.max_retries or method.upper() not in self.methods:
+            return False
+        if error is not None:
+            return isinstance(error, RETRY_ERRORS)
+        return response is not None and response.status_code in self.statuses
+
+    def delay(
+        self,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        rng: Optional[random.Random] = None,
+    ) -> float:
+        """
+        Segundos a esperar antes del reintento numero `attempt` (empieza en 0).
+
+        `rng` es el generador del 'jitter'; por defecto, el modulo `random`.
+        """
+        retry_after = parse_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return (rng or random).uniform(0, ceiling)
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
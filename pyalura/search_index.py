@@ -0,0 +1,245 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from pyalura.item import Item
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndex:
+    """
+    Indice de busqueda de texto completo (SQLite FTS5) sobre las lecciones descargadas.
+
+    El `Downloader` agrega cada archivo Markdown al indice en cuanto lo escribe, y
+    `update_folder` indexa solo los archivos nuevos o modificados de una carpeta
+    ya descargada, por lo que nunca hace falta reindexar todo.
+
+    Atributos:
+        path (Path): Ruta del archivo SQLite.
+        base_folder (Path, opcional): Carpeta base; las rutas se guardan relativas a ella.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        base_folder: Optional[Union[str, Path]] = None,
+    ):
+        self.path = Path(path)
+        self.base_folder = Path(base_folder) if base_folder else None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                mtime REAL NOT NULL,
+                subcategory TEXT,
+                course TEXT,
+                section TEXT,
+                title TEXT,
+                url TEXT,
+                type TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                title, content, tokenize = 'unicode61 remove_diacritics 2'
+            );
+            """)
+        self._conn.commit()
+
+    def _relative(self, path: Union[str, Path]) -> str:
+        path = Path(path)
+        if self.base_folder is not None:
+            try:
+                path = path.resolve().relative_to(self.base_folder.resolve())
+            except ValueError:
+                pass
+        return path.as_posix()
+
+    def add_document(self, path: Union[str, Path], content: str, metadata: dict):
+        """
+        Agrega o reemplaza un documento del indice.
+
+        Args:
+            path (str | Path): Ruta del archivo Markdown.
+            content (str): Contenido del archivo.
+            metadata (dict): `subcategory`, `course`, `section`, `title`, `url` y `type`.
+        """
+        relative = self._relative(path)
+        mtime = Path(path).stat().st_mtime if Path(path).exists() else 0.0
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM documents WHERE path = ?", (relative,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM documents WHERE id = ?", row)
+            cursor = self._conn.execute(
+                "INSERT INTO documents "
+                "(path, mtime, subcategory, course, section, title, url, type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    relative,
+                    mtime,
+                    metadata.get("subcategory"),
+                    metadata.get("course"),
+                    metadata.get("section"),
+                    metadata.get("title"),
+                    metadata.get("url"),
+                    metadata.get("type"),
+                ),
+            )
+            self._conn.execute(
+                "INSERT INTO documents_fts (rowid, title, content) VALUES (?, ?, ?)",
+                (cursor.lastrowid, metadata.get("title") or "", content),
+            )
+            self._conn.commit()
+
+    def add_item(self, item: "Item", path: Union[str, Path], content: str):
+        """Agrega el Markdown de un Item recien descargado."""
+        course = item.section.course
+        self.add_document(
+            path,
+            content,
+            {
+                "subcategory": course.subcategory,
+                "course": course.title_slug,
+                "section": f"{item.section.index}-{item.section.title_slug}",
+                "title": item.title,
+                "url": item.url,
+                "type": item.type.name,
+            },
+        )
+
+    def remove(self, path: Union[str, Path]):
+        relative = self._relative(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM documents WHERE path = ?", (relative,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM documents WHERE id = ?", row)
+                self._conn.commit()
+
+    def update_folder(self, base_folder: Optional[Union[str, Path]] = None) -> int:
+        """
+        Indexa los `.md` nuevos o modificados de una carpeta y quita los que ya no existen.
+
+        La estructura esperada es la del `Downloader`:
+        `base_folder/subcategoria/curso/seccion/item.md`.
+
+        Returns:
+            int: Cantidad de documentos agregados o actualizados.
+        """
+        base_folder = Path(base_folder) if base_folder else self.base_folder
+        if base_folder is None:
+            raise ValueError("Se necesita la carpeta base para actualizar el indice")
+        if self.base_folder is None:
+            self.base_folder = base_folder
+
+        with self._lock:
+            known = dict(self._conn.execute("SELECT path, mtime FROM documents"))
+
+        updated = 0
+        seen = set()
+        for path in base_folder.rglob("*.md"):
+            relative = self._relative(path)
+            seen.add(relative)
+            mtime = path.stat().st_mtime
+            if known.get(relative) == mtime:
+                continue
+
+            content = path.read_text(encoding="utf-8")
+            first_line = content.split("\n", 1)[0]
+            parts = path.relative_to(base_folder).parts
+            metadata = {
+                "title": first_line.lstrip("# ").strip() or path.stem,
+                "section": parts[-2] if len(parts) >= 2 else None,
+                "course": parts[-3] if len(parts) >= 3 else None,
+                "subcategory": parts[-4] if len(parts) >= 4 else None,
+            }
+            self.add_document(path, content, metadata)
+            updated += 1
+
+        for relative in set(known) - seen:
+            path = base_folder / relative
+            # Los documentos guardados dentro de un archivo de curso (zip o
+            # SQLite) no aparecen como `.md` sueltos.
+            if any(parent.is_file() for parent in path.parents):
+                continue
+            self.remove(path)
+
+        logger.info("Indice de busqueda actualizado: %d documentos.", updated)
+        return updated
+
+    @staticmethod
+    def _to_match(query: str) -> str:
+        # Cada palabra se trata como literal; un '*' final busca por prefijo.
+        terms = []
+        for term in query.split():
+            prefix = term.endswith("*")
+            term = term.rstrip("*").replace('"', '""')
+            if term:
+                terms.append(f'"{term}"*' if prefix else f'"{term}"')
+        return " ".join(terms)
+
+    def search(
+        self, query: str, limit: int = 20, course: Optional[str] = None
+    ) -> list[dict]:
+        """
+        Busca en las lecciones y devuelve los resultados ordenados por relevancia (BM25).
+
+        Args:
+            query (str): Palabras a buscar; todas deben aparecer.
+            limit (int): Cantidad maxima de resultados.
+            course (str, opcional): Restringe la busqueda a un curso (slug).
+
+        Returns:
+            list[dict]: Resultados con `path`, `subcategory`, `course`, `section`,
+                `title`, `url`, `type`, `snippet` y `rank`.
+        """
+        match = self._to_match(query)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT d.path, d.subcategory, d.course, d.section, d.title, d.url, "
+            "d.type, snippet(documents_fts, 1, '**', '**', '...', 12), "
+            "bm25(documents_fts, 10.0, 1.0) AS rank "
+            "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ?"
+        )
+        params: list = [match]
+        if course:
+            sql += " AND d.course = ?"
+            params.append(course)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        keys = [
+            "path",
+            "subcategory",
+            "course",
+            "section",
+            "title",
+            "url",
+            "type",
+            "snippet",
+            "rank",
+        ]
+        return [dict(zip(keys, row)) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
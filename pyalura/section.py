@@ -1,10 +1,10 @@
 import logging
+import threading
 from typing import TYPE_CHECKING
-from urllib.parse import urljoin
 
 from lxml.html import HtmlElement
 
-from pyalura import utils
+from pyalura import parsing
 from pyalura.base import Base
 from pyalura.item import Item
 
@@ -20,16 +20,32 @@ class Section(Base):
         self.title = title.strip()
         self.url = url
         self.course = course
+        self._load_lock = threading.Lock()
 
-        super().__init__(cookie_manager=course.cookie_manager)
+        super().__init__(**course._shared_options())
 
     @property
     def items(self) -> list[Item]:
-        if hasattr(self, "_items") is False:
-            root = self._fetch_root(self.url)
-            items = Item.parse_items_from_html(root, section=self)
+        items = getattr(self, "_items", None)
+        if items is not None:
+            return items
+        # Si otro hilo ya esta pidiendo la seccion, se espera a su resultado.
+        with self._load_lock:
+            if hasattr(self, "_items"):
+                return getattr(self, "_items")
+            response = self._make_request(self.url)
+            items_data = self._run_parser(parsing.parse_section_page, response.content)
+            items = [Item.create(data, section=self) for data in items_data]
+            if self.course.item_index is not None:
+                self.course.item_index.add_section(self, items)
             setattr(self, "_items", items)
-        return getattr(self, "_items")
+            return items
+
+    def release(self):
+        """Libera la lista de items; se vuelve a pedir si se accede a `items`."""
+        with self._load_lock:
+            if hasattr(self, "_items"):
+                delattr(self, "_items")
 
     @property
     def index_last_section(self) -> int:
@@ -65,16 +81,9 @@ class Section(Base):
             ]
         """
         logger.debug("Obteniendo secciones del curso...")
-        select_element = root.find(".//select[@class='task-menu-sections-select']")
-        url_raw = select_element.get("onchange").split("=")[1].strip(";'")
-        content = []
-        for option_element in select_element.xpath(".//option"):
-            value = option_element.get("value")
-            name = option_element.text.strip()
-            url_relative = url_raw.replace("'+this.value+'", value)
-            url = urljoin(utils.HOST, url_relative)
-            content.append({"name": name, "url": url})
-        logger.debug(
-            f"Secciones obtenidas: {len(content)}, primer element: {content[0]}"
-        )
+        content = parsing.parse_sections_data(root)
+        if content:
+            logger.debug(
+                "Secciones obtenidas: %d, primer element: %s", len(content), content[0]
+            )
         return content
@@ -0,0 +1,738 @@
+import abc
+import logging
+import os
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+import warnings
+import zipfile
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, ContextManager, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Comentario que marca una entrada del zip que quedo a medias.
+INCOMPLETE = b"pyalura:incomplete"
+# Prefijo de los bloques de SQLiteStorage que todavia se estan escribiendo.
+PARTIAL_PREFIX = "pyalura:partial:"
+
+
+class Storage(abc.ABC):
+    """
+    Interfaz de almacenamiento del `Downloader`.
+
+    Las claves son rutas relativas con `/`, con la estructura
+    `subcategoria/curso/seccion/item.ext`. Cada backend decide como guardarlas.
+    """
+
+    @abc.abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def location(self, key: str) -> str:
+        """Ubicacion legible de `key`, la que se guarda en el indice de busqueda."""
+
+    @abc.abstractmethod
+    def write_text(self, key: str, text: str) -> str:
+        """Guarda un texto y devuelve su ubicacion."""
+
+    @abc.abstractmethod
+    def open_write(self, key: str) -> ContextManager[IO[bytes]]:
+        """
+        Abre `key` para escribir bytes en streaming. Si sale una excepcion del
+        bloque `with`, lo escrito se descarta y la clave no queda como existente.
+        """
+
+    @abc.abstractmethod
+    def read_bytes(self, key: str) -> bytes:
+        pass
+
+    @abc.abstractmethod
+    def iter_bytes(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """Lee `key` por bloques, sin cargarlo entero en memoria."""
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        """Borra `key`; despues `exists` devuelve False."""
+
+    @abc.abstractmethod
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        pass
+
+    def close_course(self, course_key: str):
+        """Libera lo que el backend tenga abierto para un curso."""
+
+    def close(self):
+        """Libera todo lo que el backend tenga abierto."""
+
+
+class FolderStorage(Storage):
+    """Un archivo por item dentro de `base_folder`. Es el comportamiento clasico."""
+
+    def __init__(self, base_folder: Union[str, Path]):
+        self.base_folder = Path(base_folder)
+
+    def _path(self, key: str) -> Path:
+        return self.base_folder / key
+
+    def location(self, key: str) -> str:
+        return str(self._path(key))
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def write_text(self, key: str, text: str) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return self.location(key)
+
+    @contextmanager
+    def open_write(self, key: str) -> Iterator[IO[bytes]]:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(path, "wb") as f:
+                yield f
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+    def read_bytes(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def iter_bytes(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def delete(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        for path in (self.base_folder / prefix).rglob("*"):
+            if path.is_file():
+                yield path.relative_to(self.base_folder).as_posix()
+
+
+class _CourseArchiveStorage(Storage):
+    """
+    Base de los backends que guardan cada curso en un solo archivo:
+    `base_folder/subcategoria/curso{suffix}`, con el resto de la clave como
+    nombre interno.
+
+    Cada archivo tiene su propio lock, que solo se toma mientras se lee o se
+    modifica el archivo: la descarga de un video no bloquea a los otros cursos.
+    """
+
+    suffix = ""
+
+    def __init__(self, base_folder: Union[str, Path]):
+        self.base_folder = Path(base_folder)
+        self._archives = {}
+        self._archive_locks = {}
+        # Protege los diccionarios de archivos abiertos y de locks.
+        self._lock = threading.Lock()
+
+    def _split(self, key: str) -> tuple[str, str]:
+        parts = key.split("/")
+        if len(parts) < 3:
+            raise ValueError(f"Clave sin curso: {key}")
+        return "/".join(parts[:2]), "/".join(parts[2:])
+
+    def archive_path(self, course_key: str) -> Path:
+        return self.base_folder / f"{course_key}{self.suffix}"
+
+    def _archive_lock(self, course_key: str) -> threading.RLock:
+        with self._lock:
+            lock = self._archive_locks.get(course_key)
+            if lock is None:
+                lock = self._archive_locks[course_key] = threading.RLock()
+            return lock
+
+    def _archive(self, course_key: str):
+        """Archivo abierto del curso. Se llama con el lock del archivo tomado."""
+        with self._lock:
+            archive = self._archives.get(course_key)
+        if archive is None:
+            path = self.archive_path(course_key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            archive = self._open_archive(path)
+            with self._lock:
+                self._archives[course_key] = archive
+        return archive
+
+    def _on_disk(self, course_key: str) -> bool:
+        with self._lock:
+            if course_key in self._archives:
+                return True
+        return self.archive_path(course_key).exists()
+
+    @abc.abstractmethod
+    def _open_archive(self, path: Path):
+        pass
+
+    def _close_archive(self, archive):
+        archive.close()
+
+    def location(self, key: str) -> str:
+        course_key, member = self._split(key)
+        return str(self.archive_path(course_key) / member)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        for path in sorted(self.base_folder.rglob(f"*{self.suffix}")):
+            course_key = path.relative_to(self.base_folder).as_posix()
+            course_key = course_key[: -len(self.suffix)]
+            for member in self._members(course_key):
+                key = f"{course_key}/{member}"
+                if key.startswith(prefix):
+                    yield key
+
+    @abc.abstractmethod
+    def _members(self, course_key: str) -> Iterator[str]:
+        pass
+
+    def _wait_writers(self, course_key: str):
+        """Espera a las escrituras en curso antes de cerrar un archivo."""
+
+    def close_course(self, course_key: str):
+        with self._archive_lock(course_key):
+            self._wait_writers(course_key)
+            with self._lock:
+                archive = self._archives.pop(course_key, None)
+            if archive is not None:
+                self._close_archive(archive)
+
+    def close(self):
+        with self._lock:
+            course_keys = list(self._archives)
+        for course_key in course_keys:
+            self.close_course(course_key)
+
+
+# Cabecera local de una entrada de zip (ver APPNOTE.TXT, 4.3.7).
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+
+
+def _zip64_sizes(extra: bytes, csize: int, usize: int) -> tuple[int, int]:
+    """Tamaños reales de una entrada zip64, que van en el campo extra 0x0001."""
+    while len(extra) >= 4:
+        tag, size = struct.unpack("<HH", extra[:4])
+        if tag == 1:
+            data = extra[4 : 4 + size]
+            values = list(
+                struct.unpack(f"<{len(data) // 8}Q", data[: len(data) // 8 * 8])
+            )
+            if usize == 0xFFFFFFFF and values:
+                usize = values.pop(0)
+            if csize == 0xFFFFFFFF and values:
+                csize = values.pop(0)
+            break
+        extra = extra[4 + size :]
+    return csize, usize
+
+
+def _read_range(f: IO[bytes], size: int, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    while size > 0:
+        chunk = f.read(min(chunk_size, size))
+        if not chunk:
+            return
+        size -= len(chunk)
+        yield chunk
+
+
+def _inflate(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield decompressor.decompress(chunk)
+    yield decompressor.flush()
+
+
+def recover_zip(path: Union[str, Path]) -> int:
+    """
+    Reconstruye un zip al que le falta el directorio central (el proceso murio
+    mientras escribia una entrada), recorriendo las cabeceras locales.
+
+    Se conservan las entradas completas. Las vacias (las marcas de `delete` y la
+    entrada que se estaba escribiendo) borran las versiones anteriores de su nombre.
+
+    Returns:
+        int: Entradas recuperadas.
+    """
+    path = Path(path)
+    file_size = path.stat().st_size
+    entries = {}
+    with open(path, "rb") as f:
+        offset = 0
+        while offset + _LOCAL_HEADER.size <= file_size:
+            f.seek(offset)
+            header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            signature, _, flags, method, dos_time, dos_date = header[:6]
+            csize, usize, name_length, extra_length = header[7:]
+            if signature != _LOCAL_SIGNATURE or flags & 0x08:
+                break
+            name = f.read(name_length).decode("utf-8" if flags & 0x800 else "cp437")
+            csize, usize = _zip64_sizes(f.read(extra_length), csize, usize)
+            data_offset = f.tell()
+            if data_offset + csize > file_size:
+                break
+            entries.pop(name, None)
+            if usize:
+                entries[name] = (data_offset, csize, method, dos_date, dos_time)
+            offset = data_offset + csize
+
+        temp_path = path.with_name(f"{path.name}.recover")
+        with zipfile.ZipFile(temp_path, "w", allowZip64=True) as recovered:
+            for name, (
+                data_offset,
+                csize,
+                method,
+                dos_date,
+                dos_time,
+            ) in entries.items():
+                date_time = (
+                    (dos_date >> 9) + 1980,
+                    (dos_date >> 5) & 0xF,
+                    dos_date & 0x1F,
+                    dos_time >> 11,
+                    (dos_time >> 5) & 0x3F,
+                    (dos_time & 0x1F) * 2,
+                )
+                info = zipfile.ZipInfo(name, date_time)
+                info.compress_type = method
+                f.seek(data_offset)
+                chunks = _read_range(f, csize)
+                if method == zipfile.ZIP_DEFLATED:
+                    chunks = _inflate(chunks)
+                with recovered.open(info, "w", force_zip64=True) as out:
+                    for chunk in chunks:
+                        out.write(chunk)
+    os.replace(temp_path, path)
+    logger.warning("Zip reconstruido (%d entradas): %s", len(entries), path)
+    return len(entries)
+
+
+class ZipStorage(_CourseArchiveStorage):
+    """
+    Un `.zip` por curso. Los videos se guardan sin comprimir y el Markdown con
+    deflate. El directorio central del zip sirve de indice para leer cualquier
+    leccion sin recorrer el archivo.
+
+    Cada zip tiene un solo escritor, abierto hasta `close_course`, que es cuando
+    se escribe el directorio central. `open_write` escribe directamente en el
+    zip, sin archivos temporales y sin tomar el lock mientras dura la descarga;
+    las escrituras chicas (`write_text`, `delete`) que llegan mientras tanto se
+    encolan y se agregan detras de la entrada en curso. Otro `open_write` o una
+    lectura del mismo curso esperan a que termine. Si el proceso muere antes de
+    cerrar el zip, se reconstruye al abrirlo con `recover_zip`.
+
+    Como un zip no permite borrar entradas, `delete` agrega una entrada vacia
+    con el mismo nombre marcada como incompleta; la siguiente escritura correcta
+    la reemplaza (en un zip gana la ultima entrada con un nombre dado).
+    """
+
+    suffix = ".zip"
+
+    def __init__(self, base_folder: Union[str, Path]):
+        super().__init__(base_folder)
+        # Cursos con una entrada abierta por `open_write`.
+        self._streaming = set()
+        # Escrituras chicas que esperan a que termine esa entrada, por nombre.
+        self._queued = {}
+        self._conditions = {}
+
+    def _open_archive(self, path: Path) -> zipfile.ZipFile:
+        # En modo "a", un archivo que no es un zip valido no da error: se le
+        # agregaria un zip nuevo al final. Pasa si el proceso murio sin cerrar
+        # el zip (no hay directorio central, o queda uno viejo pisado a medias).
+        if path.exists() and path.stat().st_size:
+            try:
+                zipfile.ZipFile(path).close()
+            except zipfile.BadZipFile:
+                recover_zip(path)
+        return zipfile.ZipFile(path, "a", allowZip64=True)
+
+    def _condition(self, course_key: str) -> threading.Condition:
+        lock = self._archive_lock(course_key)
+        with self._lock:
+            condition = self._conditions.get(course_key)
+            if condition is None:
+                condition = self._conditions[course_key] = threading.Condition(lock)
+            return condition
+
+    def _idle(self, course_key: str):
+        """Espera, con el lock del archivo tomado, a que no haya una entrada abierta."""
+        condition = self._condition(course_key)
+        while course_key in self._streaming:
+            condition.wait()
+
+    def _wait_writers(self, course_key: str):
+        self._idle(course_key)
+
+    @staticmethod
+    def _write_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # Nombre duplicado
+            archive.writestr(info, data)
+
+    def _writestr(self, course_key: str, info: zipfile.ZipInfo, data: bytes):
+        """Escribe una entrada chica, o la encola si hay una entrada abierta."""
+        if course_key in self._streaming:
+            self._queued.setdefault(course_key, {})[info.filename] = (info, data)
+        else:
+            self._write_entry(self._archive(course_key), info, data)
+
+    def _info(self, key: str):
+        course_key, member = self._split(key)
+        queued = self._queued.get(course_key, {}).get(member)
+        if queued is not None:
+            info = queued[0]
+            return None if info.comment == INCOMPLETE else info
+        if not self._on_disk(course_key):
+            return None
+        try:
+            info = self._archive(course_key).getinfo(member)
+        except KeyError:
+            return None
+        return None if info.comment == INCOMPLETE else info
+
+    def exists(self, key: str) -> bool:
+        course_key, _ = self._split(key)
+        with self._archive_lock(course_key):
+            return self._info(key) is not None
+
+    @staticmethod
+    def _zip_info(member: str, compress_type: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(member, time.localtime()[:6])
+        info.compress_type = compress_type
+        return info
+
+    @staticmethod
+    def _marker(member: str) -> zipfile.ZipInfo:
+        marker = ZipStorage._zip_info(member, zipfile.ZIP_STORED)
+        marker.comment = INCOMPLETE
+        return marker
+
+    def write_text(self, key: str, text: str) -> str:
+        course_key, member = self._split(key)
+        with self._archive_lock(course_key):
+            self._writestr(
+                course_key,
+                self._zip_info(member, zipfile.ZIP_DEFLATED),
+                text.encode("utf-8"),
+            )
+        return self.location(key)
+
+    @contextmanager
+    def open_write(self, key: str) -> Iterator[IO[bytes]]:
+        course_key, member = self._split(key)
+        with self._condition(course_key):
+            self._idle(course_key)
+            archive = self._archive(course_key)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)  # Nombre duplicado
+                f = archive.open(
+                    self._zip_info(member, zipfile.ZIP_STORED), "w", force_zip64=True
+                )
+            self._streaming.add(course_key)
+        # Solo este hilo escribe en el zip hasta `_finish_stream`.
+        try:
+            yield f
+        except BaseException:
+            self._finish_stream(course_key, member, f, failed=True)
+            raise
+        self._finish_stream(course_key, member, f, failed=False)
+
+    def _finish_stream(self, course_key: str, member: str, f: IO[bytes], failed: bool):
+        condition = self._condition(course_key)
+        with condition:
+            try:
+                f.close()
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                self._streaming.discard(course_key)
+                condition.notify_all()
+                archive = self._archive(course_key)
+                if failed:
+                    # Lo escrito queda en el zip, pero no vale.
+                    self._write_entry(archive, self._marker(member), b"")
+                for info, data in self._queued.pop(course_key, {}).values():
+                    self._write_entry(archive, info, data)
+
+    def read_bytes(self, key: str) -> bytes:
+        course_key, member = self._split(key)
+        with self._archive_lock(course_key):
+            queued = self._queued.get(course_key, {}).get(member)
+            if queued is not None and queued[0].comment != INCOMPLETE:
+                return queued[1]
+            self._idle(course_key)
+            info = self._info(key)
+            if info is None:
+                raise KeyError(key)
+            return self._archive(course_key).read(info)
+
+    def iter_bytes(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        course_key, _ = self._split(key)
+        with self._archive_lock(course_key):
+            self._idle(course_key)
+            info = self._info(key)
+            if info is None:
+                raise KeyError(key)
+            f = self._archive(course_key).open(info)
+        # La entrada se sigue leyendo aunque otro hilo cierre o escriba el zip.
+        with f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def delete(self, key: str):
+        course_key, member = self._split(key)
+        with self._archive_lock(course_key):
+            if self._info(key) is not None:
+                self._writestr(course_key, self._marker(member), b"")
+
+    def _members(self, course_key: str) -> Iterator[str]:
+        with self._archive_lock(course_key):
+            # Solo la ultima entrada de cada nombre es la valida.
+            latest = {
+                info.filename: info for info in self._archive(course_key).infolist()
+            }
+            for info, _ in self._queued.get(course_key, {}).values():
+                latest[info.filename] = info
+        for name, info in latest.items():
+            if info.comment != INCOMPLETE:
+                yield name
+
+
+class SQLiteStorage(_CourseArchiveStorage):
+    """
+    Un archivo SQLite por curso. La tabla `files` es el indice (una fila por
+    leccion con su tamaño) y `chunks` guarda el contenido en bloques, para que
+    los videos se escriban en streaming sin tenerlos enteros en memoria.
+
+    Los bloques de una escritura se guardan con una clave temporal, cada uno en
+    su propia transaccion, y al terminar se renombran y se anotan en `files` en
+    una sola transaccion: si la escritura falla no queda nada a medias, y el
+    archivo solo se bloquea mientras se guarda cada bloque.
+
+    Mientras un archivo esta abierto se mantiene un bloqueo compartido sobre
+    `<archivo>.lock`. Los bloques que dejo un proceso que murio se borran al
+    abrir el archivo, pero solo si nadie mas lo tiene abierto: los de otro
+    proceso vivo pueden ser una escritura en curso. En Windows no se borran.
+    """
+
+    suffix = ".sqlite3"
+
+    def __init__(self, base_folder: Union[str, Path]):
+        super().__init__(base_folder)
+        # Archivo de bloqueo de cada conexion abierta.
+        self._lock_files = {}
+
+    @staticmethod
+    def _lock_exclusive(lock_file: IO[bytes]) -> bool:
+        """Toma el bloqueo; True si nadie mas tiene el archivo abierto."""
+        if fcntl is None:
+            return False
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH)
+            return False
+        return True
+
+    def _open_archive(self, path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                key TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (key, seq)
+            );
+            """)
+        lock_file = open(f"{path}.lock", "a+b")
+        if self._lock_exclusive(lock_file):
+            with conn:
+                conn.execute(
+                    "DELETE FROM chunks WHERE substr(key, 1, ?) = ?",
+                    (len(PARTIAL_PREFIX), PARTIAL_PREFIX),
+                )
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH)
+        self._lock_files[conn] = lock_file
+        return conn
+
+    def _close_archive(self, archive: sqlite3.Connection):
+        archive.close()
+        lock_file = self._lock_files.pop(archive, None)
+        if lock_file is not None:
+            lock_file.close()
+
+    def exists(self, key: str) -> bool:
+        course_key, member = self._split(key)
+        with self._archive_lock(course_key):
+            if not self._on_disk(course_key):
+                return False
+            row = (
+                self._archive(course_key)
+                .execute("SELECT 1 FROM files WHERE key = ?", (member,))
+                .fetchone()
+            )
+        return row is not None
+
+    def write_text(self, key: str, text: str) -> str:
+        with self.open_write(key) as f:
+            f.write(text.encode("utf-8"))
+        return self.location(key)
+
+    @contextmanager
+    def open_write(self, key: str) -> Iterator[IO[bytes]]:
+        course_key, member = self._split(key)
+        lock = self._archive_lock(course_key)
+        writer = _ChunkWriter(self, course_key, f"{PARTIAL_PREFIX}{uuid.uuid4().hex}")
+        try:
+            yield writer
+            writer.flush()
+        except BaseException:
+            writer.closed = True
+            with lock:
+                conn = self._archive(course_key)
+                with conn:
+                    conn.execute("DELETE FROM chunks WHERE key = ?", (writer.key,))
+            raise
+        writer.closed = True
+        with lock:
+            conn = self._archive(course_key)
+            with conn:
+                conn.execute("DELETE FROM files WHERE key = ?", (member,))
+                conn.execute("DELETE FROM chunks WHERE key = ?", (member,))
+                conn.execute(
+                    "UPDATE chunks SET key = ? WHERE key = ?", (member, writer.key)
+                )
+                conn.execute(
+                    "INSERT INTO files (key, size, mtime) VALUES (?, ?, ?)",
+                    (member, writer.size, time.time()),
+                )
+
+    def read_bytes(self, key: str) -> bytes:
+        course_key, member = self._split(key)
+        with self._archive_lock(course_key):
+            if not self.exists(key):
+                raise KeyError(key)
+            rows = self._archive(course_key).execute(
+                "SELECT data FROM chunks WHERE key = ? ORDER BY seq", (member,)
+            )
+            return b"".join(row[0] for row in rows)
+
+    def iter_bytes(self, key: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        # Los bloques ya tienen su propio tamaño; se leen de a uno.
+        course_key, member = self._split(key)
+        if not self.exists(key):
+            raise KeyError(key)
+        seq = 0
+        while True:
+            with self._archive_lock(course_key):
+                row = (
+                    self._archive(course_key)
+                    .execute(
+                        "SELECT data FROM chunks WHERE key = ? AND seq = ?",
+                        (member, seq),
+                    )
+                    .fetchone()
+                )
+            if row is None:
+                return
+            yield row[0]
+            seq += 1
+
+    def delete(self, key: str):
+        course_key, member = self._split(key)
+        with self._archive_lock(course_key):
+            if not self.exists(key):
+                return
+            conn = self._archive(course_key)
+            with conn:
+                conn.execute("DELETE FROM files WHERE key = ?", (member,))
+                conn.execute("DELETE FROM chunks WHERE key = ?", (member,))
+
+    def _members(self, course_key: str) -> Iterator[str]:
+        with self._archive_lock(course_key):
+            rows = (
+                self._archive(course_key)
+                .execute("SELECT key FROM files ORDER BY key")
+                .fetchall()
+            )
+        for (member,) in rows:
+            yield member
+
+
+class _ChunkWriter:
+    """
+    Objeto tipo archivo que guarda lo escrito en bloques de `chunks`, cada
+    bloque en su propia transaccion.
+    """
+
+    def __init__(
+        self,
+        storage: SQLiteStorage,
+        course_key: str,
+        key: str,
+        chunk_size: int = 1 << 20,
+    ):
+        self.storage = storage
+        self.course_key = course_key
+        self.key = key
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.closed = False
+        self._seq = 0
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        if self.closed:
+            raise ValueError("Escritura sobre un archivo cerrado")
+        self._buffer += data
+        self.size += len(data)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        with self.storage._archive_lock(self.course_key):
+            conn = self.storage._archive(self.course_key)
+            with conn:
+                conn.execute(
+                    "INSERT INTO chunks (key, seq, data) VALUES (?, ?, ?)",
+                    (self.key, self._seq, bytes(self._buffer)),
+                )
+        self._seq += 1
+        self._buffer.clear()
+
+
+STORAGES = {"folder": FolderStorage, "zip": ZipStorage, "sqlite": SQLiteStorage}
+
+
+def get_storage(kind: str, base_folder: Union[str, Path]) -> Storage:
+    """Crea un backend por nombre: `folder`, `zip` o `sqlite`."""
+    try:
+        return STORAGES[kind](base_folder)
+    except KeyError:
+        raise ValueError(f"Almacenamiento desconocido: {kind}") from None
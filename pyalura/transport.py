@@ -0,0 +1,290 @@
+import abc
+import base64
+import collections
+import datetime
+import gzip
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import requests
+
+from pyalura.clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
+# Cabeceras de respuesta que no se guardan en las grabaciones. Los cuerpos se
+# guardan ya descomprimidos, asi que tampoco se guarda su codificacion.
+SKIP_HEADERS = {"set-cookie", "content-encoding", "transfer-encoding"}
+
+
+class Transport(abc.ABC):
+    """
+    Capa que hace las peticiones HTTP de `Base._make_request`.
+
+    Atributos:
+        needs_cookies (bool): Si es False, `Base` no carga las cookies de la cuenta.
+    """
+
+    needs_cookies = True
+
+    @abc.abstractmethod
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HTTPTransport(Transport):
+    """Transporte real: usa `requests.get`, `requests.post` y `requests.head`."""
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return getattr(requests, method.lower())(url, **kwargs)
+
+
+class SessionTransport(Transport):
+    """
+    Transporte real que reutiliza las conexiones (keep-alive) entre peticiones.
+
+    `requests.get` abre una conexion nueva en cada llamada; aqui cada hilo tiene
+    su propio `requests.Session`, que mantiene un pool de conexiones abiertas.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        # Como `requests.head`: las peticiones HEAD no siguen redirecciones.
+        kwargs.setdefault("allow_redirects", method.upper() != "HEAD")
+        return self._session().request(method.upper(), url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+class RecordingTransport(Transport):
+    """
+    Graba cada peticion y su respuesta en un archivo JSON lines comprimido con gzip.
+
+    Se guarda el metodo, la URL, el cuerpo enviado (`data`/`json`, p. ej. las
+    respuestas de una pregunta), el estado, las cabeceras, las redirecciones, el
+    tiempo que tardo y el cuerpo de la respuesta. No se guardan las cookies ni
+    las cabeceras enviadas, asi que la grabacion se puede reproducir sin cuenta.
+
+    Atributos:
+        path (Path): Archivo de la grabacion (`.jsonl.gz`).
+        inner (Transport): Transporte que hace las peticiones de verdad.
+        max_media_bytes (int, opcional): Si se indica, los cuerpos de las
+            peticiones en streaming (los videos) se recortan a este tamaño.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        inner: Optional[Transport] = None,
+        max_media_bytes: Optional[int] = None,
+    ):
+        self.path = Path(path)
+        self.inner = inner or HTTPTransport()
+        self.max_media_bytes = max_media_bytes
+        self.needs_cookies = self.inner.needs_cookies
+        self._lock = threading.Lock()
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        # Respuestas en streaming que todavia no se grabaron, por `id`.
+        self._pending = {}
+        self.recorded = 0
+
+    @staticmethod
+    def _headers(headers) -> dict:
+        return {k: v for k, v in headers.items() if k.lower() not in SKIP_HEADERS}
+
+    def _write(self, record: dict, body: bytes, original_length: int):
+        record["body"] = base64.b64encode(body).decode("ascii")
+        if len(body) < original_length:
+            record["original_length"] = original_length
+            record["headers"]["Content-Length"] = str(len(body))
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self.recorded += 1
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        start = time.monotonic()
+        response = self.inner.request(method, url, **kwargs)
+        record = {
+            "method": method.upper(),
+            "url": url,
+            "data": kwargs.get("data"),
+            "json": kwargs.get("json"),
+            "stream": bool(kwargs.get("stream")),
+            "status": response.status_code,
+            "reason": response.reason,
+            "final_url": response.url,
+            "headers": self._headers(response.headers),
+            "history": [
+                {
+                    "status": r.status_code,
+                    "url": r.url,
+                    "headers": self._headers(r.headers),
+                }
+                for r in response.history
+            ],
+            "elapsed": time.monotonic() - start,
+        }
+
+        if not kwargs.get("stream"):
+            self._write(record, response.content, len(response.content))
+            return response
+
+        self._tee_stream(response, record)
+        return response
+
+    def _tee_stream(self, response: requests.Response, record: dict):
+        """Graba el cuerpo de una respuesta en streaming mientras quien la pidio lo lee."""
+        limit = self.max_media_bytes
+        captured = bytearray()
+        state = {"length": 0, "written": False}
+
+        def finish():
+            with self._lock:
+                if state["written"]:
+                    return
+                state["written"] = True
+                self._pending.pop(id(state), None)
+            self._write(record, bytes(captured), state["length"])
+
+        with self._lock:
+            self._pending[id(state)] = finish
+
+        original_iter_content = response.iter_content
+        original_close = response.close
+
+        def iter_content(chunk_size=1, decode_unicode=False):
+            try:
+                for chunk in original_iter_content(chunk_size, decode_unicode):
+                    state["length"] += len(chunk)
+                    if limit is None or len(captured) < limit:
+                        room = len(chunk) if limit is None else limit - len(captured)
+                        captured.extend(chunk[:room])
+                    yield chunk
+            finally:
+                finish()
+
+        def close():
+            finish()
+            original_close()
+
+        response.iter_content = iter_content
+        response.close = close
+
+    def close(self):
+        # Las respuestas que nadie leyo ni cerro se graban con lo que se leyo.
+        with self._lock:
+            pending = list(self._pending.values())
+        for finish in pending:
+            finish()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        logger.info("Grabacion guardada: %d peticiones en %s", self.recorded, self.path)
+
+
+class ReplayMissError(requests.RequestException):
+    """La grabacion no tiene ninguna respuesta para la peticion."""
+
+
+class ReplayTransport(Transport):
+    """
+    Reproduce una grabacion de `RecordingTransport` sin red ni cuenta.
+
+    Las respuestas de una misma peticion (metodo y URL) se devuelven en el orden
+    en que se grabaron; la ultima se repite si se pide mas veces.
+
+    Atributos:
+        path (Path): Archivo de la grabacion.
+        latency (float): Multiplicador del tiempo grabado de cada peticion: 1.0
+            reproduce la latencia real y 0 responde al instante.
+        clock (Clock): Reloj con el que se espera la latencia.
+    """
+
+    needs_cookies = False
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        latency: float = 1.0,
+        clock: Optional[Clock] = None,
+    ):
+        self.path = Path(path)
+        self.latency = latency
+        self.clock = clock or SYSTEM_CLOCK
+        self._lock = threading.Lock()
+        self._records = collections.defaultdict(collections.deque)
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self._records[(record["method"], record["url"])].append(record)
+        self.replayed = 0
+        self.misses = 0
+
+    def _next(self, method: str, url: str) -> Optional[dict]:
+        with self._lock:
+            records = self._records.get((method, url))
+            if not records:
+                self.misses += 1
+                return None
+            self.replayed += 1
+            return records.popleft() if len(records) > 1 else records[0]
+
+    @staticmethod
+    def _build(url: str, status: int, headers: dict) -> requests.Response:
+        response = requests.Response()
+        response.url = url
+        response.status_code = status
+        response.headers.update(headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = b""
+        response._content_consumed = True
+        return response
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        record = self._next(method.upper(), url)
+        if record is None:
+            raise ReplayMissError(f"Peticion no grabada: {method} {url}")
+
+        if self.latency:
+            self.clock.sleep(record["elapsed"] * self.latency)
+
+        response = self._build(record["final_url"], record["status"], record["headers"])
+        response.reason = record.get("reason")
+        response._content = base64.b64decode(record["body"])
+        response.elapsed = datetime.timedelta(seconds=record["elapsed"])
+        response.history = [
+            self._build(r["url"], r["status"], r["headers"]) for r in record["history"]
+        ]
+        return response
@@ -1,19 +1,20 @@
 import enum
 import logging
 import platform
-import time
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from urllib.parse import urljoin, urlparse
 
 import unidecode
 
+from pyalura.clock import SYSTEM_CLOCK, Clock
+from pyalura.log import setup_logging
+
 if TYPE_CHECKING:
     from pyalura.item import Item
 
 import re
 
-
 caracteres_invalidos = re.compile('[<>:"/\\|?*\x00-\x1f]')
 TRACK_DOWNLOADS_PATH = Path("track_downloads.json")
 
@@ -35,43 +36,34 @@ def string_to_slug(string):
     return slut_lower_sin_caracteres_invalidos.rstrip(" .")
 
 
-def sleep_progress(seconds: float):
+def sleep_progress(seconds: float, clock: Optional[Clock] = None):
+    clock = clock or SYSTEM_CLOCK
     total = int(seconds)
     if total <= 0:
         return
 
     logger.info(
-        f"Esperando {total // 60} minutos y {total % 60} segundos antes de continuar..."
+        "Esperando %d minutos y %d segundos antes de continuar...",
+        total // 60,
+        total % 60,
     )
 
-    for i in range(total, 0, -1):
-        time.sleep(1)
-        if i % 60 == 0:
-            mins_left = i // 60
-            logger.info(f"Faltan {mins_left} minutos...")
-        elif i <= 10:  # Mostrar segundos finales
-            logger.info(f"{i} segundos restantes...")
+    # Se duerme hasta el siguiente minuto entero y se informa una vez por minuto.
+    remaining = total
+    while remaining > 0:
+        step = remaining % 60 or 60
+        clock.sleep(step)
+        remaining -= step
+        if remaining:
+            logger.info("Faltan %d minutos...", remaining // 60)
 
 
-logging.basicConfig(
-    format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
-    datefmt="%d-%m-%Y %I:%M:%S %p",
-    level=logging.INFO,
-    encoding="utf-8",
-    handlers=[
-        logging.FileHandler("alura.log"),  # Log a archivo
-        logging.StreamHandler(),  # Log a consola
-    ],
-)
+# Como hacia `basicConfig`, no se toca el logging si la aplicacion ya lo configuro.
+if not logging.getLogger().handlers:
+    setup_logging()
 
 
 logger = logging.getLogger(__name__)
-logger.info(
-    """
-    =====================
-     Incio del programa
-    ====================="""
-)
 
 HOST = "https://app.aluracursos.com"
 
@@ -99,7 +91,7 @@ def extract_base_url(url):
     Ejemplo:
     https://app.aluracursos.com/course/...est-java/task/83409 -> https://app.aluracursos.com/course/spring-boot-3-desarrollar-api-rest-java
     """
-    logger.debug(f"Extrayendo URL base de: {url}")
+    logger.debug("Extrayendo URL base de: %s", url)
 
     if type(url) != str:
         raise TypeError("Se esperaba como url string")
@@ -0,0 +1,407 @@
+import abc
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from pyalura.downloader import Downloader
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """
+    Un trabajo de la cola.
+
+    Atributos:
+        id (int): Identificador del trabajo.
+        kind (str): 'course' o 'item'.
+        key (str): Clave unica (normalmente la URL); evita encolar dos veces lo mismo.
+        payload (dict): Datos del trabajo.
+        attempts (int): Cuantas veces se ha reclamado.
+    """
+
+    def __init__(self, id: int, kind: str, key: str, payload: dict, attempts: int):
+        self.id = id
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} {self.kind} {self.key}>"
+
+
+class QueueBackend(abc.ABC):
+    """
+    Interfaz de almacenamiento de la cola de trabajos.
+
+    Un backend debe garantizar que `claim` entrega cada trabajo a un solo
+    trabajador mientras su lease siga vigente, aunque los trabajadores esten en
+    procesos o maquinas distintas.
+    """
+
+    @abc.abstractmethod
+    def enqueue(
+        self, kind: str, key: str, payload: dict, requeue: bool = False
+    ) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        pass
+
+    @abc.abstractmethod
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def complete(self, job_id: int, worker_id: str, result: Optional[dict] = None):
+        pass
+
+    @abc.abstractmethod
+    def fail(self, job_id: int, worker_id: str, error: str, retry: bool = True):
+        pass
+
+    @abc.abstractmethod
+    def stats(self) -> dict:
+        pass
+
+
+class SQLiteQueueBackend(QueueBackend):
+    """
+    Backend de la cola sobre un archivo SQLite compartido.
+
+    Cada proceso abre su propia conexion; los reclamos se hacen dentro de una
+    transaccion `BEGIN IMMEDIATE`, por lo que dos procesos nunca reclaman el
+    mismo trabajo. Los trabajos cuyo lease vencio vuelven a estar disponibles.
+
+    Atributos:
+        path (Path): Ruta del archivo SQLite.
+        max_attempts (int): Reclamos maximos antes de marcar un trabajo como fallido.
+    """
+
+    def __init__(self, path: Union[str, Path], max_attempts: int = 3):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    key TEXT UNIQUE NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL
+                )
+                """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_until)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def enqueue(
+        self, kind: str, key: str, payload: dict, requeue: bool = False
+    ) -> bool:
+        with self._transaction() as conn:
+            if requeue:
+                # Un trabajo ya terminado o fallido vuelve a quedar pendiente.
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = 0, worker = NULL, "
+                    "lease_until = NULL, error = NULL, updated_at = ? "
+                    "WHERE key = ? AND status IN (?, ?)",
+                    (PENDING, time.time(), key, DONE, FAILED),
+                )
+                if cursor.rowcount == 1:
+                    return True
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (kind, key, payload, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload), PENDING, time.time()),
+            )
+            return cursor.rowcount == 1
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        with self._transaction() as conn:
+            # Los leases vencidos que ya agotaron sus intentos se dan por fallidos.
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = 'lease vencido', updated_at = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, now, CLAIMED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, kind, key, payload, attempts FROM jobs "
+                "WHERE status = ? OR (status = ? AND lease_until < ?) "
+                "ORDER BY id LIMIT 1",
+                (PENDING, CLAIMED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, kind, key, payload, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (CLAIMED, worker_id, now + lease_seconds, now, job_id),
+            )
+        return Job(job_id, kind, key, json.loads(payload), attempts + 1)
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (now + lease_seconds, now, job_id, worker_id, CLAIMED),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[dict] = None):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, lease_until = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ?",
+                (DONE, json.dumps(result or {}), time.time(), job_id, worker_id),
+            )
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry: bool = True):
+        with self._transaction() as conn:
+            attempts = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()[0]
+            status = PENDING if retry and attempts < self.max_attempts else FAILED
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ?",
+                (status, error, time.time(), job_id, worker_id),
+            )
+
+    def stats(self) -> dict:
+        rows = (
+            self._connection()
+            .execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+            .fetchall()
+        )
+        stats = {PENDING: 0, CLAIMED: 0, DONE: 0, FAILED: 0}
+        stats.update(dict(rows))
+        return stats
+
+
+class WorkQueue:
+    """
+    Cola durable de trabajos de descarga (cursos e items) compartida entre trabajadores.
+
+    Atributos:
+        backend (QueueBackend): Almacenamiento de la cola. Por defecto, SQLite.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "work_queue.sqlite3",
+        backend: Optional[QueueBackend] = None,
+    ):
+        self.backend = backend or SQLiteQueueBackend(path)
+
+    def enqueue_courses(self, urls: list[Union[str, dict]]) -> int:
+        """
+        Encola cursos (URLs o los diccionarios de `CatalogCrawler.crawl`).
+
+        Returns:
+            int: Cantidad de cursos nuevos; los ya encolados se ignoran.
+        """
+        added = 0
+        for url in urls:
+            url = (url["url"] if isinstance(url, dict) else url).strip()
+            if url and self.backend.enqueue("course", url, {"url": url}):
+                added += 1
+        logger.info("Encolados %d cursos nuevos.", added)
+        return added
+
+    def enqueue_items(self, urls: list[str], requeue: bool = False) -> int:
+        """
+        Encola items sueltos por su URL.
+
+        Con `requeue=True` tambien vuelven a la cola los items ya terminados o
+        fallidos (por ejemplo, los que `pyalura.audit` encontro rotos).
+        """
+        added = 0
+        for url in urls:
+            url = url.strip()
+            if url and self.backend.enqueue("item", url, {"url": url}, requeue):
+                added += 1
+        logger.info("Encolados %d items nuevos.", added)
+        return added
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        return self.backend.claim(worker_id, lease_seconds)
+
+    def heartbeat(self, job: Job, worker_id: str, lease_seconds: float) -> bool:
+        return self.backend.heartbeat(job.id, worker_id, lease_seconds)
+
+    def complete(self, job: Job, worker_id: str, result: Optional[dict] = None):
+        self.backend.complete(job.id, worker_id, result)
+
+    def fail(self, job: Job, worker_id: str, error: str, retry: bool = True):
+        self.backend.fail(job.id, worker_id, error, retry)
+
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+
+class QueueWorker:
+    """
+    Trabajador que vacia una `WorkQueue` usando un `Downloader`.
+
+    Mientras procesa un trabajo, un hilo renueva su lease cada
+    `heartbeat_interval` segundos. Si el proceso muere, el lease vence y otro
+    trabajador retoma el trabajo. Los cursos terminados se guardan ademas en el
+    historial del `Downloader`.
+
+    Atributos:
+        worker_id (str): Identificador del trabajador (host, pid y un sufijo).
+        lease_seconds (float): Duracion del lease de cada trabajo.
+        heartbeat_interval (float): Cada cuanto se renueva el lease.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        downloader: "Downloader",
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 300,
+        heartbeat_interval: float = 60,
+    ):
+        self.queue = queue
+        self.downloader = downloader
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+
+    def _heartbeat(self, job: Job, stop: threading.Event):
+        while not stop.wait(self.heartbeat_interval):
+            if not self.queue.heartbeat(job, self.worker_id, self.lease_seconds):
+                logger.warning("Se perdio el lease del trabajo: %s", job)
+                return
+
+    def _run_job(self, job: Job) -> dict:
+        from pyalura.course import Course
+
+        url = job.payload["url"]
+        if job.kind == "course":
+            if not self.downloader.download_course(url):
+                raise RuntimeError(f"No se pudo descargar el curso: {url}")
+        elif job.kind == "item":
+            item = Course.get_item(url, **self.downloader.course_options())
+            try:
+                if self.downloader.download_item(item) is None:
+                    raise RuntimeError(f"No se pudo descargar el item: {url}")
+            finally:
+                # Solo el archivo de este curso: el almacenamiento puede ser compartido.
+                self.downloader.storage.close_course(self.downloader.course_key(item))
+        else:
+            raise ValueError(f"Tipo de trabajo desconocido: {job.kind}")
+        return {"worker": self.worker_id, "url": url}
+
+    def run_once(self) -> bool:
+        """
+        Reclama y procesa un trabajo.
+
+        Returns:
+            bool: False si no habia trabajos disponibles.
+        """
+        job = self.queue.claim(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+
+        logger.info("Trabajador %s procesando: %s", self.worker_id, job)
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job, stop), daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = self._run_job(job)
+        except Exception as e:
+            logger.error("Error en el trabajo %s: %s", job, e)
+            self.queue.fail(job, self.worker_id, str(e))
+        else:
+            self.queue.complete(job, self.worker_id, result)
+        finally:
+            stop.set()
+            heartbeat.join()
+        return True
+
+    def run(self, max_jobs: Optional[int] = None, poll_interval: float = 0) -> int:
+        """
+        Procesa trabajos hasta vaciar la cola (o hasta `max_jobs`).
+
+        Args:
+            max_jobs (int, opcional): Cantidad maxima de trabajos a procesar.
+            poll_interval (float): Si es mayor que 0, en lugar de terminar cuando
+                la cola esta vacia espera ese tiempo y vuelve a mirar.
+
+        Returns:
+            int: Cantidad de trabajos procesados.
+        """
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            if self.run_once():
+                processed += 1
+            elif poll_interval > 0:
+                time.sleep(poll_interval)
+            else:
+                break
+        logger.info("Trabajador %s termino: %d trabajos.", self.worker_id, processed)
+        return processed
+
+
+def run_worker(
+    queue_path: Union[str, Path], base_folder: Union[str, Path], **kwargs
+) -> int:
+    """
+    Punto de entrada para lanzar un trabajador en otro proceso
+    (por ejemplo con `multiprocessing.Process(target=run_worker, ...)`).
+    """
+    from pyalura.downloader import Downloader
+
+    worker = QueueWorker(WorkQueue(queue_path), Downloader(base_folder), **kwargs)
+    return worker.run()
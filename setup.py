@@ -8,4 +8,5 @@ setup(
     author_email="leocasti@gmail.com",
     packages=find_packages(),
     install_requires=["lxml", "requests", "html2text", "Unidecode"],
+    entry_points={"console_scripts": ["pyalura=pyalura.cli:main"]},
 )
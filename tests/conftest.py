@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# `FakeAlura`, el sustituto local de la plataforma, vive con los benchmarks.
+sys.path.insert(0, str(ROOT / "benchmarks"))
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _cwd(tmp_path, monkeypatch):
+    """Cada prueba corre en su propia carpeta: sin cookies ni `alura.log` ajenos."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+
+class _FakeRaw:
+    def release_conn(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def serve_sessions(fake, methods=None):
+    """
+    Hace que las peticiones de un `requests.Session` (p. ej. `SessionTransport`)
+    las atienda `fake`, pasando por la logica de redirecciones de `requests`.
+    """
+
+    def send(adapter, request, **kwargs):
+        if methods is not None:
+            methods.append(request.method)
+        response = fake.handle(request.method, request.url)
+        response.request = request
+        response.raw = _FakeRaw()
+        return response
+
+    return mock.patch.object(requests.adapters.HTTPAdapter, "send", send)
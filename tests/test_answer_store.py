@@ -0,0 +1,72 @@
+from fake_alura import FakeAlura, make_response
+
+from pyalura.answer_store import AnswerStore
+from pyalura.course import Course
+from pyalura.item_index import ItemIndex
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def test_resolve_from_store_uses_stored_choice_type(tmp_path):
+    item_index = ItemIndex(tmp_path / "items.sqlite3")
+    answer_store = AnswerStore(tmp_path / "answers.sqlite3")
+    # 1002 es SINGLE_CHOICE en la pagina; se guardo como multiple.
+    answer_store.put("1002", ["7", "9"], "multiplechoice")
+    calls = []
+
+    with FakeAlura() as fake:
+        handle = fake.handle
+        fake.handle = lambda method, url, **kw: (
+            calls.append((method, url, kw.get("json"))) or handle(method, url, **kw)
+        )
+        Course(COURSE_URL, item_index=item_index).sections[0].items
+        calls.clear()
+
+        item = Course.get_item(
+            f"{COURSE_URL}/task/1002", item_index=item_index, answer_store=answer_store
+        )
+        assert item.course.answer_store is answer_store
+        assert item.resolve_question() is True
+
+    # No se pide la pagina de la pregunta: solo su seccion (para saber si ya
+    # estaba vista) y el envio.
+    assert calls == [
+        ("GET", f"{COURSE_URL}/section/1001/tasks", None),
+        (
+            "POST",
+            f"{COURSE_URL}/section/1/multiplechoice/answer",
+            {"taskId": "1002", "alternatives": ["7", "9"]},
+        ),
+    ]
+    item_index.close()
+    answer_store.close()
+
+
+def test_rejected_stored_answers_fall_back_to_the_page(tmp_path):
+    item_index = ItemIndex(tmp_path / "items.sqlite3")
+    answer_store = AnswerStore(tmp_path / "answers.sqlite3")
+    answer_store.put("1002", ["7"], "singlechoice")
+    posted = []
+
+    with FakeAlura() as fake:
+        handle = fake.handle
+
+        def reject_stale(method, url, **kwargs):
+            if method == "POST":
+                posted.append(kwargs["json"]["alternatives"])
+                if kwargs["json"]["alternatives"] == ["7"]:
+                    return make_response(url, "{}", status=400)
+            return handle(method, url, **kwargs)
+
+        fake.handle = reject_stale
+        Course(COURSE_URL, item_index=item_index).sections[0].items
+        item = Course.get_item(
+            f"{COURSE_URL}/task/1002", item_index=item_index, answer_store=answer_store
+        )
+        assert item.resolve_question() is True
+
+    # Las guardadas no sirvieron: se pidio la pagina y se enviaron las correctas.
+    assert posted == [["7"], ["0"]]
+    assert answer_store.get("1002")["alternatives"] == ["0"]
+    item_index.close()
+    answer_store.close()
@@ -0,0 +1,59 @@
+import pytest
+
+from pyalura import parsing
+from pyalura.assets import asset_key, rewrite_markdown
+
+COURSE_KEY = "sub/curso"
+DOCUMENT_KEY = f"{COURSE_KEY}/1 - Seccion/2 - Texto.md"
+LONG_TEXT = " ".join(["Texto largo que ocupa mas de una linea."] * 4)
+
+
+def task_page(body: str) -> bytes:
+    return (
+        "<html><body>"
+        "<span class='task-body-header-title-text'>Lectura</span>"
+        f"<section id='task-content'><p>{LONG_TEXT} {body} {LONG_TEXT}</p></section>"
+        "</body></html>"
+    ).encode("utf-8")
+
+
+def localize(body: str) -> tuple[str, list[dict]]:
+    parsed = parsing.parse_task_page(task_page(body))
+    local_keys = {
+        asset["ref"]: asset_key(COURSE_KEY, asset["url"]) for asset in parsed["assets"]
+    }
+    return rewrite_markdown(parsed["content"], local_keys, DOCUMENT_KEY), parsed
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        # Una URL larga en medio de un parrafo largo.
+        "<img src='https://cdn.example.com/"
+        + "carpeta/" * 12
+        + "imagen.png' alt='diagrama'>",
+        # Caracteres que html2text escapa en el Markdown.
+        "<img src='https://cdn.example.com/mi_imagen_[1]*.png'>",
+        # Espacios y acentos, que lxml escapa al serializar.
+        "<a href='https://cdn.example.com/Material del año/ejercicios ñ.zip'>zip</a>",
+    ],
+    ids=["wrapped", "escaped", "non-ascii"],
+)
+def test_rewrite_markdown_links_local_copies(body):
+    markdown, parsed = localize(body)
+
+    assert len(parsed["assets"]) == 1
+    assert "cdn.example.com" not in markdown
+    local = asset_key(COURSE_KEY, parsed["assets"][0]["url"])
+    assert f"](../assets/{local.rsplit('/', 1)[1]}" in markdown
+
+
+def test_long_paragraphs_and_links_are_not_wrapped():
+    alt = " ".join(["diagrama"] * 15)
+    markdown, parsed = localize(
+        f"<img src='https://cdn.example.com/d.png' alt='{alt}'>"
+    )
+
+    assert LONG_TEXT in markdown
+    local = asset_key(COURSE_KEY, parsed["assets"][0]["url"])
+    assert f"![{alt}](../assets/{local.rsplit('/', 1)[1]})" in markdown
@@ -0,0 +1,40 @@
+import hashlib
+
+from fake_alura import make_response
+
+from pyalura import audit
+from pyalura.cookie_manager import CookieManager
+from pyalura.storage import FolderStorage
+
+VIDEO_URL = "https://app.aluracursos.com/fake-video/hd.mp4"
+CDN_URL = "https://cdn.example.com/hd.mp4"
+
+
+class StaticCookies(CookieManager):
+    def get_cookies(self):
+        return {"SESSION": "abc"}
+
+
+def test_check_remote_sends_cookies_to_the_platform(tmp_path, monkeypatch):
+    storage = FolderStorage(tmp_path)
+    storage.write_text("sub/curso/video.mp4", "video")
+    sha256 = hashlib.sha256(b"video").hexdigest()
+    heads = []
+
+    def head(url, **kwargs):
+        heads.append((url, kwargs["cookies"]))
+        return make_response(url, headers={"Content-Length": "5"})
+
+    monkeypatch.setattr(audit.requests, "head", head)
+    cookie_manager = StaticCookies()
+    for url in (VIDEO_URL, CDN_URL):
+        entry = {
+            "key": "sub/curso/video.mp4",
+            "size": 5,
+            "sha256": sha256,
+            "content_length": 5,
+            "source_url": url,
+        }
+        assert audit.check_entry(storage, entry, True, cookie_manager) is None
+
+    assert heads == [(VIDEO_URL, {"SESSION": "abc"}), (CDN_URL, None)]
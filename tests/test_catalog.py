@@ -0,0 +1,84 @@
+from urllib.parse import urlparse
+
+from fake_alura import make_response
+
+from conftest import FIXTURES
+from pyalura.catalog import CatalogCrawler
+from pyalura.parsing import ParserPool
+from pyalura.transport import Transport
+
+START = "https://www.aluracursos.com/cursos-online-programacion"
+
+
+class FixtureTransport(Transport):
+    """Responde con las paginas guardadas en `fixtures/catalog`."""
+
+    def __init__(self):
+        self.sent_cookies = []
+
+    def request(self, method, url, **kwargs):
+        self.sent_cookies.append(kwargs.get("cookies"))
+        name = urlparse(url).path.strip("/").replace("/", "-") + ".html"
+        path = FIXTURES / "catalog" / name
+        if not path.exists():
+            return make_response(url, "", status=404)
+        return make_response(url, path.read_bytes())
+
+
+def test_crawl_fixture_pages_without_cookies():
+    transport = FixtureTransport()
+    crawler = CatalogCrawler(transport=transport, max_workers=2)
+
+    courses = {course["url"]: course for course in crawler.crawl(START)}
+
+    assert sorted(courses) == [
+        "https://app.aluracursos.com/course/java-orientacion-objetos",
+        "https://app.aluracursos.com/course/pandas-datos",
+        "https://app.aluracursos.com/course/python-data-science",
+        "https://app.aluracursos.com/course/python-funciones",
+    ]
+    # La subcategoria sale de la pagina mas especifica en la que aparece.
+    assert (
+        courses["https://app.aluracursos.com/course/python-funciones"]["subcategory"]
+        == "python"
+    )
+    assert (
+        courses["https://app.aluracursos.com/course/java-orientacion-objetos"][
+            "subcategory"
+        ]
+        == "java"
+    )
+    assert (
+        courses["https://app.aluracursos.com/course/pandas-datos"]["formation"]
+        == "Python para Data Science"
+    )
+    # Cuatro paginas de listado, cada una una vez y sin cookies (no hay archivo).
+    assert len(transport.sent_cookies) == 4
+    assert transport.sent_cookies == [None] * 4
+
+
+def test_crawl_fixture_pages_with_load_fixture():
+    def fetch_root(url):
+        name = urlparse(url).path.strip("/").replace("/", "-") + ".html"
+        return CatalogCrawler.load_fixture(FIXTURES / "catalog" / name)
+
+    crawler = CatalogCrawler(fetch_root=fetch_root, max_depth=0)
+
+    courses = crawler.crawl(START)
+
+    assert [course["url"] for course in courses] == [
+        "https://app.aluracursos.com/course/python-data-science",
+        "https://app.aluracursos.com/course/java-orientacion-objetos",
+    ]
+    assert courses[0]["title"] == "Python para Data Science: primeros pasos"
+
+
+def test_crawl_parses_pages_in_parser_pool():
+    with ParserPool(1) as parser_pool:
+        crawler = CatalogCrawler(
+            transport=FixtureTransport(), parser_pool=parser_pool, max_depth=0
+        )
+        courses = crawler.crawl(START)
+
+    assert len(courses) == 2
+    assert courses[0]["subcategory"] == "programacion"
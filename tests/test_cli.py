@@ -0,0 +1,57 @@
+import json
+import zipfile
+
+from conftest import serve_sessions
+from fake_alura import FakeAlura
+
+from pyalura import cli
+from pyalura.item_index import ItemIndex
+
+COURSES = [f"https://app.aluracursos.com/course/curso-{i}" for i in range(4)]
+
+
+def test_batch_shares_storage_and_fills_the_item_index(tmp_path, monkeypatch):
+    jobs = tmp_path / "trabajos.txt"
+    jobs.write_text("\n".join(COURSES), encoding="utf-8")
+    progress = tmp_path / "avance.jsonl"
+    storages = []
+    get_storage = cli.get_storage
+
+    def counting_get_storage(kind, base_folder):
+        storages.append(get_storage(kind, base_folder))
+        return storages[-1]
+
+    monkeypatch.setattr(cli, "get_storage", counting_get_storage)
+    fake = FakeAlura(sections=1, items=2, paragraphs=2, video_bytes=1024)
+    with fake, serve_sessions(fake):
+        status = cli.main(
+            [
+                str(jobs),
+                "--output",
+                str(tmp_path / "out"),
+                "--workers",
+                "2",
+                "--storage",
+                "zip",
+                "--item-index",
+                "--progress",
+                str(progress),
+            ]
+        )
+
+    assert status == 0
+    assert len(storages) == 1
+    archives = sorted((tmp_path / "out").rglob("*.zip"))
+    assert len(archives) == len(COURSES)
+    for archive in archives:
+        with zipfile.ZipFile(archive) as f:
+            assert len(f.namelist()) == 2
+
+    index = ItemIndex(tmp_path / "out" / "item_index.sqlite3")
+    # Los cursos de FakeAlura repiten los ids de tarea.
+    assert index.get("1001")["url"].endswith("/task/1001")
+    assert len(index) == 2
+    index.close()
+    events = [json.loads(line) for line in progress.read_text().splitlines()]
+    assert events[-1]["event"] == "summary"
+    assert events[-1]["done"] == len(COURSES)
@@ -0,0 +1,47 @@
+import time
+
+from pyalura.bandwidth import BandwidthShaper, Priority
+from pyalura.clock import SimulatedClock
+from pyalura.rate_limit import AdaptiveLimiter
+
+
+def test_adaptive_limiter_waits_retry_after_on_the_clock():
+    clock = SimulatedClock()
+    limiter = AdaptiveLimiter(initial_limit=2, clock=clock)
+    assert limiter.acquire()
+    limiter.release(status=429, retry_after=30)
+
+    start = time.perf_counter()
+    assert limiter.acquire()
+    assert time.perf_counter() - start < 1
+    assert clock.elapsed >= 30
+
+
+def test_adaptive_limiter_timeout_uses_the_clock():
+    clock = SimulatedClock()
+    limiter = AdaptiveLimiter(initial_limit=1, clock=clock)
+    assert limiter.acquire()
+
+    assert limiter.acquire(timeout=5) is False
+    assert clock.elapsed == 5
+
+
+def test_bandwidth_shaper_waits_on_the_clock():
+    clock = SimulatedClock()
+    shaper = BandwidthShaper(64 * 1024, clock=clock)
+    worker = shaper.worker(32 * 1024)
+
+    start = time.perf_counter()
+    # La cubeta del trabajador empieza con 64 KiB: la deuda es de 64 KiB.
+    shaper.consume(128 * 1024, worker=worker)
+    assert time.perf_counter() - start < 1
+    assert clock.elapsed == 2
+
+
+def test_bandwidth_shaper_yields_on_the_clock():
+    clock = SimulatedClock()
+    shaper = BandwidthShaper(max_yield=0.5, clock=clock)
+
+    with shaper.request(Priority.INTERACTIVE):
+        shaper.consume(1024, Priority.BULK)
+    assert clock.elapsed == 0.5
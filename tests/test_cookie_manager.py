@@ -0,0 +1,125 @@
+import os
+from unittest import mock
+
+import pytest
+from fake_alura import make_response
+
+from pyalura.base import Base
+from pyalura.cookie_manager import DASHBOARD_URL, CookieManager, SessionExpiredError
+from pyalura.transport import Transport
+from pyalura.utils import HOST
+
+
+def write_cookies(path, session, mtime_ns=None):
+    lines = [
+        f"app.aluracursos.com\tFALSE\t/\tTRUE\t0\t{name}\t{value}"
+        for name, value in (
+            ("SESSION", session),
+            ("caelum.login.token", "token"),
+            ("alura.userId", "42"),
+        )
+    ]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def redirect_to_login(url):
+    return make_response(url, status=302, headers={"location": f"{HOST}/signin"})
+
+
+class ScriptedTransport(Transport):
+    """Transporte que responde con `respond(url)` y cuenta las peticiones."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.urls = []
+
+    def request(self, method, url, **kwargs):
+        self.urls.append(url)
+        return self.respond(url)
+
+
+@pytest.fixture
+def cookies_path(tmp_path):
+    path = tmp_path / "cookies.txt"
+    write_cookies(path, "uno", mtime_ns=1_000_000_000)
+    return path
+
+
+def test_validation_is_cached_for_validation_ttl(cookies_path):
+    manager = CookieManager(str(cookies_path), validation_ttl=300)
+    with mock.patch("requests.get", return_value=make_response(DASHBOARD_URL)) as get:
+        assert manager.check_cookies()
+        assert manager.check_cookies()
+        assert get.call_count == 1
+        assert manager.check_cookies(force=True)
+        assert get.call_count == 2
+
+    manager.validation_ttl = 0
+    with mock.patch("requests.get", return_value=redirect_to_login(DASHBOARD_URL)):
+        assert not manager.check_cookies()
+    assert manager.expired
+
+
+def test_cookies_reload_when_the_file_changes(cookies_path):
+    manager = CookieManager(str(cookies_path), reload_interval=0)
+    assert manager.get_cookies()["SESSION"] == "uno"
+
+    write_cookies(cookies_path, "dos", mtime_ns=2_000_000_000)
+    assert manager.get_cookies()["SESSION"] == "dos"
+
+
+def test_cookie_file_is_not_checked_within_reload_interval(cookies_path):
+    manager = CookieManager(str(cookies_path), reload_interval=3600)
+    manager.get_cookies()
+
+    write_cookies(cookies_path, "dos", mtime_ns=2_000_000_000)
+    assert manager.get_cookies()["SESSION"] == "uno"
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        (redirect_to_login(DASHBOARD_URL), True),
+        (make_response(f"{HOST}/loginForm?next=/dashboard"), True),
+        (make_response(DASHBOARD_URL), False),
+        (
+            make_response(
+                DASHBOARD_URL, status=302, headers={"location": "/course/x/task/1"}
+            ),
+            False,
+        ),
+    ],
+)
+def test_is_login_redirect(response, expected):
+    assert CookieManager.is_login_redirect(response) is expected
+
+
+def test_expired_session_fails_fast_until_the_file_changes(cookies_path):
+    manager = CookieManager(str(cookies_path), reload_interval=0)
+    manager.get_cookies()
+    manager.mark_expired()
+
+    with pytest.raises(SessionExpiredError):
+        manager.ensure_session()
+
+    write_cookies(cookies_path, "dos", mtime_ns=2_000_000_000)
+    manager.ensure_session()
+    assert not manager.expired
+
+
+def test_make_request_raises_on_login_redirect(cookies_path):
+    manager = CookieManager(str(cookies_path), reload_interval=0)
+    transport = ScriptedTransport(redirect_to_login)
+    base = Base(cookie_manager=manager, transport=transport)
+    url = f"{HOST}/course/curso-de-prueba"
+
+    with pytest.raises(SessionExpiredError):
+        base._make_request(url)
+    assert manager.expired
+
+    # Las peticiones siguientes fallan sin llegar al transporte.
+    with pytest.raises(SessionExpiredError):
+        base._make_request(url)
+    assert transport.urls == [url]
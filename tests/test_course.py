@@ -0,0 +1,83 @@
+import threading
+import time
+
+from fake_alura import FakeAlura
+
+from pyalura.course import Course
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def load(course: Course) -> list[str]:
+    course.subcategory
+    return [item.taks_id for section in course.sections for item in section.items]
+
+
+def run_threads(target, count: int = 8):
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def run():
+        barrier.wait()
+        try:
+            target()
+        except Exception as e:  # pragma: no cover - se informa abajo
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def slow(fake: FakeAlura):
+    """Hace que cada peticion tarde, para que los hilos se crucen."""
+    handle = fake.handle
+
+    def delayed(method, url, **kwargs):
+        time.sleep(0.01)
+        return handle(method, url, **kwargs)
+
+    fake.handle = delayed
+
+
+def test_concurrent_loads_are_single_flight():
+    with FakeAlura() as fake:
+        slow(fake)
+        expected = load(Course(COURSE_URL))
+        serial_requests = fake.requests
+        fake.requests = 0
+
+        course = Course(COURSE_URL)
+        results = []
+        run_threads(lambda: results.append(load(course)))
+
+    assert fake.requests == serial_requests
+    assert results == [expected] * 8
+
+
+def test_release_racing_with_reloads():
+    with FakeAlura() as fake:
+        slow(fake)
+        course = Course(COURSE_URL)
+        expected = load(course)
+        stop = threading.Event()
+        results = []
+
+        def release():
+            while not stop.is_set():
+                course.release()
+                time.sleep(0.002)
+
+        releaser = threading.Thread(target=release)
+        releaser.start()
+        try:
+            run_threads(lambda: results.extend(load(course) for _ in range(3)))
+        finally:
+            stop.set()
+            releaser.join()
+
+    # Cada recorrido ve el curso completo, aunque se libere a mitad.
+    assert results == [expected] * 24
@@ -0,0 +1,107 @@
+import json
+import socket
+import time
+
+from fake_alura import FakeAlura
+
+from pyalura.daemon import DONE, QUEUED, Daemon, send_command
+from pyalura.transport import HTTPTransport
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def test_inbox_accepts_valid_files_and_rejects_invalid_ones(tmp_path):
+    inbox = tmp_path / "entrada"
+    inbox.mkdir()
+    (inbox / "uno.json").write_text(
+        json.dumps({"action": "download", "url": COURSE_URL})
+    )
+    (inbox / "lista.json").write_text(
+        json.dumps(
+            [
+                {"action": "sync", "url": COURSE_URL},
+                {"action": "complete", "url": COURSE_URL},
+            ]
+        )
+    )
+    # Un trabajo invalido rechaza el archivo entero.
+    (inbox / "mala.json").write_text(
+        json.dumps([{"action": "download", "url": COURSE_URL}, {"action": "borrar"}])
+    )
+    (inbox / "roto.json").write_text("{no es json")
+    daemon = Daemon(tmp_path / "descargas", inbox=inbox, check_cookies=False)
+
+    assert daemon.scan_inbox() == 3
+
+    assert sorted(p.name for p in (inbox / "accepted").iterdir()) == [
+        "lista.json",
+        "uno.json",
+    ]
+    assert sorted(p.name for p in (inbox / "rejected").iterdir()) == [
+        "mala.json",
+        "roto.json",
+    ]
+    status = json.loads((inbox / "status.json").read_text())
+    assert status["jobs"][QUEUED] == 3
+    assert [job["action"] for job in status["recent"]] == [
+        "sync",
+        "complete",
+        "download",
+    ]
+
+
+def test_handle_command_rejects_non_objects(tmp_path):
+    daemon = Daemon(tmp_path / "descargas", check_cookies=False)
+    for command in ([1, 2], "status", 3, None):
+        reply = daemon.handle_command(command)
+        assert reply["ok"] is False
+        assert "objeto JSON" in reply["error"]
+    assert daemon.status()["jobs"][QUEUED] == 0
+
+
+def wait_for_jobs(socket_path, state, count, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = send_command(socket_path, {"action": "status"})["status"]
+        if status["jobs"][state] == count:
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"Los trabajos no llegaron a {state}: {status['jobs']}")
+
+
+def test_socket_round_trip(tmp_path):
+    socket_path = tmp_path / "pyalura.sock"
+    with FakeAlura():
+        daemon = Daemon(
+            tmp_path / "descargas",
+            socket_path=socket_path,
+            check_cookies=False,
+            transport=HTTPTransport(),
+        )
+        daemon.start()
+        try:
+            reply = send_command(socket_path, {"action": "download", "url": COURSE_URL})
+            assert reply["ok"] is True
+            assert reply["job"]["id"] == 1
+
+            reply = send_command(socket_path, {"action": "borrar", "url": COURSE_URL})
+            assert reply == {"ok": False, "error": "Accion desconocida: borrar"}
+
+            # Lineas que no son un trabajo: la conexion sigue atendiendo.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(10)
+                client.connect(str(socket_path))
+                with client.makefile("rwb") as stream:
+                    stream.write(b"{no es json\n[1]\n")
+                    stream.flush()
+                    replies = [json.loads(stream.readline()) for _ in range(2)]
+            assert [reply["ok"] for reply in replies] == [False, False]
+
+            status = wait_for_jobs(socket_path, DONE, 1)
+            assert status["metrics"]["jobs_done"] == 1
+        finally:
+            assert send_command(socket_path, {"action": "stop"}) == {"ok": True}
+            for thread in daemon._threads:
+                thread.join(timeout=10)
+
+    assert not socket_path.exists()
@@ -0,0 +1,116 @@
+import logging
+
+import pytest
+import requests
+from fake_alura import FakeAlura, make_response
+
+from pyalura.clock import SimulatedClock
+from pyalura.course import Course
+from pyalura.downloader import Downloader
+from pyalura.rate_limit import AdaptiveLimiter
+from pyalura.retry import IncompleteDownloadError, RetryPolicy
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+VIDEO_URL = "https://app.aluracursos.com/fake-video/hd.mp4"
+
+
+@pytest.fixture
+def fake():
+    with FakeAlura() as fake:
+        yield fake
+
+
+def first_video(**kwargs):
+    course = Course(COURSE_URL, **kwargs)
+    return next(item for item in course.sections[0].items if item.is_video)
+
+
+def test_stream_retries_are_not_multiplied(fake, tmp_path):
+    video_requests = []
+    handle = fake.handle
+
+    def unavailable(method, url, **kwargs):
+        if url == VIDEO_URL:
+            video_requests.append(url)
+            return make_response(url, "", status=503)
+        return handle(method, url, **kwargs)
+
+    fake.handle = unavailable
+    clock = SimulatedClock()
+    retry_policy = RetryPolicy(max_retries=2)
+    item = first_video(retry_policy=retry_policy, clock=clock)
+    downloader = Downloader(tmp_path, retry_policy=retry_policy, clock=clock)
+
+    with pytest.raises(requests.HTTPError):
+        downloader._stream_to_storage(item, VIDEO_URL, "curso/video.mp4")
+
+    # Un intento y dos reintentos, no (1 + 2) * (1 + 2).
+    assert len(video_requests) == 3
+    assert clock.sleeps == 2
+
+
+def test_truncated_stream_is_retried(fake, tmp_path):
+    video_requests = []
+    handle = fake.handle
+
+    def truncated(method, url, **kwargs):
+        if url == VIDEO_URL:
+            video_requests.append(url)
+            return make_response(url, b"x" * 50, headers={"Content-Length": "100"})
+        return handle(method, url, **kwargs)
+
+    fake.handle = truncated
+    clock = SimulatedClock()
+    retry_policy = RetryPolicy(max_retries=2)
+    item = first_video(retry_policy=retry_policy, clock=clock)
+    downloader = Downloader(tmp_path, retry_policy=retry_policy, clock=clock)
+
+    with pytest.raises(IncompleteDownloadError):
+        downloader._stream_to_storage(item, VIDEO_URL, "curso/video.mp4")
+    assert len(video_requests) == 3
+    assert not downloader.storage.exists("curso/video.mp4")
+
+
+def test_stream_stays_in_flight_until_closed(fake):
+    limiter = AdaptiveLimiter(initial_limit=4)
+    item = first_video(rate_limiter=limiter)
+
+    response = item.get_resource_stream(VIDEO_URL)
+    assert limiter.in_flight == 1
+
+    response.close()
+    response.close()
+    assert limiter.in_flight == 0
+
+
+def test_course_with_failed_items_is_not_saved_in_history(fake, tmp_path):
+    handle = fake.handle
+    fake.handle = lambda method, url, **kw: (
+        make_response(url, "", status=404)
+        if url == VIDEO_URL
+        else handle(method, url, **kw)
+    )
+    downloader = Downloader(tmp_path, retry_policy=RetryPolicy(max_retries=0))
+
+    assert downloader.download_course(COURSE_URL) is False
+    assert downloader._load_history() == []
+    assert downloader.metrics.snapshot()["items_failed"] == 3
+
+    # Con los videos disponibles, solo se descargan los que faltaban.
+    fake.handle = handle
+    assert downloader.download_course(COURSE_URL) is True
+    assert downloader._load_history() == [COURSE_URL]
+
+
+@pytest.mark.parametrize("level, reads", [(logging.INFO, 0), (logging.DEBUG, 1)])
+def test_peak_rss_is_read_only_when_debug_is_enabled(
+    fake, tmp_path, caplog, level, reads
+):
+    caplog.set_level(level, logger="pyalura.downloader")
+    downloader = Downloader(tmp_path / "descargas")
+    snapshots = []
+    snapshot = downloader.metrics.snapshot
+    downloader.metrics.snapshot = lambda: snapshots.append(1) or snapshot()
+
+    assert downloader.download_course(COURSE_URL)
+    assert len(snapshots) == reads
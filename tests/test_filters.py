@@ -0,0 +1,113 @@
+import pytest
+from fake_alura import FakeAlura
+
+from pyalura.course import Course
+from pyalura.downloader import Downloader
+from pyalura.filters import ItemFilter
+from pyalura.item import Item, QuestionItem, VideoItem
+from pyalura.utils import ArticleType
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+@pytest.fixture
+def fake():
+    with FakeAlura(sections=3, items=4) as fake:
+        urls = []
+        handle = fake.handle
+
+        def record(method, url, **kwargs):
+            urls.append(url)
+            return handle(method, url, **kwargs)
+
+        fake.handle = record
+        fake.urls = urls
+        yield fake
+
+
+@pytest.fixture
+def get_content_calls(monkeypatch):
+    calls = []
+    for cls in (Item, VideoItem, QuestionItem):
+        original = cls.__dict__["get_content"]
+
+        def spy(self, original=original):
+            calls.append(self.taks_id)
+            return original(self)
+
+        monkeypatch.setattr(cls, "get_content", spy)
+    return calls
+
+
+def test_filtered_sections_are_never_requested(fake, tmp_path, get_content_calls):
+    sections = Course(COURSE_URL).sections
+    fake.urls.clear()
+
+    downloader = Downloader(tmp_path / "descargas")
+    assert downloader.download_course(COURSE_URL, ItemFilter(sections="2"))
+
+    assert sections[1].url in fake.urls
+    assert sections[0].url not in fake.urls
+    assert sections[2].url not in fake.urls
+    assert set(get_content_calls) == {"2001", "2002", "2003", "2004"}
+
+
+def test_filtered_items_never_get_content(fake, tmp_path, get_content_calls):
+    downloader = Downloader(tmp_path / "descargas")
+    item_filter = ItemFilter(types=[ArticleType.VIDEO])
+    assert downloader.download_course(COURSE_URL, item_filter)
+
+    # El cuarto item de cada seccion es el video.
+    assert set(get_content_calls) == {"1004", "2004", "3004"}
+
+
+def test_partial_download_is_not_saved_in_history(fake, tmp_path):
+    downloader = Downloader(tmp_path / "descargas")
+
+    assert downloader.download_course(COURSE_URL, ItemFilter(title="Item 1"))
+    assert downloader._load_history() == []
+
+    assert downloader.download_course(COURSE_URL)
+    assert downloader._load_history() == [COURSE_URL]
+
+
+@pytest.mark.parametrize(
+    "max_video_quality, expected", [(None, "hd.mp4"), ("sd", "sd.mp4")]
+)
+def test_max_video_quality_picks_the_download(
+    fake, tmp_path, max_video_quality, expected
+):
+    downloader = Downloader(tmp_path / "descargas")
+    item_filter = ItemFilter(
+        types=[ArticleType.VIDEO], max_video_quality=max_video_quality
+    )
+    assert downloader.download_course(COURSE_URL, item_filter)
+
+    videos = [url.rsplit("/", 1)[-1] for url in fake.urls if "/fake-video/" in url]
+    assert videos == [expected] * 3
+
+
+def test_video_qualities_respect_the_limit():
+    videos = {"sd": {}, "hd": {}, "fullhd": {}}
+    assert ItemFilter().video_qualities(videos) == ["hd", "sd"]
+    assert ItemFilter(max_video_quality="fullhd").video_qualities(videos) == [
+        "fullhd",
+        "hd",
+        "sd",
+    ]
+    assert ItemFilter(max_video_quality="sd").select_video({"hd": {}}) is None
+    with pytest.raises(ValueError):
+        ItemFilter(max_video_quality="4k")
+
+
+def test_unseen_only_checks_items_with_unknown_progress(fake):
+    section = Course(COURSE_URL).sections[0]
+    seen, unseen = section.items[:2]
+    # Como un item sacado del ItemIndex: no se sabe si esta visto.
+    seen.is_marked_as_seen = None
+    unseen.is_marked_as_seen = None
+    section.release()
+
+    item_filter = ItemFilter(unseen_only=True)
+    assert not item_filter.accepts_item(seen)
+    assert item_filter.accepts_item(unseen)
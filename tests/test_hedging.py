@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+from fake_alura import FakeAlura
+
+from pyalura import cli
+from pyalura.course import Course
+from pyalura.hedging import HedgePolicy
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+class SlowLimiter:
+    """Limitador que hace esperar cada peticion antes de salir."""
+
+    def acquire(self):
+        time.sleep(0.05)
+
+    def release(self, **result):
+        pass
+
+
+def test_latency_excludes_the_limiter_wait():
+    hedge_policy = HedgePolicy(min_samples=2, min_delay=0.01)
+    with FakeAlura(sections=3):
+        course = Course(
+            COURSE_URL, rate_limiter=SlowLimiter(), hedge_policy=hedge_policy
+        )
+        for section in course.sections:
+            section.items
+    hedge_policy.close()
+
+    assert len(hedge_policy._latencies) >= 4
+    assert max(hedge_policy._latencies) < 0.05
+    # Las esperas del limitador no cuentan como lentitud: nada se repite.
+    assert hedge_policy.hedged == 0
+
+
+@pytest.mark.parametrize("percentile", ["95", "0", "1"])
+def test_cli_rejects_percentiles_out_of_range(tmp_path, percentile, capsys):
+    jobs = tmp_path / "trabajos.txt"
+    jobs.write_text("", encoding="utf-8")
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main([str(jobs), "--hedge", percentile])
+    assert exit_info.value.code == 2
+    assert "--hedge" in capsys.readouterr().err
+
+
+class FakeResponse:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def warmed_policy(**kwargs) -> HedgePolicy:
+    """Politica con latencias previas de 10 ms, lista para repetir."""
+    hedge_policy = HedgePolicy(min_samples=5, min_delay=0.01, **kwargs)
+    for _ in range(100):
+        hedge_policy.record(0.01)
+    return hedge_policy
+
+
+def scripted_send(delays):
+    """Devuelve un `send` que tarda `delays[n]` segundos en su llamada n."""
+    responses = []
+    lock = threading.Lock()
+
+    def send(timing):
+        with lock:
+            index = len(responses)
+            response = FakeResponse(index)
+            responses.append(response)
+        timing.start()
+        time.sleep(delays[index])
+        timing.stop()
+        return response, None
+
+    return send, responses
+
+
+def test_slow_primary_is_hedged_and_first_response_wins():
+    hedge_policy = warmed_policy(budget=1.0)
+    send, responses = scripted_send([0.5, 0.01])
+
+    response, error = hedge_policy.send(send)
+
+    assert error is None
+    assert response is responses[1]
+    assert hedge_policy.hedged == 1
+    assert hedge_policy.hedge_wins == 1
+    # La original, ya descartada, se cierra en cuanto termina.
+    hedge_policy.close()
+    hedge_policy._executor.shutdown(wait=True)
+    assert responses[0].closed
+    assert not responses[1].closed
+
+
+def test_fast_primary_is_not_hedged():
+    hedge_policy = warmed_policy(budget=1.0)
+    send, responses = scripted_send([0.001])
+
+    response, _ = hedge_policy.send(send)
+    hedge_policy.close()
+
+    assert response is responses[0]
+    assert len(responses) == 1
+    assert hedge_policy.hedged == 0
+
+
+def test_primary_wins_when_the_hedge_is_slower():
+    hedge_policy = warmed_policy(budget=1.0)
+    send, responses = scripted_send([0.1, 0.5])
+
+    response, _ = hedge_policy.send(send)
+    hedge_policy.close()
+    hedge_policy._executor.shutdown(wait=True)
+
+    assert response is responses[0]
+    assert hedge_policy.hedged == 1
+    assert hedge_policy.hedge_wins == 0
+    assert responses[1].closed
+
+
+def test_budget_caps_extra_requests():
+    # Con la mediana, las latencias de esta prueba no suben el plazo.
+    hedge_policy = warmed_policy(budget=0.25, percentile=0.5)
+    send, responses = scripted_send([0.05] * 20)
+
+    for _ in range(8):
+        hedge_policy.send(send)
+    hedge_policy.close()
+
+    # Con 8 peticiones y un 25 % de presupuesto, solo 2 se repiten.
+    assert hedge_policy.hedged == 2
+    assert len(responses) == 10
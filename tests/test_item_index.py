@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+from fake_alura import FakeAlura
+
+from pyalura.course import Course
+from pyalura.item_index import ItemIndex
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def task_url(task_id):
+    return f"{COURSE_URL}/task/{task_id}"
+
+
+@pytest.fixture
+def fake():
+    with FakeAlura() as fake:
+        calls = []
+        handle = fake.handle
+
+        def record(method, url, **kwargs):
+            calls.append((method, url))
+            return handle(method, url, **kwargs)
+
+        fake.handle = record
+        fake.calls = calls
+        yield fake
+
+
+@pytest.fixture
+def item_index(tmp_path):
+    index = ItemIndex(tmp_path / "items.sqlite3")
+    yield index
+    index.close()
+
+
+def index_first_section(item_index):
+    course = Course(COURSE_URL, item_index=item_index)
+    return course.sections[0].items
+
+
+def test_index_stores_seen_state(fake, item_index):
+    items = index_first_section(item_index)
+
+    for item in items:
+        assert item_index.get(item.url)["seen"] == item.is_marked_as_seen
+
+
+def test_item_seen_in_index_does_no_requests(fake, item_index):
+    index_first_section(item_index)
+    fake.calls.clear()
+
+    item = Course.get_item(task_url(1001), item_index=item_index)
+
+    assert item.is_marked_as_seen is True
+    assert item.mark_as_watched() is False
+    assert fake.calls == []
+
+
+def test_item_seen_elsewhere_is_checked_before_marking(fake, item_index):
+    index_first_section(item_index)
+    # El indice se lleno antes de que el item se viera desde el navegador.
+    with sqlite3.connect(item_index.path) as conn:
+        conn.execute("UPDATE items SET seen = 0")
+    fake.calls.clear()
+
+    item = Course.get_item(task_url(1003), item_index=item_index)
+
+    assert item.is_marked_as_seen is None
+    assert item.mark_as_watched() is False
+    # Solo se pidio la seccion, para conocer el progreso.
+    assert fake.calls == [("GET", f"{COURSE_URL}/section/1001/tasks")]
+    assert item.is_marked_as_seen is True
+
+
+def test_marking_updates_index(fake, item_index):
+    index_first_section(item_index)
+
+    video = Course.get_item(task_url(1004), item_index=item_index)
+    assert video.mark_as_watched() is True
+    assert item_index.get(task_url(1004))["seen"] is True
+
+    fake.calls.clear()
+    again = Course.get_item(task_url(1004), item_index=item_index)
+    assert again.mark_as_watched() is False
+    assert fake.calls == []
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+SCRIPT = """
+import logging
+import threading
+
+import pyalura.downloader
+
+assert threading.active_count() == 1, threading.enumerate()
+logging.getLogger("pyalura.prueba").info("hola %s", "mundo")
+assert threading.active_count() == 2, threading.enumerate()
+"""
+
+
+def test_listener_starts_with_the_first_record(tmp_path):
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    subprocess.run([sys.executable, "-c", SCRIPT], cwd=tmp_path, env=env, check=True)
+    lines = (tmp_path / "alura.log").read_text(encoding="utf-8").splitlines()
+    assert "Incio del programa" in "\n".join(lines[:4])
+    assert lines[-1].endswith("pyalura.prueba - hola mundo")
@@ -0,0 +1,113 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+from fake_alura import FakeAlura
+
+from pyalura import media
+from pyalura.clock import SimulatedClock
+from pyalura.course import Course
+from pyalura.pacing import PacingPolicy, PacingScheduler
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def box(box_type: bytes, content: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(content), box_type) + content
+
+
+def mvhd(timescale: int, duration: int, version: int = 0) -> bytes:
+    if version == 1:
+        content = (
+            bytes([1, 0, 0, 0]) + bytes(16) + struct.pack(">IQ", timescale, duration)
+        )
+    else:
+        content = bytes(4) + bytes(8) + struct.pack(">II", timescale, duration)
+    return box(b"mvhd", content + bytes(80))
+
+
+def mp4(moov: bytes, mdat_size: int = 0) -> bytes:
+    """MP4 minimo: ftyp, un mdat de `mdat_size` bytes y despues moov."""
+    return box(b"ftyp", b"isom" + bytes(4)) + box(b"mdat", bytes(mdat_size)) + moov
+
+
+def item(kind: str):
+    return SimpleNamespace(is_question=kind == "question", is_video=kind == "video")
+
+
+def test_pacing_policy_waits():
+    pacing = PacingPolicy(
+        video_fraction=0.5,
+        min_video_seconds=15,
+        max_video_seconds=600,
+        default_video_seconds=300,
+        question_seconds=40,
+        document_seconds=20,
+    )
+    assert pacing.wait_for(item("question")) == 40
+    assert pacing.wait_for(item("document")) == 20
+    assert pacing.wait_for(item("video")) == 300
+    assert pacing.wait_for(item("video"), 200) == 100
+    assert pacing.wait_for(item("video"), 10) == 15
+    assert pacing.wait_for(item("video"), 3600) == 600
+
+
+def test_scheduler_discounts_work_done_since_defer():
+    clock = SimulatedClock()
+    scheduler = PacingScheduler(clock)
+    scheduler.wait()
+    assert clock.elapsed == 0
+
+    scheduler.defer(90)
+    clock.advance(30)  # Trabajo hecho mientras tanto.
+    assert scheduler.remaining == 60
+    scheduler.wait()
+    assert clock.elapsed == 90
+    assert scheduler.remaining == 0
+
+    # Un plazo mas corto no adelanta uno ya fijado.
+    scheduler.defer(50)
+    scheduler.defer(10)
+    scheduler.wait()
+    assert clock.elapsed == 140
+
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_parse_mp4_duration(version):
+    data = mp4(box(b"moov", mvhd(1000, 125_500, version)))
+    assert media.parse_mp4_duration(data) == 125.5
+
+
+def test_parse_mp4_duration_without_moov():
+    data = mp4(b"", mdat_size=64)
+    assert media.parse_mp4_duration(data) is None
+    assert media.next_box_offset(data) is None
+
+
+def test_probe_reads_past_mdat_with_ranges():
+    data = mp4(box(b"moov", mvhd(600, 600 * 42)), mdat_size=200_000)
+    reads = []
+
+    def read_range(url, offset, size):
+        reads.append(offset)
+        return data[offset : offset + size]
+
+    with FakeAlura(sections=1, items=4):
+        video = Course(COURSE_URL).sections[0].items[3]
+        assert video.is_video
+        video._read_range = read_range
+        duration = video._probe_mp4_duration("https://cdn/video.mp4", chunk_size=4096)
+
+    assert duration == 42
+    # La segunda lectura salta el mdat entero y empieza en moov.
+    assert reads == [0, data.index(b"moov") - 4]
+
+
+def test_complete_all_activities_waits_after_the_last_item():
+    clock = SimulatedClock()
+    pacing = PacingPolicy(question_seconds=60, document_seconds=20)
+    # Dos items: el primero ya esta visto y el segundo es una pregunta.
+    with FakeAlura(sections=1, items=2, patch_sleeps=False):
+        Course(COURSE_URL, clock=clock).complete_all_activities(pacing)
+
+    assert clock.elapsed == 60
@@ -0,0 +1,45 @@
+import threading
+import time
+from unittest import mock
+
+from pyalura import parsing
+from pyalura.parsing import ParserPool
+
+
+class SlowExecutor:
+    created = 0
+
+    def __init__(self, max_workers):
+        # Lo bastante lento para que varios hilos lleguen a la vez.
+        time.sleep(0.05)
+        SlowExecutor.created += 1
+
+    def shutdown(self):
+        pass
+
+
+def test_parser_pool_creates_one_executor_for_all_threads():
+    pool = ParserPool(2)
+    barrier = threading.Barrier(8)
+    executors = []
+
+    def get():
+        barrier.wait()
+        executors.append(pool._get_executor())
+
+    with mock.patch.object(parsing, "ProcessPoolExecutor", SlowExecutor):
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.shutdown()
+
+    assert SlowExecutor.created == 1
+    assert len({id(executor) for executor in executors}) == 1
+
+
+def test_parser_pool_without_workers_runs_inline():
+    with ParserPool(0) as pool:
+        assert pool.run(parsing.parse_section_page, b"<html></html>") == []
+        assert pool._executor is None
@@ -0,0 +1,45 @@
+from pyalura.quality import QualityPolicy
+
+VIDEOS = {quality: {"mp4": f"https://cdn/{quality}.mp4"} for quality in ("hd", "sd")}
+SIZES = {"https://cdn/hd.mp4": 60, "https://cdn/sd.mp4": 30}
+QUALITIES = ["hd", "sd"]
+
+
+class FakeVideo:
+    def __init__(self, url):
+        self.url = url
+        self.title = url
+        self.heads = 0
+
+    def get_resource_size(self, url):
+        self.heads += 1
+        return SIZES[url]
+
+    def get_duration(self):
+        return None
+
+
+def test_concurrent_choices_reserve_the_budget():
+    policy = QualityPolicy(byte_budget=100)
+    first, second, third = FakeVideo("a"), FakeVideo("b"), FakeVideo("c")
+
+    # Las tres eligen antes de que termine ninguna descarga.
+    assert policy.choose(first, VIDEOS, QUALITIES) == "hd"
+    assert policy.choose(second, VIDEOS, QUALITIES) == "sd"
+    assert policy.reserved == 90
+
+    policy.record(60, 1.0, first)
+    policy.release(second)
+    assert (policy.spent, policy.reserved) == (60, 0)
+    assert policy.choose(third, VIDEOS, QUALITIES) == "sd"
+
+
+def test_previous_quality_is_rechecked():
+    policy = QualityPolicy(byte_budget=100)
+    policy.record(50, 1.0)
+    item = FakeVideo("a")
+
+    assert policy.choose(item, VIDEOS, QUALITIES, previous="hd") == "sd"
+    # El tamaño de la calidad anterior no se vuelve a pedir.
+    assert item.heads == 2
+    assert policy.choose(FakeVideo("b"), VIDEOS, QUALITIES, previous="sd") == "sd"
@@ -0,0 +1,103 @@
+import pytest
+
+from pyalura.clock import SimulatedClock
+from pyalura.rate_limit import AdaptiveLimiter, RateLimiter
+
+
+def in_flight(limiter: AdaptiveLimiter, count: int):
+    for _ in range(count):
+        assert limiter.acquire(timeout=0)
+
+
+def test_burst_of_failures_halves_the_limit_once():
+    clock = SimulatedClock()
+    limiter = AdaptiveLimiter(initial_limit=16, max_limit=16, clock=clock)
+    in_flight(limiter, 8)
+
+    for _ in range(8):
+        limiter.release(status=503)
+    assert limiter.limit == 8
+
+    # Pasada la ventana, una nueva falla vuelve a reducir.
+    clock.advance(1.0)
+    in_flight(limiter, 1)
+    limiter.release(status=None)
+    assert limiter.limit == 4
+
+
+def test_window_is_the_typical_latency():
+    clock = SimulatedClock()
+    limiter = AdaptiveLimiter(initial_limit=8, clock=clock)
+    in_flight(limiter, 1)
+    limiter.release(latency=5.0, status=200)
+    in_flight(limiter, 2)
+    limiter.release(status=429)
+    limit = limiter.limit
+
+    clock.advance(2.0)
+    limiter.release(status=429)
+    assert limiter.limit == limit
+    clock.advance(3.0)
+    in_flight(limiter, 1)
+    limiter.release(status=429)
+    assert limiter.limit == limit / 2
+
+
+def test_healthy_responses_raise_the_limit_additively():
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=3, clock=SimulatedClock())
+    # +1/limite por respuesta: 2 -> 2.5 -> 2.9 -> 3 (el maximo).
+    for _ in range(2):
+        in_flight(limiter, 1)
+        limiter.release(latency=0.1, status=200)
+    assert limiter.limit == pytest.approx(2.9)
+    in_flight(limiter, 1)
+    limiter.release(latency=0.1, status=200)
+    assert limiter.limit == 3
+    in_flight(limiter, 1)
+    limiter.release(latency=0.1, status=200)
+    assert limiter.limit == 3
+
+
+def test_slow_response_decreases_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=8, clock=SimulatedClock())
+    in_flight(limiter, 2)
+    limiter.release(latency=0.1, status=200)
+    limiter.release(latency=1.0, status=200)
+    assert limiter.limit < 8
+
+
+def test_limit_never_goes_below_min_limit():
+    clock = SimulatedClock()
+    limiter = AdaptiveLimiter(initial_limit=2, min_limit=1, clock=clock)
+    for _ in range(5):
+        in_flight(limiter, 1)
+        limiter.release(status=500)
+        clock.advance(1.0)
+    assert limiter.limit == 1
+
+
+def test_acquire_waits_for_a_free_slot():
+    limiter = AdaptiveLimiter(initial_limit=1, clock=SimulatedClock())
+    in_flight(limiter, 1)
+    assert limiter.acquire(timeout=0) is False
+    limiter.release(latency=0.1, status=200)
+    assert limiter.acquire(timeout=0)
+
+
+def test_retry_after_pauses_every_request():
+    clock = SimulatedClock()
+    limiter = AdaptiveLimiter(initial_limit=4, clock=clock)
+    in_flight(limiter, 1)
+    limiter.release(status=429, retry_after=10)
+
+    assert limiter.acquire(timeout=5) is False
+    assert limiter.acquire()
+    assert clock.elapsed >= 10
+
+
+def test_rate_limiter_spaces_requests():
+    clock = SimulatedClock()
+    limiter = RateLimiter(requests_per_second=2, burst=1, clock=clock)
+    for _ in range(5):
+        assert limiter.acquire()
+    assert clock.elapsed == 2.0
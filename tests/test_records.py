@@ -0,0 +1,90 @@
+from fake_alura import FakeAlura
+
+from pyalura.course import Course
+from pyalura.records import CatalogStore
+from pyalura.utils import ArticleType
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def test_course_tree_round_trip():
+    store = CatalogStore()
+    with FakeAlura(sections=2, items=4):
+        course = Course(COURSE_URL)
+        view = store.add_course(course)
+        sections = course.sections
+
+        assert view.url == COURSE_URL
+        assert view.title == course.title
+        assert view.subcategory == course.subcategory
+        assert len(view.sections) == len(sections) == 2
+        for section_view, section in zip(view.sections, sections):
+            assert section_view.index == section.index
+            assert section_view.title == section.title
+            assert section_view.url == section.url
+            assert section_view.course.url == COURSE_URL
+            assert len(section_view.items) == len(section.items) == 4
+            for item_view, item in zip(section_view.items, section.items):
+                assert item_view.url == item.url
+                assert item_view.taks_id == item.taks_id
+                assert item_view.title == item.title
+                assert item_view.index == item.index
+                assert item_view.type == item.type
+                assert item_view.is_marked_as_seen == bool(item.is_marked_as_seen)
+                assert item_view.is_video == item.is_video
+                assert item_view.is_question == item.is_question
+                assert item_view.section.title == section.title
+                assert item_view.course.url == COURSE_URL
+
+    assert len(store) == 8
+    assert [item.taks_id for item in store.iter_items()] == [
+        item.taks_id for item in view.iter_items()
+    ]
+    # Un curso ya guardado no se duplica.
+    assert store.add_course_data(COURSE_URL, "otro", None, []).title == view.title
+    assert len(list(store.iter_courses())) == 1
+    assert store.get_course(f"{COURSE_URL}/task/1001").url == COURSE_URL
+    assert store.get_course("https://app.aluracursos.com/course/otro") is None
+
+
+def test_item_urls_outside_the_task_format_are_kept():
+    store = CatalogStore()
+    url = "https://app.aluracursos.com/course/otro-curso"
+    view = store.add_course_data(
+        url,
+        "otro-curso",
+        "programacion",
+        [
+            {
+                "name": "01. Primera",
+                "url": f"{url}/section/1/tasks",
+                "items": [
+                    {
+                        "url": f"{url}/task/77",
+                        "title": "Video",
+                        "index": "01",
+                        "type": ArticleType.VIDEO,
+                        "is_marked_as_seen": True,
+                    },
+                    {
+                        "url": "https://cursos.alura.com.br/extra/lectura",
+                        "title": "Lectura",
+                        "index": "02",
+                        "type": ArticleType.TEXT_CONTENT,
+                        "is_marked_as_seen": None,
+                    },
+                ],
+            }
+        ],
+    )
+
+    section = view.sections[0]
+    assert (section.index, section.title) == ("01", "Primera")
+    video, reading = section.items
+    assert video.url == f"{url}/task/77"
+    assert video.taks_id == "77"
+    assert video.is_video and video.is_marked_as_seen
+    assert reading.url == "https://cursos.alura.com.br/extra/lectura"
+    assert reading.taks_id == "lectura"
+    assert reading.type == ArticleType.TEXT_CONTENT
+    assert not reading.is_question and not reading.is_marked_as_seen
@@ -0,0 +1,62 @@
+from fake_pages import task_page
+
+from pyalura.answer_store import AnswerStore
+from pyalura.page_store import PageStore
+from pyalura.parsing import ParserPool
+from pyalura.rerender import rerender
+from pyalura.storage import get_storage
+
+TASK_URL = "https://app.aluracursos.com/course/curso-de-prueba/task/1002"
+KEY = "Programacion/curso-de-prueba/01 - Seccion/02 - Pregunta.md"
+
+
+def question_page(article_type: str = "SINGLE_CHOICE") -> bytes:
+    nav = (
+        "<ul class='task-menu-nav-list'><li>"
+        "<a href='/course/curso-de-prueba/task/1002'>"
+        "<span class='task-menu-nav-item-number'>2</span>"
+        "<span title='Pregunta'>Pregunta</span>"
+        "<svg class='task-menu-nav-item-svg'>"
+        f"<use xlink:href='#{article_type}'></use></svg></a></li></ul>"
+    )
+    page = task_page(paragraphs=2, alternatives=3)
+    return page.replace("<body>", f"<body>{nav}").encode("utf-8")
+
+
+def run(tmp_path, raw: bytes, answer_store: AnswerStore) -> dict:
+    page_store = PageStore(tmp_path / "pages.sqlite3")
+    page_store.put(KEY, TASK_URL, raw, is_question=True)
+    storage = get_storage("folder", tmp_path / "out")
+    try:
+        with ParserPool(0) as parser_pool:
+            return rerender(storage, page_store, parser_pool, answer_store=answer_store)
+    finally:
+        storage.close()
+        page_store.close()
+
+
+def test_rerender_refreshes_answer_store(tmp_path):
+    answer_store = AnswerStore(tmp_path / "answers.sqlite3")
+
+    result = run(tmp_path, question_page("SINGLE_CHOICE"), answer_store)
+
+    assert result["written"] == 1
+    assert result["answers"] == 1
+    assert answer_store.get("1002") == {
+        "alternatives": ["0"],
+        "choice_type": "singlechoice",
+    }
+
+
+def test_rerender_keeps_stored_choice_type_without_menu(tmp_path):
+    answer_store = AnswerStore(tmp_path / "answers.sqlite3")
+    answer_store.put("1002", ["7"], "multiplechoice")
+    raw = task_page(paragraphs=2, alternatives=3).encode("utf-8")
+
+    result = run(tmp_path, raw, answer_store)
+
+    assert result["answers"] == 1
+    assert answer_store.get("1002") == {
+        "alternatives": ["0"],
+        "choice_type": "multiplechoice",
+    }
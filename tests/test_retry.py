@@ -0,0 +1,82 @@
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+from fake_alura import FakeAlura, make_response
+
+from pyalura.clock import SimulatedClock
+from pyalura.course import Course
+from pyalura.rate_limit import AdaptiveLimiter
+from pyalura.retry import IncompleteDownloadError, RetryPolicy, parse_retry_after
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def response(status=200, headers=None):
+    return make_response(COURSE_URL, "", status, headers)
+
+
+def test_only_idempotent_methods_are_retried():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry("GET", 0, response=response(503))
+    assert policy.should_retry("head", 1, response=response(429))
+    assert not policy.should_retry("POST", 0, response=response(503))
+    assert not policy.should_retry("GET", 2, response=response(503))
+    assert not policy.should_retry("GET", 0, response=response(404))
+
+
+def test_network_errors_are_retried():
+    policy = RetryPolicy()
+    assert policy.should_retry("GET", 0, error=requests.ConnectionError())
+    assert policy.should_retry("GET", 0, error=IncompleteDownloadError())
+    assert not policy.should_retry("GET", 0, error=requests.TooManyRedirects())
+
+
+def test_backoff_is_capped_full_jitter():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+    rng = random.Random(0)
+    delays = [policy.delay(10, rng=rng) for _ in range(100)]
+    assert all(0 <= delay <= 5.0 for delay in delays)
+    assert all(policy.delay(0, rng=rng) <= 1.0 for _ in range(100))
+
+
+def test_retry_after_in_seconds_and_as_date():
+    assert parse_retry_after(response(429, {"Retry-After": "7"})) == 7.0
+    date = datetime.now(timezone.utc) + timedelta(seconds=30)
+    seconds = parse_retry_after(response(503, {"Retry-After": format_datetime(date)}))
+    assert 25 < seconds <= 30
+    assert parse_retry_after(response(503, {"Retry-After": "pronto"})) is None
+    assert parse_retry_after(response(503)) is None
+
+    policy = RetryPolicy(backoff_max=20)
+    assert policy.delay(0, response(429, {"Retry-After": "7"})) == 7.0
+    assert policy.delay(0, response(429, {"Retry-After": "90"})) == 20
+
+
+@pytest.mark.parametrize("limited", [False, True])
+def test_request_waits_retry_after_then_succeeds(limited):
+    clock = SimulatedClock()
+    limiter = AdaptiveLimiter(initial_limit=4, clock=clock) if limited else None
+    calls = []
+
+    with FakeAlura() as fake:
+        handle = fake.handle
+
+        def busy(method, url, **kwargs):
+            calls.append(url)
+            if len(calls) <= 2:
+                return make_response(url, "", 503, {"Retry-After": "12"})
+            return handle(method, url, **kwargs)
+
+        fake.handle = busy
+        course = Course(COURSE_URL, rate_limiter=limiter, clock=clock)
+        assert course.subcategory == "programacion"
+
+    assert len(calls) == 3
+    # Dos esperas de 12s, las del reintento; el limitador ya no pausa mas.
+    assert clock.elapsed == 24
+    if limited:
+        # Dos reducciones separadas por la espera (4 -> 2 -> 1) y una respuesta sana.
+        assert limiter.limit == 2
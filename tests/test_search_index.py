@@ -0,0 +1,79 @@
+import os
+
+from fake_alura import FakeAlura
+
+from pyalura.downloader import Downloader
+from pyalura.search_index import SearchIndex
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+
+def write_lesson(path, title, text, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"# {title}\n\n{text}\n", encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_update_folder_only_indexes_changes(tmp_path):
+    base = tmp_path / "descargas"
+    section = base / "programacion" / "curso-python" / "01-inicio"
+    write_lesson(section / "01-variables.md", "Variables", "Una variable guarda datos.")
+    write_lesson(section / "02-funciones.md", "Funciones", "Una funcion se define.")
+    index = SearchIndex(tmp_path / "indice.sqlite3", base)
+
+    assert index.update_folder() == 2
+    assert index.update_folder() == 0
+
+    write_lesson(
+        section / "02-funciones.md", "Funciones", "Se usa lambda.", mtime=1_000_000
+    )
+    (section / "01-variables.md").unlink()
+    assert index.update_folder() == 1
+    assert len(index) == 1
+    [result] = index.search("lambda")
+    assert result["path"] == "programacion/curso-python/01-inicio/02-funciones.md"
+    assert result["course"] == "curso-python"
+    assert result["section"] == "01-inicio"
+    assert result["subcategory"] == "programacion"
+    assert index.search("variable") == []
+
+
+def test_search_by_prefix_and_without_accents(tmp_path):
+    index = SearchIndex(tmp_path / "indice.sqlite3")
+    index.add_document(
+        tmp_path / "a.md",
+        "Programación asíncrona con corrutinas",
+        {"title": "Asincronía", "course": "curso-a"},
+    )
+    index.add_document(
+        tmp_path / "b.md",
+        "Listas y diccionarios",
+        {"title": "Colecciones", "course": "curso-b"},
+    )
+
+    assert [r["title"] for r in index.search("programacion")] == ["Asincronía"]
+    assert [r["title"] for r in index.search("ASINCRONA")] == ["Asincronía"]
+    assert [r["title"] for r in index.search("corru*")] == ["Asincronía"]
+    assert index.search("corru") == []
+    assert [r["title"] for r in index.search("dicc*", course="curso-b")] == [
+        "Colecciones"
+    ]
+    assert index.search("dicc*", course="curso-a") == []
+    # Las comillas y operadores de FTS5 se buscan como texto.
+    assert index.search('"listas" OR') == []
+
+
+def test_downloader_indexes_each_lesson(tmp_path):
+    base = tmp_path / "descargas"
+    index = SearchIndex(tmp_path / "indice.sqlite3", base)
+    with FakeAlura(sections=1, items=4):
+        assert Downloader(base, search_index=index).download_course(COURSE_URL)
+
+    results = index.search("consectetur")
+    assert results
+    assert {r["course"] for r in results} == {"curso-de-prueba"}
+    assert {r["subcategory"] for r in results} == {"programacion"}
+    assert all(r["url"].startswith(f"{COURSE_URL}/task/") for r in results)
+    # Lo que ya indexo el Downloader no se vuelve a indexar.
+    assert index.update_folder() == 0
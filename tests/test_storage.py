@@ -0,0 +1,180 @@
+import subprocess
+import sys
+import threading
+import zipfile
+
+import pytest
+from conftest import ROOT
+
+from pyalura.storage import (
+    PARTIAL_PREFIX,
+    SQLiteStorage,
+    Storage,
+    ZipStorage,
+    get_storage,
+)
+
+
+def test_storage_is_abstract():
+    with pytest.raises(TypeError):
+        Storage()
+
+
+@pytest.mark.parametrize("kind", ["zip", "sqlite"])
+def test_stream_does_not_block_the_archive(tmp_path, kind):
+    storage = get_storage(kind, tmp_path)
+    streaming = threading.Event()
+    written = threading.Event()
+
+    def stream():
+        with storage.open_write("sub/curso/1 - Seccion/video.mp4") as f:
+            f.write(b"a" * 1000)
+            streaming.set()
+            # Mientras el video sigue en curso, otra leccion del mismo curso se guarda.
+            assert written.wait(5)
+            f.write(b"b" * 1000)
+
+    thread = threading.Thread(target=stream)
+    thread.start()
+    assert streaming.wait(5)
+    storage.write_text("sub/curso/1 - Seccion/texto.md", "# Hola")
+    written.set()
+    thread.join()
+
+    assert storage.read_bytes("sub/curso/1 - Seccion/texto.md") == b"# Hola"
+    video = storage.read_bytes("sub/curso/1 - Seccion/video.mp4")
+    assert video == b"a" * 1000 + b"b" * 1000
+    storage.close()
+
+
+@pytest.mark.parametrize("kind", ["zip", "sqlite"])
+def test_failed_write_keeps_nothing(tmp_path, kind):
+    storage = get_storage(kind, tmp_path)
+    key = "sub/curso/1 - Seccion/video.mp4"
+    storage.write_text(key, "viejo")
+    with pytest.raises(RuntimeError):
+        with storage.open_write(key) as f:
+            f.write(b"nuevo")
+            raise RuntimeError("corte")
+    if kind == "zip":
+        # Un zip no puede volver a la entrada anterior: queda marcada como borrada.
+        assert not storage.exists(key)
+    else:
+        assert storage.read_bytes(key) == b"viejo"
+        conn = storage._archive("sub/curso")
+        assert conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 1
+    storage.close()
+
+
+def test_sqlite_drops_chunks_of_dead_writers(tmp_path):
+    storage = SQLiteStorage(tmp_path)
+    storage.write_text("sub/curso/a.md", "a")
+    conn = storage._archive("sub/curso")
+    with conn:
+        conn.execute(
+            "INSERT INTO chunks VALUES (?, 0, ?)", (f"{PARTIAL_PREFIX}otro:x", b"x")
+        )
+    storage.close()
+
+    storage = SQLiteStorage(tmp_path)
+    assert list(storage.keys()) == ["sub/curso/a.md"]
+    conn = storage._archive("sub/curso")
+    assert conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 1
+    storage.close()
+
+
+def test_zip_recovers_after_crash(tmp_path):
+    storage = ZipStorage(tmp_path)
+    storage.write_text("sub/curso/a.md", "a" * 100)
+    with storage.open_write("sub/curso/video.mp4") as f:
+        f.write(b"v" * 5000)
+    storage.write_text("sub/curso/b.md", "b")
+    storage.delete("sub/curso/b.md")
+    storage.close()
+
+    # El proceso muere copiando una entrada: sin directorio central y con la
+    # cabecera de la entrada a medias.
+    path = storage.archive_path("sub/curso")
+    data = path.read_bytes()
+    path.write_bytes(data[: data.index(b"PK\x01\x02")] + b"PK\x03\x04\x14\x00")
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(path)
+
+    storage = ZipStorage(tmp_path)
+    assert storage.read_bytes("sub/curso/a.md") == b"a" * 100
+    assert storage.read_bytes("sub/curso/video.mp4") == b"v" * 5000
+    assert not storage.exists("sub/curso/b.md")
+    storage.write_text("sub/curso/c.md", "c")
+    storage.close()
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+    assert sorted(ZipStorage(tmp_path).keys()) == [
+        "sub/curso/a.md",
+        "sub/curso/c.md",
+        "sub/curso/video.mp4",
+    ]
+
+
+def test_zip_streams_into_one_open_archive(tmp_path):
+    storage = ZipStorage(tmp_path)
+    opened = []
+    open_archive = storage._open_archive
+    storage._open_archive = lambda path: opened.append(path) or open_archive(path)
+
+    with storage.open_write("sub/curso/1 - Seccion/video.mp4") as f:
+        f.write(b"v" * (1 << 20))
+        # Sin archivos temporales: el video va directo al zip.
+        files = [p.name for p in tmp_path.rglob("*") if p.is_file()]
+        assert files == ["curso.zip"]
+        # Lo que llega mientras tanto se encola y ya se puede leer.
+        storage.write_text("sub/curso/1 - Seccion/texto.md", "# Hola")
+        assert storage.read_bytes("sub/curso/1 - Seccion/texto.md") == b"# Hola"
+        f.write(b"v" * 10)
+    storage.write_text("sub/curso/1 - Seccion/otro.md", "otro")
+    storage.close()
+
+    assert len(opened) == 1
+    with zipfile.ZipFile(storage.archive_path("sub/curso")) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [
+            "1 - Seccion/video.mp4",
+            "1 - Seccion/texto.md",
+            "1 - Seccion/otro.md",
+        ]
+        assert archive.getinfo("1 - Seccion/video.mp4").file_size == (1 << 20) + 10
+
+
+def test_zip_recovers_when_closed_mid_course(tmp_path):
+    storage = ZipStorage(tmp_path)
+    storage.write_text("sub/curso/a.md", "a" * 100)
+    storage.close()
+    storage = ZipStorage(tmp_path)
+    storage.write_text("sub/curso/b.md", "b")
+    # El proceso muere sin cerrar el zip: el directorio central viejo quedo pisado.
+    storage._archive("sub/curso").fp.flush()
+
+    reopened = ZipStorage(tmp_path)
+    assert reopened.read_bytes("sub/curso/a.md") == b"a" * 100
+    assert reopened.read_bytes("sub/curso/b.md") == b"b"
+    reopened.close()
+
+
+def test_sqlite_keeps_chunks_of_live_writers(tmp_path):
+    key = "sub/curso/1 - Seccion/video.mp4"
+    writer = SQLiteStorage(tmp_path)
+    writer.write_text("sub/curso/a.md", "a")
+    with writer.open_write(key) as f:
+        f.write(b"x" * 10)
+        f.flush()
+        # Otro proceso abre el mismo curso mientras el video se escribe.
+        code = (
+            "from pyalura.storage import SQLiteStorage\n"
+            f"storage = SQLiteStorage({str(tmp_path)!r})\n"
+            "assert storage.exists('sub/curso/a.md')\n"
+            "storage.close()\n"
+        )
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        f.write(b"y" * 10)
+    assert writer.read_bytes(key) == b"x" * 10 + b"y" * 10
+    writer.close()
@@ -0,0 +1,84 @@
+import gzip
+import json
+import time
+
+import pytest
+from conftest import serve_sessions
+from fake_alura import FakeAlura, make_response
+
+from pyalura.clock import SimulatedClock
+from pyalura.course import Course
+from pyalura.transport import (
+    RecordingTransport,
+    ReplayTransport,
+    SessionTransport,
+    Transport,
+)
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+VIDEO_URL = "https://app.aluracursos.com/fake-video/hd.mp4"
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()
+
+
+class StaticTransport(Transport):
+    def request(self, method, url, **kwargs):
+        return make_response(url, b"video", headers={"Content-Length": "5"})
+
+
+def test_unread_stream_is_recorded_on_close(tmp_path):
+    path = tmp_path / "grabacion.jsonl.gz"
+    recorder = RecordingTransport(path, StaticTransport())
+    read = recorder.request("GET", VIDEO_URL, stream=True)
+    assert b"".join(read.iter_content(2)) == b"video"
+    read.close()
+    # Una respuesta que nadie lee ni cierra (p. ej. tras un error).
+    recorder.request("GET", f"{VIDEO_URL}?otra", stream=True)
+    recorder.close()
+    assert recorder.recorded == 2
+
+    replay = ReplayTransport(path, latency=0)
+    assert replay.request("GET", VIDEO_URL).content == b"video"
+    assert replay.request("GET", f"{VIDEO_URL}?otra").status_code == 200
+
+
+def test_session_transport_does_not_follow_head_redirects():
+    methods = []
+    with FakeAlura() as fake, serve_sessions(fake, methods):
+        with SessionTransport() as transport:
+            course = Course(COURSE_URL, transport=transport)
+            sections = course.sections
+
+    assert len(sections) == fake.sections
+    # La redireccion de `continue` se lee de la cabecera, sin seguirla.
+    assert methods == ["GET", "HEAD", "GET"]
+
+
+def test_replay_waits_the_recorded_latency_on_the_clock(tmp_path):
+    path = tmp_path / "grabacion.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for elapsed in (0.5, 1.5):
+            record = {
+                "method": "GET",
+                "url": VIDEO_URL,
+                "status": 200,
+                "final_url": VIDEO_URL,
+                "headers": {},
+                "history": [],
+                "elapsed": elapsed,
+                "body": "",
+            }
+            f.write(json.dumps(record) + "\n")
+
+    clock = SimulatedClock()
+    replay = ReplayTransport(path, latency=2.0, clock=clock)
+    start = time.perf_counter()
+    replay.request("GET", VIDEO_URL)
+    replay.request("GET", VIDEO_URL)
+
+    assert time.perf_counter() - start < 1
+    assert clock.sleeps == 2
+    assert clock.elapsed == 4.0
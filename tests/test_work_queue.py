@@ -0,0 +1,104 @@
+import json
+import multiprocessing
+
+import pytest
+from fake_alura import FakeAlura, make_response
+
+from pyalura.course import Course
+from pyalura.downloader import Downloader
+from pyalura.item_index import ItemIndex
+from pyalura.rate_limit import RateLimiter
+from pyalura.work_queue import QueueBackend, QueueWorker, WorkQueue, run_worker
+
+COURSE_URL = "https://app.aluracursos.com/course/curso-de-prueba"
+
+try:
+    fork = multiprocessing.get_context("fork")
+except ValueError:  # Windows
+    fork = None
+
+needs_fork = pytest.mark.skipif(fork is None, reason="necesita procesos con fork")
+
+
+def save_history(base_folder, worker, count):
+    downloader = Downloader(base_folder)
+    for i in range(count):
+        downloader._save_history(f"https://app.aluracursos.com/course/w{worker}-{i}")
+
+
+def run_processes(target, args_list):
+    processes = [fork.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+
+@needs_fork
+def test_history_keeps_updates_from_several_processes(tmp_path):
+    run_processes(save_history, [(tmp_path, worker, 25) for worker in range(4)])
+
+    history = json.loads((tmp_path / "cursos_descargados.json").read_text())
+    assert len(history) == 100
+    assert len(set(history)) == 100
+
+
+@needs_fork
+def test_workers_in_several_processes_drain_the_queue(tmp_path):
+    queue_path = tmp_path / "queue.sqlite3"
+    base_folder = tmp_path / "descargas"
+    urls = [f"https://app.aluracursos.com/course/curso-{i}" for i in range(8)]
+    assert WorkQueue(queue_path).enqueue_courses(urls) == 8
+
+    # Los procesos heredan (fork) la plataforma simulada.
+    with FakeAlura(sections=1, items=2, paragraphs=2, video_bytes=1024):
+        run_processes(run_worker, [(queue_path, base_folder)] * 4)
+
+    stats = WorkQueue(queue_path).stats()
+    assert stats.get("done") == 8
+    history = json.loads((base_folder / "cursos_descargados.json").read_text())
+    assert sorted(history) == sorted(urls)
+
+
+def test_queue_backend_is_abstract():
+    with pytest.raises(TypeError):
+        QueueBackend()
+
+
+def test_failed_item_job_is_marked_failed(tmp_path, monkeypatch):
+    item_index = ItemIndex(tmp_path / "items.sqlite3")
+    queue = WorkQueue(tmp_path / "queue.sqlite3")
+    # 1004 es un video; 1001, un texto.
+    queue.enqueue_items([f"{COURSE_URL}/task/1004", f"{COURSE_URL}/task/1001"])
+    rate_limiter = RateLimiter(1000, burst=1000)
+    downloader = Downloader(
+        tmp_path / "descargas", item_index=item_index, rate_limiter=rate_limiter
+    )
+    closed = []
+    downloader.storage.close = lambda: closed.append("todo")
+    downloader.storage.close_course = closed.append
+    items = []
+    get_item = Course.get_item
+
+    def spy(url, **options):
+        items.append(get_item(url, **options))
+        return items[-1]
+
+    with FakeAlura() as fake:
+        handle = fake.handle
+        fake.handle = lambda method, url, **kw: (
+            make_response(url, "", status=404)
+            if "/fake-video/" in url
+            else handle(method, url, **kw)
+        )
+        Course(COURSE_URL, item_index=item_index).sections[0].items
+        monkeypatch.setattr(Course, "get_item", spy)
+        QueueWorker(queue, downloader).run()
+
+    stats = queue.stats()
+    assert (stats["done"], stats["failed"]) == (1, 1)
+    # Los items usan los limites del Downloader y solo se cierra su curso.
+    assert all(item.course.rate_limiter is rate_limiter for item in items)
+    assert closed and "todo" not in closed
+    assert set(closed) == {"programacion/curso-de-prueba"}